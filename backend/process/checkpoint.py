@@ -0,0 +1,94 @@
+import os
+import json
+import hashlib
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List
+
+
+class PageCheckpoint:
+    """
+    파일 하나의 페이지 단위 파싱 체크포인트 (JSON Lines, 추가 쓰기 전용)
+
+    - 첫 줄: 헤더 (원본 파일 크기/수정 시각, 파싱 설정) - 원본이나 설정이 바뀌면 체크포인트 폐기
+    - 이후: 완료된 페이지 레코드 한 줄씩 {"page", "text", "error", "page_info", "embedding"}
+    - 배치마다 flush + fsync 하므로 프로세스가 죽어도 마지막으로 기록된 배치까지는 보존
+    - 기록 도중 끊긴 마지막 줄은 읽을 때 무시
+    """
+
+    def __init__(self, checkpoint_dir: str, source_path: str, settings: dict):
+        """
+        Args:
+            checkpoint_dir: 체크포인트 파일을 저장할 폴더
+            source_path: 원본 PDF 경로
+            settings: 결과에 영향을 주는 파싱 설정 (ocr_mode, 임베딩 모델 등)
+        """
+        self.source_path = Path(source_path).resolve()
+        key = hashlib.md5(str(self.source_path).encode()).hexdigest()
+        self.path = Path(checkpoint_dir) / f"{key}.jsonl"
+
+        stat = os.stat(self.source_path)
+        self.header = {
+            "source": str(self.source_path).replace("\\", "/"),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "settings": settings,
+            }
+
+    def _matches(self, header: dict) -> bool:
+        return all(header.get(k) == self.header[k] for k in ("source", "size", "mtime_ns", "settings"))
+
+    def load(self) -> Dict[int, dict]:
+        """완료된 페이지 레코드를 {페이지 번호: 레코드}로 반환 (체크포인트가 없거나 오래된 경우 빈 dict)"""
+        if not self.path.exists():
+            return {}
+
+        pages = {}
+        valid_bytes = 0
+        with open(self.path, "rb") as f:
+            try:
+                header = json.loads(f.readline())
+            except ValueError:
+                header = {}
+            if not self._matches(header):
+                f.close()
+                print(f"원본 또는 설정이 바뀌어 체크포인트를 폐기합니다: {self.source_path.name}")
+                self.remove()
+                return {}
+            valid_bytes = f.tell()
+
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("incomplete line")
+                    record = json.loads(line)
+                except ValueError:
+                    break  # 기록 중 중단된 마지막 줄
+                pages[int(record["page"])] = record
+                valid_bytes += len(line)
+
+        # 끊긴 줄 뒤에 이어 쓰지 않도록 마지막 정상 레코드 위치로 자르기
+        if valid_bytes < self.path.stat().st_size:
+            os.truncate(self.path, valid_bytes)
+        return pages
+
+    def append(self, records: List[dict]):
+        """완료된 페이지 레코드를 추가 기록하고 디스크에 반영될 때까지 대기"""
+        if not records:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        new_file = not self.path.exists()
+        with open(self.path, "a", encoding="utf-8") as f:
+            if new_file:
+                f.write(json.dumps({**self.header, "created_at": datetime.now().isoformat(timespec="seconds")}, ensure_ascii=False) + "\n")
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def remove(self):
+        """파일 파싱이 끝나 결과가 저장되면 체크포인트 삭제"""
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
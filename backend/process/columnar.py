@@ -0,0 +1,170 @@
+import json
+import pickle
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from langchain_core.documents import Document
+
+from process.page_batch import PageBatch, EMBEDDING_DIM, TEXT_COLUMNS, ROW_COLUMNS
+
+
+def page_schema(dim: int = EMBEDDING_DIM) -> pa.Schema:
+    """페이지 단위 Parquet 스키마 - embeddings는 float32 고정 길이 리스트"""
+    fields = [pa.field('page_content', pa.string())]
+    fields += [pa.field(name, pa.string()) for name in TEXT_COLUMNS]
+    fields += [
+        pa.field('embeddings', pa.list_(pa.float32(), dim)),
+        pa.field('extra', pa.string()),  # 그 외 메타데이터 (ocr, error 등) JSON
+        ]
+    return pa.schema(fields)
+
+
+def batch_to_table(batch: PageBatch) -> pa.Table:
+    """PageBatch를 Arrow 테이블로 변환 (임베딩 행렬은 복사 없이 그대로 사용, 없는 페이지는 null)"""
+    dim = batch.embeddings.shape[1]
+    columns = {'page_content': pa.array(batch.page_content, pa.string())}
+    for name in TEXT_COLUMNS:
+        columns[name] = pa.array(batch.columns[name], pa.string())
+    columns['embeddings'] = pa.FixedSizeListArray.from_arrays(
+        pa.array(np.ascontiguousarray(batch.embeddings, dtype=np.float32).reshape(-1), pa.float32()), dim,
+        mask=pa.array(~batch.has_embedding),
+        )
+    columns['extra'] = pa.array(
+        [json.dumps(extra or {}, ensure_ascii=False, default=str) for extra in batch.extra],
+        pa.string(),
+        )
+    return pa.Table.from_pydict(columns, schema=page_schema(dim))
+
+
+def documents_to_table(docs: List[Document], dim: Optional[int] = None) -> pa.Table:
+    """Document 리스트를 Arrow 테이블로 변환 (임베딩이 없는 페이지는 null)"""
+    return batch_to_table(PageBatch.from_documents(docs, dim))
+
+
+def write_page_batch_parquet(batch: PageBatch, output_path: str, row_group_size: int = 256):
+    """PageBatch를 Parquet 파일로 저장 (zstd 압축, row group 단위로 나눠 읽기 가능)"""
+    pq.write_table(batch_to_table(batch), str(output_path), row_group_size=row_group_size, compression="zstd")
+
+
+def write_documents_parquet(docs: List[Document], output_path: str, dim: Optional[int] = None, row_group_size: int = 256):
+    """Document 리스트를 Parquet 파일로 저장"""
+    write_page_batch_parquet(PageBatch.from_documents(docs, dim), output_path, row_group_size=row_group_size)
+
+
+def iter_parquet_batches(parquet_path: str, batch_size: int = 500, columns: List[str] = None) -> Iterator[pa.RecordBatch]:
+    """Parquet 파일을 메모리 매핑으로 열어 row batch 단위로 반환"""
+    parquet_file = pq.ParquetFile(str(Path(parquet_path)), memory_map=True)
+    yield from parquet_file.iter_batches(batch_size=batch_size, columns=columns)
+
+
+def _embedding_matrix(batch: pa.RecordBatch):
+    """embeddings 컬럼을 (행 수, dim) float32 행렬과 유효 여부 배열로 변환"""
+    column = batch.column('embeddings')
+    dim = column.type.list_size
+    # 고정 길이 리스트는 null 행도 자리를 차지하므로 offset 기준으로 잘라 행렬로 변환
+    values = column.values.to_numpy(zero_copy_only=False)
+    matrix = values[column.offset * dim:(column.offset + len(column)) * dim].reshape(len(column), dim)
+    valid = column.is_valid().to_numpy(zero_copy_only=False)
+    return matrix, valid
+
+
+def _embedding_lists(batch: pa.RecordBatch) -> List[list]:
+    """embeddings 컬럼을 행별 float 리스트로 변환 (null → 빈 리스트)"""
+    matrix, valid = _embedding_matrix(batch)
+    return [matrix[i].tolist() if valid[i] else [] for i in range(len(valid))]
+
+
+def iter_parquet_rows(parquet_path: str, batch_size: int = 500) -> Iterator[List[list]]:
+    """RDB insert용 행 리스트(ROW_COLUMNS 순서)를 batch 단위로 반환"""
+    for batch in iter_parquet_batches(parquet_path, batch_size=batch_size, columns=ROW_COLUMNS):
+        data = {name: batch.column(name).to_pylist() for name in ROW_COLUMNS if name != 'embeddings'}
+        embeddings = _embedding_lists(batch)
+        yield [
+            [data[name][i] if name != 'embeddings' else embeddings[i] for name in ROW_COLUMNS]
+            for i in range(batch.num_rows)
+            ]
+
+
+def read_parquet_batch(parquet_path: str) -> PageBatch:
+    """Parquet 파일을 PageBatch로 읽기 (임베딩은 float32 행렬 그대로)"""
+    parts = []
+    for batch in iter_parquet_batches(parquet_path):
+        matrix, valid = _embedding_matrix(batch)
+        data = {name: batch.column(name).to_pylist() for name in ['page_content', *TEXT_COLUMNS, 'extra']}
+        parts.append(PageBatch(
+            data['page_content'],
+            {name: data[name] for name in TEXT_COLUMNS},
+            np.array(matrix, dtype=np.float32),
+            np.array(valid, dtype=bool),
+            [json.loads(extra) if extra and extra != "{}" else None for extra in data['extra']],
+            ))
+    return PageBatch.concat(parts)
+
+
+def read_parquet_documents(parquet_path: str) -> List[Document]:
+    """Parquet 파일을 Document 리스트로 복원 (API 응답 등 호환용)"""
+    return read_parquet_batch(parquet_path).to_documents()
+
+
+def _documents_from_columns(page_content, columns, embeddings, has_embedding, extra) -> List[Document]:
+    """.pkl 복원 함수 - 일반 pickle.load로 읽는 기존 소비자에게는 Document 리스트로 변환해 돌려줌"""
+    return PageBatch(page_content, columns, embeddings, has_embedding, extra).to_documents()
+
+
+class _PageBatchPickle:
+    """PageBatch 컬럼(float32 임베딩 행렬 포함)을 그대로 피클하고, 복원 시 _documents_from_columns를 호출하도록 하는 래퍼"""
+
+    __slots__ = ("batch",)
+
+    def __init__(self, batch: PageBatch):
+        self.batch = batch
+
+    def __reduce__(self):
+        batch = self.batch
+        return _documents_from_columns, (batch.page_content, batch.columns, batch.embeddings, batch.has_embedding, batch.extra)
+
+
+class _PageBatchUnpickler(pickle.Unpickler):
+    """load_page_batch 전용 - Document 변환 없이 PageBatch로 바로 복원"""
+
+    def find_class(self, module, name):
+        if module == __name__ and name == "_documents_from_columns":
+            return PageBatch
+        return super().find_class(module, name)
+
+
+def load_page_batch(output_path: str) -> PageBatch:
+    """
+    파싱 결과 파일을 PageBatch로 읽기
+    - .parquet: Parquet 컬럼 그대로
+    - .pkl: 컬럼 피클(Document 변환 없이 복원), 기존 형식(Document 리스트) 피클, 또는 이전 버전이 저장한 PageBatch 피클
+    """
+    output_path = str(output_path)
+    if output_path.endswith(".parquet"):
+        return read_parquet_batch(output_path)
+    with open(output_path, "rb") as f:
+        data = _PageBatchUnpickler(f).load()
+    if isinstance(data, PageBatch):
+        return data
+    return PageBatch.from_documents([
+        Document(page_content=doc["page_content"], metadata=doc.get("metadata", {})) if isinstance(doc, dict) else doc
+        for doc in data
+        ])
+
+
+def save_page_batch(batch: PageBatch, output_path: str, output_format: str = None):
+    """
+    PageBatch 저장 - output_format("parquet" 또는 "pickle")을 지정하지 않으면 확장자로 판단
+    - pickle(.pkl)은 float32 행렬과 컬럼을 그대로 저장하므로 페이지별 float 리스트를 만들지 않음
+      기존 소비자가 pickle.load로 읽으면 그 시점에 Document 리스트로 변환됨 (process.columnar import 가능해야 함)
+    """
+    output_path = str(output_path)
+    output_format = output_format or ("parquet" if output_path.endswith(".parquet") else "pickle")
+    if output_format == "parquet":
+        write_page_batch_parquet(batch, output_path)
+    else:
+        with open(output_path, "wb") as f:
+            pickle.dump(_PageBatchPickle(batch), f)
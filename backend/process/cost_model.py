@@ -0,0 +1,171 @@
+import os
+import json
+import heapq
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from process.pdf_probe import probe_pdf_features
+from process.text_formats import is_text_format
+from utils.config import get_config
+from utils.setlogger import setup_logger
+config = get_config()
+logger = setup_logger(f"{__name__}", level=config.LOG_LEVEL)
+
+
+# 비용 모델 입력 특징 (파일별 예상 소요 시간 = 상수항 + Σ 계수 × 특징)
+FEATURES = ("pdf_text_pages", "ocr_pages", "images", "text_doc_pages", "size_mb")
+
+# 학습 데이터가 없을 때 사용하는 기본 계수(초) - 상수항은 파일당 변환기 호출/저장 오버헤드
+DEFAULT_COEFFICIENTS = {
+    "intercept": 3.0,
+    "pdf_text_pages": 0.6,
+    "ocr_pages": 4.0,
+    "images": 0.3,
+    "text_doc_pages": 0.15,
+    "size_mb": 0.05,
+    }
+
+
+def probe_file_features(file_path: str, ocr_mode: str = "adaptive", ocr_min_text_chars: int = 50,
+                        text_page_chars: int = 3000) -> dict:
+    """
+    파싱 없이 파일 특징만 빠르게 추출 (PDF는 일부 페이지만 샘플링)
+
+    Returns:
+        {"size_mb", "pages", "text_coverage", "images_per_page", "page_megapixels", *FEATURES}
+    """
+    size_bytes = os.path.getsize(file_path)
+    features = {
+        "size_mb": size_bytes / (1024 * 1024),
+        "pages": 0,
+        "text_coverage": 1.0,
+        "images_per_page": 0.0,
+        "page_megapixels": 0.0,
+        **{name: 0.0 for name in FEATURES if name != "size_mb"},
+        }
+
+    if is_text_format(file_path):
+        # 가상 페이지 수 추정 (DOCX는 압축, HTML은 태그가 섞여 있어 오차는 계수 학습으로 보정)
+        pages = max(1, -(-size_bytes // max(1, text_page_chars)))
+        features.update(pages=pages, text_doc_pages=float(pages))
+        return features
+
+    probe = probe_pdf_features(file_path, min_text_chars=ocr_min_text_chars)
+    pages = probe["page_count"]
+    if ocr_mode == "always":
+        ocr_pages = pages
+    elif ocr_mode == "never":
+        ocr_pages = 0
+    else:
+        ocr_pages = round(pages * (1 - probe["text_coverage"]))
+    features.update(
+        pages=pages,
+        text_coverage=round(probe["text_coverage"], 4),
+        images_per_page=round(probe["images_per_page"], 4),
+        page_megapixels=round(probe["page_megapixels"], 4),
+        pdf_text_pages=float(pages - ocr_pages),
+        ocr_pages=float(ocr_pages),
+        images=probe["images_per_page"] * pages,
+        )
+    return features
+
+
+def simulate_finish_times(seconds: List[float], num_workers: int) -> List[float]:
+    """주어진 순서대로 먼저 비는 워커에 배정했을 때 작업별 예상 완료 시각(초)"""
+    workers = [0.0] * max(1, num_workers)
+    finish_times = []
+    for cost in seconds:
+        finish = heapq.heappop(workers) + cost
+        heapq.heappush(workers, finish)
+        finish_times.append(finish)
+    return finish_times
+
+
+class CostModel:
+    """
+    파일별 파싱 소요 시간 추정 모델 (선형 모델, 이전 실행 기록으로 계수 학습)
+
+    - 파일 하나가 끝날 때마다 (특징, 실제 소요 시간)을 기록
+    - 기본 계수 쪽으로 당기는 ridge 회귀로 계수를 다시 계산 (기록이 적어도 값이 튀지 않음)
+    - 기록과 계수는 JSON 파일에 저장하여 서버 재시작 후에도 유지 (history_path가 None이면 메모리에서만 사용)
+    """
+
+    # 최근 기록만 유지 (하드웨어/설정 변경 후 오래된 기록 영향 축소)
+    MAX_SAMPLES = 1000
+    # 이보다 기록이 적으면 기본 계수 사용
+    MIN_SAMPLES = 5
+    # 기본 계수에 주는 가중치 (가상 관측치 수에 해당)
+    PRIOR_WEIGHT = 5.0
+
+    def __init__(self, history_path: Optional[str] = None):
+        self.history_path = Path(history_path) if history_path else None
+        self.samples: List[dict] = []
+        self.coefficients: Dict[str, float] = dict(DEFAULT_COEFFICIENTS)
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        if self.history_path is None or not self.history_path.exists():
+            return
+        try:
+            with open(self.history_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.samples = data.get("samples", [])[-self.MAX_SAMPLES:]
+            self.coefficients.update(data.get("coefficients", {}))
+        except (OSError, ValueError) as e:
+            logger.warning(f"비용 모델 기록을 읽지 못해 기본 계수를 사용합니다: {e}")
+
+    def save(self):
+        """계수를 다시 학습한 뒤 임시 파일에 쓰고 교체"""
+        self.fit()
+        if self.history_path is None:
+            return
+        with self._lock:
+            self.history_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.history_path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"coefficients": self.coefficients, "samples": self.samples}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.history_path)
+
+    def estimate(self, features: dict) -> float:
+        """예상 소요 시간(초)"""
+        seconds = self.coefficients["intercept"]
+        for name in FEATURES:
+            seconds += self.coefficients[name] * float(features.get(name, 0.0))
+        return round(max(0.0, seconds), 2)
+
+    def observe(self, features: dict, elapsed: float):
+        """실제 소요 시간 기록"""
+        sample = {name: float(features.get(name, 0.0)) for name in FEATURES}
+        sample["elapsed"] = float(elapsed)
+        with self._lock:
+            self.samples.append(sample)
+            del self.samples[:-self.MAX_SAMPLES]
+
+    def fit(self):
+        """기본 계수를 사전값으로 하는 ridge 회귀 - (XᵀX + λI)w = Xᵀy + λw₀, 음수 계수는 0으로"""
+        with self._lock:
+            if len(self.samples) < self.MIN_SAMPLES:
+                return
+            x = np.array([[1.0] + [s[name] for name in FEATURES] for s in self.samples])
+            y = np.array([s["elapsed"] for s in self.samples])
+
+        prior = np.array([DEFAULT_COEFFICIENTS["intercept"]] + [DEFAULT_COEFFICIENTS[name] for name in FEATURES])
+        ridge = self.PRIOR_WEIGHT * np.eye(len(prior))
+        try:
+            weights = np.linalg.solve(x.T @ x + ridge, x.T @ y + ridge @ prior)
+        except np.linalg.LinAlgError as e:
+            logger.warning(f"비용 모델 학습 실패, 이전 계수 유지: {e}")
+            return
+
+        weights = np.clip(weights, 0.0, None)
+        with self._lock:
+            self.coefficients = {"intercept": round(float(weights[0]), 4)}
+            self.coefficients.update({name: round(float(w), 4) for name, w in zip(FEATURES, weights[1:])})
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"samples": len(self.samples), "coefficients": dict(self.coefficients)}
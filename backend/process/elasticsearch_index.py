@@ -1,5 +1,7 @@
 import numpy as np
+from datetime import datetime
 from process.postgres import PostgresPipeline
+from process.page_batch import PageBatch
 from elasticsearch import Elasticsearch, helpers
 from elasticsearch.helpers import BulkIndexError
 
@@ -142,6 +144,71 @@ class ElasticsearchIndexer:
                 "_source": doc
             }
 
+    def _generate_batch_actions(self, batch: PageBatch):
+        """
+        PageBatch로부터 helpers.bulk() 액션을 생성합니다. (RDB 조회 없이 바로 색인)
+        임베딩은 행렬에서 한 행씩 꺼내 변환하며, 임베딩이 없는 페이지는 dense_vector 매핑에 맞지 않으므로 제외합니다.
+        """
+        now = datetime.now().isoformat()
+        columns = batch.columns
+        for i in range(len(batch)):
+            if not batch.has_embedding[i]:
+                continue
+
+            source = {
+                "id": columns["id"][i],
+                "page_content": batch.page_content[i],
+                "filename": columns["filename"][i],
+                "filepath": columns["filepath"][i],
+                "hashed_filename": columns["hashed_filename"][i],
+                "hashed_filepath": columns["hashed_filepath"][i],
+                "hashed_page_content": columns["hashed_page_content"][i],
+                "page": columns["page"][i],
+                "lv1_cat": columns["lv1_cat"][i],
+                "lv2_cat": columns["lv2_cat"][i],
+                "lv3_cat": columns["lv3_cat"][i],
+                "lv4_cat": columns["lv4_cat"][i],
+                "embeddings": batch.embedding_list(i),
+                "created_at": now,
+                "updated_at": now,
+            }
+            yield {
+                "_index": self.INDEX_NAME,
+                "_id": columns["id"][i],
+                "_source": source
+            }
+
+    def index_batch(self, batch: PageBatch) -> int:
+        """
+        PageBatch를 Elasticsearch에 바로 색인하고 성공 건수를 반환합니다. (스트리밍 적재용)
+        """
+        if not len(batch):
+            return 0
+        successes, errors = helpers.bulk(self.es, self._generate_batch_actions(batch), raise_on_error=False)
+        if errors:
+            logger.warning(f"{len(errors)} document(s) failed to index. First error: {errors[0]}")
+        return successes
+
+    def index_documents(self, docs) -> int:
+        """Document 리스트 색인 (복구 등 소량 처리용)"""
+        return self.index_batch(PageBatch.from_documents(docs))
+
+    def delete_documents_by_hashed_filepath(self, hashed_filepath: str) -> int:
+        """
+        주어진 hashed_filepath의 기존 문서를 삭제합니다. (같은 파일 재적재 시 중복 방지)
+        """
+        try:
+            res = self.es.delete_by_query(
+                index=self.INDEX_NAME,
+                body={"query": {"term": {"hashed_filepath": hashed_filepath}}},
+                refresh=True,
+                conflicts="proceed",
+            )
+            return res.get("deleted", 0)
+        except Exception as e:
+            logger.error(f"Error deleting documents by hashed_filepath: {e}")
+            return 0
+
     def index_documents_by_hashed_filepath(self, table_name: str, hashed_filepath: str):
         """
         주어진 hashed_filepath에 해당하는 문서를 PostgreSQL에서 가져와 Elasticsearch에 색인합니다.
@@ -0,0 +1,169 @@
+import time
+import sqlite3
+import hashlib
+import threading
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils.config import get_config
+from utils.setlogger import setup_logger
+config = get_config()
+logger = setup_logger(f"{__name__}", level=config.LOG_LEVEL)
+
+
+class EmbeddingCache:
+    """
+    페이지 내용 해시(hashed_page_content) + 모델명을 키로 하는 디스크 기반 임베딩 캐시
+
+    - SQLite 파일 하나에 float32 바이트로 저장 (프로세스/프로젝트 간 공유 가능)
+    - max_entries 초과 시 마지막 접근 시각 기준 LRU 방식으로 삭제
+    - 인스턴스별 hit/miss 카운터 제공
+    """
+
+    # 매 put 마다 개수를 세지 않도록 일정 횟수마다 한 번씩 용량 검사
+    EVICT_CHECK_INTERVAL = 500
+
+    def __init__(self, db_path: str, model_name: str, max_entries: int = 200_000):
+        """
+        Args:
+            db_path: 캐시 SQLite 파일 경로
+            model_name: 임베딩 모델명 (같은 내용이라도 모델이 다르면 별도 저장)
+            max_entries: 최대 저장 개수 (0 이하이면 무제한)
+        """
+        self.db_path = db_path
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._puts_since_check = 0
+        self._lock = threading.Lock()
+
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                content_hash TEXT NOT NULL,
+                model TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (content_hash, model)
+            )
+            """
+            )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_access ON embeddings (last_access)")
+        self._conn.commit()
+
+    @staticmethod
+    def hash_text(text: str) -> str:
+        """DoclingParser의 hashed_page_content와 동일한 MD5 해시"""
+        return hashlib.md5(text.encode()).hexdigest()
+
+    @staticmethod
+    def _to_blob(vector: Iterable[float]) -> bytes:
+        return array("f", vector).tobytes()
+
+    @staticmethod
+    def _from_blob(blob: bytes) -> List[float]:
+        vector = array("f")
+        vector.frombytes(blob)
+        return vector.tolist()
+
+    def get(self, content_hash: str) -> Optional[List[float]]:
+        """단일 해시 조회 (없으면 None)"""
+        return self.get_many([content_hash]).get(content_hash)
+
+    def get_many(self, content_hashes: List[str]) -> Dict[str, List[float]]:
+        """여러 해시를 한 번에 조회하여 {해시: 임베딩} 반환"""
+        unique = list(dict.fromkeys(content_hashes))
+        found: Dict[str, List[float]] = {}
+        if not unique:
+            return found
+
+        with self._lock:
+            # SQLite 변수 개수 제한을 피하기 위해 나눠서 조회
+            for start in range(0, len(unique), 500):
+                part = unique[start:start + 500]
+                placeholders = ", ".join(["?"] * len(part))
+                rows = self._conn.execute(
+                    f"SELECT content_hash, vector FROM embeddings WHERE model = ? AND content_hash IN ({placeholders})",
+                    [self.model_name, *part],
+                    ).fetchall()
+                for content_hash, blob in rows:
+                    found[content_hash] = self._from_blob(blob)
+
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_access = ? WHERE model = ? AND content_hash = ?",
+                    [(now, self.model_name, h) for h in found],
+                    )
+                self._conn.commit()
+
+            self.hits += sum(1 for h in content_hashes if h in found)
+            self.misses += sum(1 for h in content_hashes if h not in found)
+        return found
+
+    def put(self, content_hash: str, vector: List[float]):
+        """단일 임베딩 저장"""
+        self.put_many([(content_hash, vector)])
+
+    def put_many(self, items: List[Tuple[str, List[float]]]):
+        """여러 임베딩 저장 (이미 있으면 덮어씀)"""
+        items = [(h, v) for h, v in items if h and v]
+        if not items:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (content_hash, model, vector, last_access) VALUES (?, ?, ?, ?)",
+                [(h, self.model_name, self._to_blob(v), now) for h, v in items],
+                )
+            self._conn.commit()
+
+            self._puts_since_check += len(items)
+            if self._puts_since_check >= self.EVICT_CHECK_INTERVAL:
+                self._puts_since_check = 0
+                self._evict()
+
+    def _evict(self):
+        """최대 개수를 넘으면 가장 오래 사용하지 않은 항목부터 삭제 (lock 보유 상태에서 호출)"""
+        if self.max_entries <= 0:
+            return
+        total = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        overflow = total - self.max_entries
+        if overflow <= 0:
+            return
+
+        self._conn.execute(
+            """
+            DELETE FROM embeddings WHERE rowid IN (
+                SELECT rowid FROM embeddings ORDER BY last_access ASC LIMIT ?
+            )
+            """,
+            (overflow,),
+            )
+        self._conn.commit()
+        logger.info(f"임베딩 캐시 LRU 정리: {overflow}개 삭제 (최대 {self.max_entries}개)")
+
+    def stats(self) -> dict:
+        """hit/miss 카운터 및 저장 개수 반환"""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM embeddings WHERE model = ?", (self.model_name,)).fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "model": self.model_name,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
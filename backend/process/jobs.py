@@ -0,0 +1,232 @@
+import json
+import heapq
+import itertools
+import threading
+from uuid import uuid4
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+try:
+    import redis
+except ImportError:  # redis 백엔드를 쓰지 않으면 필요 없음
+    redis = None
+
+from utils.config import get_config
+from utils.setlogger import setup_logger
+config = get_config()
+logger = setup_logger(f"{__name__}", level=config.LOG_LEVEL)
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+class InMemoryJobStore:
+    """
+    서버 프로세스 메모리에 작업 상태를 저장하는 기본 백엔드
+    (uvicorn workers가 여러 개면 작업을 받은 프로세스에서만 조회 가능 → 이 경우 RedisJobStore 사용)
+    """
+
+    def __init__(self):
+        self._jobs: Dict[str, dict] = {}
+        self._files: Dict[str, Dict[str, dict]] = {}
+        self._lock = threading.Lock()
+
+    def create(self, job: dict):
+        with self._lock:
+            self._jobs[job["job_id"]] = dict(job)
+            self._files[job["job_id"]] = {}
+
+    def update(self, job_id: str, **fields):
+        with self._lock:
+            self._jobs[job_id].update(fields)
+
+    def set_file(self, job_id: str, file: str, file_status: dict):
+        with self._lock:
+            self._files[job_id][file] = dict(file_status)
+
+    def get(self, job_id: str, with_files: bool = True) -> Optional[dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            job = dict(job)
+            if with_files:
+                job["files"] = dict(self._files.get(job_id, {}))
+            return job
+
+    def list(self) -> List[dict]:
+        with self._lock:
+            return [dict(job) for job in self._jobs.values()]
+
+
+class RedisJobStore:
+    """
+    Redis에 작업 상태를 저장하는 백엔드 (여러 uvicorn 워커/서버에서 같은 작업 조회 가능)
+
+    - jobs:{job_id}        → 작업 요약 JSON
+    - jobs:{job_id}:files  → 파일별 상태 hash (field=파일 경로, value=JSON)
+    - jobs:index           → 작업 ID 목록 set
+    """
+
+    KEY_PREFIX = "jobs"
+
+    def __init__(self, url: str, ttl_seconds: int = 7 * 24 * 3600):
+        if redis is None:
+            raise ImportError("RedisJobStore를 사용하려면 redis 패키지가 필요합니다.")
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+
+    def _job_key(self, job_id: str) -> str:
+        return f"{self.KEY_PREFIX}:{job_id}"
+
+    def _files_key(self, job_id: str) -> str:
+        return f"{self.KEY_PREFIX}:{job_id}:files"
+
+    def create(self, job: dict):
+        pipe = self.client.pipeline()
+        pipe.set(self._job_key(job["job_id"]), json.dumps(job, ensure_ascii=False), ex=self.ttl_seconds)
+        pipe.sadd(f"{self.KEY_PREFIX}:index", job["job_id"])
+        pipe.execute()
+
+    def update(self, job_id: str, **fields):
+        with self._lock:
+            job = json.loads(self.client.get(self._job_key(job_id)) or "{}")
+            job.update(fields)
+            self.client.set(self._job_key(job_id), json.dumps(job, ensure_ascii=False), ex=self.ttl_seconds)
+
+    def set_file(self, job_id: str, file: str, file_status: dict):
+        pipe = self.client.pipeline()
+        pipe.hset(self._files_key(job_id), file, json.dumps(file_status, ensure_ascii=False))
+        pipe.expire(self._files_key(job_id), self.ttl_seconds)
+        pipe.execute()
+
+    def get(self, job_id: str, with_files: bool = True) -> Optional[dict]:
+        raw = self.client.get(self._job_key(job_id))
+        if raw is None:
+            return None
+        job = json.loads(raw)
+        if with_files:
+            files = self.client.hgetall(self._files_key(job_id))
+            job["files"] = {file: json.loads(value) for file, value in files.items()}
+        return job
+
+    def list(self) -> List[dict]:
+        jobs = []
+        for job_id in self.client.smembers(f"{self.KEY_PREFIX}:index"):
+            job = self.get(job_id, with_files=False)
+            if job is None:
+                # 만료된 작업은 목록에서 제거
+                self.client.srem(f"{self.KEY_PREFIX}:index", job_id)
+                continue
+            jobs.append(job)
+        return sorted(jobs, key=lambda j: j.get("created_at", ""))
+
+
+class JobManager:
+    """
+    오래 걸리는 작업(배치 파싱 등)을 백그라운드 스레드에서 실행하고 상태를 저장소에 기록하는 클래스
+
+    실제 파싱은 runner 안에서 프로세스 풀로 수행되며, 이 스레드는 결과 수집 및 진행 상황 기록만 담당합니다.
+    대기 중인 작업은 우선순위가 높은 것부터, 같은 우선순위는 등록 순서대로 시작합니다.
+    """
+
+    def __init__(self, store, max_concurrent_jobs: int = 1):
+        """
+        Args:
+            store: InMemoryJobStore 또는 RedisJobStore
+            max_concurrent_jobs: 동시에 실행할 최대 작업 수 (초과분은 queued 상태로 대기)
+        """
+        self.store = store
+        self._queue = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        for i in range(max(1, max_concurrent_jobs)):
+            threading.Thread(target=self._worker, name=f"job_{i}", daemon=True).start()
+
+    def submit(self, job_type: str, params: dict, runner: Callable[[str], Optional[dict]], priority: int = 0) -> str:
+        """
+        작업을 등록하고 즉시 job_id를 반환합니다.
+
+        Args:
+            job_type: 작업 종류 (예: "batch_parse")
+            params: 작업 요청 파라미터 (상태 조회 시 함께 반환)
+            runner: job_id를 받아 작업을 수행하고 결과 요약 dict를 반환하는 함수
+            priority: 높을수록 대기 중인 다른 작업보다 먼저 시작
+        """
+        job_id = uuid4().hex
+        self.store.create({
+            "job_id": job_id,
+            "type": job_type,
+            "params": params,
+            "status": "queued",
+            "priority": priority,
+            "created_at": _now(),
+            "started_at": None,
+            "finished_at": None,
+            "total_files": 0,
+            "done_files": 0,
+            "failed_files": 0,
+            "result": None,
+            "error": None,
+            })
+        with self._cond:
+            heapq.heappush(self._queue, (-priority, next(self._seq), job_id, runner))
+            self._cond.notify()
+        logger.info(f"작업 등록: {job_type} ({job_id}, 우선순위 {priority})")
+        return job_id
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                _, _, job_id, runner = heapq.heappop(self._queue)
+            self._run(job_id, runner)
+
+    def _run(self, job_id: str, runner: Callable[[str], Optional[dict]]):
+        self.store.update(job_id, status="running", started_at=_now())
+        try:
+            result = runner(job_id)
+            self.store.update(job_id, status="completed", finished_at=_now(), result=result)
+            logger.info(f"작업 완료: {job_id}")
+        except Exception as e:
+            logger.error(f"작업 실패: {job_id} - {e}")
+            self.store.update(job_id, status="failed", finished_at=_now(), error=str(e))
+
+    def register_files(self, job_id: str, files: List[str]):
+        """처리 대상 파일 목록을 pending 상태로 등록"""
+        for file in files:
+            self.store.set_file(job_id, file, {"status": "pending"})
+        self.store.update(job_id, total_files=len(files))
+
+    def update(self, job_id: str, **fields):
+        """작업 요약에 필드 추가/갱신 (예상 완료 시간 등)"""
+        self.store.update(job_id, **fields)
+
+    def record_file(self, job_id: str, file_result: dict, done_files: int, failed_files: int):
+        """파일 하나의 처리 결과 기록 및 진행률 갱신"""
+        file_status = {k: v for k, v in file_result.items() if k not in ("docs", "batch", "file")}
+        self.store.set_file(job_id, file_result["file"], file_status)
+        self.store.update(job_id, done_files=done_files, failed_files=failed_files)
+
+    def get(self, job_id: str, with_files: bool = True) -> Optional[dict]:
+        return self.store.get(job_id, with_files=with_files)
+
+    def list(self) -> List[dict]:
+        return self.store.list()
+
+
+def create_job_manager() -> JobManager:
+    """설정(JOB_BACKEND)에 따라 작업 관리자 생성 - redis 연결 실패 시 메모리 백엔드로 대체"""
+    store = InMemoryJobStore()
+    if config.JOB_BACKEND == "redis":
+        try:
+            store = RedisJobStore(config.REDIS_BACKEND_URL)
+            store.client.ping()
+            logger.info(f"작업 상태 저장소: Redis ({config.REDIS_BACKEND_URL})")
+        except Exception as e:
+            logger.warning(f"Redis 작업 저장소 연결 실패, 메모리 저장소 사용: {e}")
+            store = InMemoryJobStore()
+    return JobManager(store, max_concurrent_jobs=config.JOB_MAX_CONCURRENT)
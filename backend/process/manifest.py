@@ -0,0 +1,131 @@
+import os
+import json
+import hashlib
+import threading
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+def file_sha256(file_path: str, block_size: int = 1024 * 1024) -> str:
+    """파일 내용 SHA-256 (블록 단위로 읽어 메모리 사용 최소화)"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def normalize_path(file_path: str) -> str:
+    """매니페스트 키로 사용할 절대 경로 (구분자 통일)"""
+    return str(Path(file_path).resolve()).replace("\\", "/")
+
+
+class IngestionManifest:
+    """
+    파싱 완료 파일 기록 (파일 경로 → 크기, 수정 시각, 내용 해시, 파싱 설정, 결과 파일)
+
+    - 크기와 mtime이 같으면 해시 계산 없이 변경 없음으로 판단
+    - 크기/mtime이 다르면 내용 해시로 실제 변경 여부 확인 (복사/touch만 된 파일은 재파싱 안 함)
+    - 기록 당시 파싱 설정(settings 지문)이 현재와 다르면 내용이 같아도 변경으로 판단
+    """
+
+    # 기록할 때마다 전체 파일을 다시 쓰지 않도록 일정 개수마다 저장
+    SAVE_INTERVAL = 20
+
+    def __init__(self, manifest_path: str, settings: str = ""):
+        """
+        Args:
+            manifest_path: 매니페스트 JSON 경로
+            settings: 결과에 영향을 주는 파싱 설정 지문 (OCR 모드, 샤드 크기, 임베딩 모델 등)
+        """
+        self.manifest_path = Path(manifest_path)
+        self.settings = settings
+        self.entries: Dict[str, dict] = {}
+        self._dirty = 0
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        if self.manifest_path.exists():
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+
+    def save(self):
+        """임시 파일에 쓴 뒤 교체하여 중간에 중단되어도 매니페스트가 깨지지 않도록 저장"""
+        with self._lock:
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.manifest_path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, self.manifest_path)
+            self._dirty = 0
+
+    def diff(self, file_paths: List[str], folder_path: Optional[str] = None) -> dict:
+        """
+        현재 파일 목록과 매니페스트를 비교합니다.
+
+        Args:
+            file_paths: 현재 폴더의 파일 목록
+            folder_path: 삭제 파일 판단 범위 (이 폴더 하위의 매니페스트 항목만 비교)
+
+        Returns:
+            {"new": [...], "changed": [...], "unchanged": [...], "deleted": [...]}  - 원래 경로 기준
+        """
+        result = {"new": [], "changed": [], "unchanged": [], "deleted": []}
+        seen = set()
+
+        for file_path in file_paths:
+            key = normalize_path(file_path)
+            seen.add(key)
+            entry = self.entries.get(key)
+            if entry is None:
+                result["new"].append(file_path)
+                continue
+            if entry.get("settings") != self.settings:
+                # 다른 설정으로 파싱된 결과 (설정 기록이 없는 예전 항목 포함)
+                result["changed"].append(file_path)
+                continue
+
+            stat = os.stat(file_path)
+            if stat.st_size == entry["size"] and stat.st_mtime_ns == entry["mtime_ns"]:
+                result["unchanged"].append(file_path)
+                continue
+
+            if stat.st_size == entry["size"] and file_sha256(file_path) == entry["sha256"]:
+                # 내용은 동일 (mtime만 변경) → 다음 비교부터 해시 계산 생략
+                entry["mtime_ns"] = stat.st_mtime_ns
+                self._dirty += 1
+                result["unchanged"].append(file_path)
+            else:
+                result["changed"].append(file_path)
+
+        prefix = normalize_path(folder_path) + "/" if folder_path else ""
+        result["deleted"] = [key for key in self.entries if key.startswith(prefix) and key not in seen]
+        return result
+
+    def record(self, file_path: str, output: str = "", pages: int = 0):
+        """파싱 성공 파일 기록"""
+        stat = os.stat(file_path)
+        entry = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": file_sha256(file_path),
+            "settings": self.settings,
+            "output": output,
+            "pages": pages,
+            "parsed_at": datetime.now().isoformat(timespec="seconds"),
+            }
+        with self._lock:
+            self.entries[normalize_path(file_path)] = entry
+            self._dirty += 1
+            should_save = self._dirty >= self.SAVE_INTERVAL
+        if should_save:
+            self.save()
+
+    def forget(self, keys: List[str]):
+        """삭제된 파일 항목 제거"""
+        with self._lock:
+            for key in keys:
+                self.entries.pop(key, None)
+                self._dirty += 1
@@ -11,6 +11,8 @@ from pathlib import Path
 utils_path = Path(__file__).parent.parent
 sys.path.append(str(utils_path))
 
+from process.columnar import iter_parquet_rows, load_page_batch
+
 from utils.config import get_config
 from utils.setlogger import setup_logger
 config = get_config()
@@ -182,13 +184,12 @@ class MariaPipeline:
             if conn:
                 conn.close()
 
-    def insert_data_from_pickle(self, table_name: str, pickle_path: str):
-        """pickle 기반 insert"""
+    def insert_data_from_pickle(self, table_name: str, pickle_path: str, chunk_size: int = 500):
+        """pickle 기반 insert (PageBatch 또는 이전 형식의 Document 리스트)"""
         conn = None
         cur = None
         pickle_path = pickle_path.replace("\\", "/")
-        with open(pickle_path, 'rb') as f:
-            docs = pickle.load(f)
+        batch = load_page_batch(pickle_path)
         
         columns = ['id', 'page_content', 'filename', 'filepath','hashed_filename', 'hashed_filepath',
                     'hashed_page_content', 'page', 'lv1_cat', 'lv2_cat', 'lv3_cat', 'lv4_cat',
@@ -204,29 +205,9 @@ class MariaPipeline:
             conn = self._get_db_connection()
             cur = conn.cursor()
 
-            data = [{"page_content": doc.page_content, "metadata": doc.metadata} for doc in docs]
-            normalized = []
-            for row in tqdm(data):
-                new_row = [
-                    row["metadata"].get("id"),
-                    row.get("page_content"),
-                    row["metadata"].get("filename"),
-                    row["metadata"].get("filepath"),
-                    row["metadata"].get("hashed_filename"),
-                    row["metadata"].get("hashed_filepath"),
-                    row["metadata"].get("hashed_page_content"),
-                    row["metadata"].get("page"),
-                    row["metadata"].get("lv1_cat"),
-                    row["metadata"].get("lv2_cat"),
-                    row["metadata"].get("lv3_cat"),
-                    row["metadata"].get("lv4_cat"),
-                    row["metadata"].get("embeddings"),
-                    datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                ]
-                normalized.append(new_row)
-
-            cur.executemany(sql, normalized)
+            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            for rows in tqdm(batch.iter_rows(chunk_size), total=-(-len(batch) // chunk_size)):
+                cur.executemany(sql, [row + [now, now] for row in rows])
             conn.commit()
 
         except Exception as error:
@@ -238,6 +219,40 @@ class MariaPipeline:
             if conn:
                 conn.close()
 
+    def insert_data_from_parquet(self, table_name: str, parquet_path: str, batch_size: int = 500):
+        """parquet 기반 insert (row batch 단위)"""
+        conn = None
+        cur = None
+        parquet_path = parquet_path.replace("\\", "/")
+
+        columns = ['id', 'page_content', 'filename', 'filepath','hashed_filename', 'hashed_filepath',
+                    'hashed_page_content', 'page', 'lv1_cat', 'lv2_cat', 'lv3_cat', 'lv4_cat',
+                    'embeddings', 'created_at', 'updated_at']
+
+        columns_sql = ", ".join([f"`{c}`" for c in columns])
+        placeholders = ", ".join(["%s"] * len(columns))
+
+        sql = f"INSERT INTO `{table_name}` ({columns_sql}) VALUES ({placeholders})"
+
+        try:
+            logger.info("START - INSERT FROM PARQUET")
+            conn = self._get_db_connection()
+            cur = conn.cursor()
+
+            for rows in iter_parquet_rows(parquet_path, batch_size=batch_size):
+                now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                cur.executemany(sql, [row + [now, now] for row in rows])
+                conn.commit()
+
+        except Exception as error:
+            logger.error(f"INSERT ERROR: {error}")
+            if conn:
+                conn.rollback()
+        finally:
+            if cur: cur.close()
+            if conn:
+                conn.close()
+
     def select_all_data(self, table_name: str, limit: Optional[int] = 10, order_by: str = "id"):
         """전체 조회"""
         conn = None
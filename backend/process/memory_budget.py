@@ -0,0 +1,162 @@
+import os
+import threading
+import itertools
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+import psutil
+
+from utils.config import get_config
+from utils.setlogger import setup_logger
+config = get_config()
+logger = setup_logger(f"{__name__}", level=config.LOG_LEVEL)
+
+
+# 변환 작업 메모리 추정 상수 (모델 가중치는 프로세스 RSS로 따로 측정되므로 문서별 작업 메모리만 추정)
+RETAINED_MB_PER_PAGE = 3.0      # 변환 결과(DoclingDocument, 셀/표 구조)로 유지되는 페이지당 메모리
+RENDER_BATCH_PAGES = 4          # 동시에 렌더링/추론하는 페이지 수 (docling page batch)
+LAYOUT_RENDER_SCALE = 2.0       # 레이아웃/표 모델 입력 이미지 배율 (72dpi 기준)
+OCR_RENDER_SCALE = 3.0          # OCR 입력 이미지 배율
+BYTES_PER_PIXEL = 4             # RGBA 비트맵 + 모델 입력 텐서 여유
+TEXT_FORMAT_BASE_MB = 200.0     # DOCX/HTML SimplePipeline 변환 기본 메모리
+TEXT_FORMAT_MB_PER_FILE_MB = 20.0
+
+
+def estimate_conversion_mb(pages: int, ocr_pages: int = 0, page_megapixels: float = 0.5,
+                           max_pages_per_conversion: int = 0, text_format: bool = False, size_mb: float = 0.0) -> float:
+    """
+    문서 하나를 변환할 때 추가로 필요한 메모리(MB) 추정
+
+    Args:
+        pages: 페이지 수
+        ocr_pages: OCR 대상 페이지 수 (OCR 페이지는 고해상도로 렌더링)
+        page_megapixels: 72dpi 기준 페이지 면적(백만 픽셀, A4 ≈ 0.5)
+        max_pages_per_conversion: 샤딩 단위 (0이면 문서 전체를 한 번에 변환)
+        text_format: DOCX/TXT/MD/HTML 여부
+        size_mb: 파일 크기
+    """
+    if text_format:
+        return round(TEXT_FORMAT_BASE_MB + TEXT_FORMAT_MB_PER_FILE_MB * size_mb, 1)
+
+    retained_pages = min(pages, max_pages_per_conversion) if max_pages_per_conversion > 0 else pages
+    scale = OCR_RENDER_SCALE if ocr_pages else LAYOUT_RENDER_SCALE
+    render_mb = min(pages, RENDER_BATCH_PAGES) * page_megapixels * scale * scale * BYTES_PER_PIXEL
+    return round(retained_pages * RETAINED_MB_PER_PAGE + render_mb, 1)
+
+
+class MemoryBudget:
+    """
+    변환 작업 메모리 예산 기반 입장(admission) 제어
+
+    - 작업마다 추정 메모리를 예약하고, 예약 합계와 실제 RSS(현재 프로세스 + 자식 워커 프로세스)가
+      예산 안에 들어올 때만 새 작업을 시작
+    - 진행 중인 예약이 하나도 없으면 예산을 넘는 큰 작업도 시작 (한 번에 하나씩만 처리되어 교착 없음)
+    - budget_mb < 0 이면 제한 없음
+    """
+
+    def __init__(self, budget_mb: float, poll_interval: float = 1.0):
+        self.budget_mb = budget_mb
+        self.poll_interval = poll_interval
+        self._process = psutil.Process(os.getpid())
+        # 예약 전 기준 RSS (모델 로드 등 작업과 무관한 메모리)
+        self._baseline_mb = self.current_rss_mb()
+        self._reservations: Dict[int, float] = {}
+        self._ids = itertools.count(1)
+        self._cond = threading.Condition()
+        self.admitted = 0
+        self.waited = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.budget_mb > 0
+
+    def current_rss_mb(self) -> float:
+        """현재 프로세스와 자식 프로세스(파싱/샤드 워커) RSS 합계(MB)"""
+        total = 0
+        for proc in [self._process, *self._process.children(recursive=True)]:
+            try:
+                total += proc.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return total / (1024 * 1024)
+
+    def _fits(self, mb: float) -> bool:
+        if not self.enabled or not self._reservations:
+            return True
+        reserved = sum(self._reservations.values())
+        projected = max(self._baseline_mb + reserved, self.current_rss_mb()) + mb
+        return projected <= self.budget_mb
+
+    def _admit(self, mb: float) -> int:
+        reservation_id = next(self._ids)
+        self._reservations[reservation_id] = mb
+        self.admitted += 1
+        return reservation_id
+
+    def try_acquire(self, mb: float) -> Optional[int]:
+        """예산이 허락하면 예약 id, 아니면 None (대기하지 않음)"""
+        with self._cond:
+            return self._admit(mb) if self._fits(mb) else None
+
+    def acquire(self, mb: float) -> int:
+        """예산이 허락할 때까지 대기 후 예약 id 반환"""
+        with self._cond:
+            if not self._fits(mb):
+                self.waited += 1
+                logger.info(f"메모리 예산 대기 - 필요 {mb:.0f}MB, 예약 {sum(self._reservations.values()):.0f}MB / 예산 {self.budget_mb:.0f}MB")
+                # 다른 작업 종료(release) 또는 RSS 감소를 주기적으로 재확인
+                while not self._fits(mb):
+                    self._cond.wait(self.poll_interval)
+            return self._admit(mb)
+
+    def release(self, reservation_id: Optional[int]):
+        if reservation_id is None:
+            return
+        with self._cond:
+            self._reservations.pop(reservation_id, None)
+            self._cond.notify_all()
+
+    @contextmanager
+    def reserve(self, mb: float):
+        reservation_id = self.acquire(mb)
+        try:
+            yield
+        finally:
+            self.release(reservation_id)
+
+    def stats(self) -> dict:
+        with self._cond:
+            reserved = sum(self._reservations.values())
+            running = len(self._reservations)
+        return {
+            "budget_mb": self.budget_mb,
+            "reserved_mb": round(reserved, 1),
+            "rss_mb": round(self.current_rss_mb(), 1),
+            "running": running,
+            "admitted": self.admitted,
+            "waited": self.waited,
+            }
+
+
+_BUDGET: Optional[MemoryBudget] = None
+_BUDGET_LOCK = threading.Lock()
+
+
+def get_memory_budget() -> MemoryBudget:
+    """
+    설정값으로 생성된 프로세스 공유 메모리 예산 (MEMORY_BUDGET_MB=0 이면 전체 메모리의 75%, 음수면 제한 없음)
+
+    - 예산은 서버 프로세스(uvicorn 워커)마다 따로 관리되므로 전체 예산을 SERVER_WORKERS로 나눠 사용
+    - 파싱/샤드 워커 프로세스는 예산을 만들지 않음 (부모 프로세스가 자식 RSS까지 합산하여 배정)
+    """
+    global _BUDGET
+    with _BUDGET_LOCK:
+        if _BUDGET is None:
+            budget_mb = config.MEMORY_BUDGET_MB
+            if budget_mb == 0:
+                budget_mb = psutil.virtual_memory().total / (1024 * 1024) * 0.75
+            if budget_mb > 0:
+                budget_mb /= max(1, config.SERVER_WORKERS)
+            _BUDGET = MemoryBudget(budget_mb, poll_interval=config.MEMORY_POLL_INTERVAL)
+            logger.info(f"변환 메모리 예산: {budget_mb:.0f}MB" if budget_mb > 0 else "변환 메모리 예산: 제한 없음")
+        return _BUDGET
@@ -0,0 +1,182 @@
+import re
+import sqlite3
+import hashlib
+import threading
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from utils.config import get_config
+from utils.setlogger import setup_logger
+config = get_config()
+logger = setup_logger(f"{__name__}", level=config.LOG_LEVEL)
+
+
+SIMHASH_BITS = 64
+# 64비트를 8비트씩 8개 밴드로 나눔 - 해밍 거리 7 이하인 두 해시는 최소 한 밴드가 완전히 같음 (비둘기집 원리)
+BAND_BITS = 8
+NUM_BANDS = SIMHASH_BITS // BAND_BITS
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def simhash(text: str, shingle_size: int = 3) -> int:
+    """
+    단어 n-gram(shingle) 기반 64비트 SimHash
+    대소문자/공백/구두점 차이는 무시하므로 머리말, 면책 문구처럼 거의 같은 페이지는 해밍 거리가 작게 나옵니다.
+    """
+    tokens = _TOKEN_PATTERN.findall(text.lower())
+    if len(tokens) < shingle_size:
+        shingles = [" ".join(tokens)]
+    else:
+        shingles = [" ".join(tokens[i:i + shingle_size]) for i in range(len(tokens) - shingle_size + 1)]
+
+    weights = [0] * SIMHASH_BITS
+    for shingle in shingles:
+        h = int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), "big")
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if (h >> bit) & 1 else -1
+
+    value = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            value |= 1 << bit
+    return value
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def _bands(value: int) -> List[int]:
+    mask = (1 << BAND_BITS) - 1
+    return [(value >> (i * BAND_BITS)) & mask for i in range(NUM_BANDS)]
+
+
+def _to_signed(value: int) -> int:
+    """SQLite INTEGER(부호 있는 64비트)에 저장하기 위한 변환"""
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def _to_unsigned(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
+
+
+class NearDuplicateIndex:
+    """
+    프로젝트(lv1_cat) 단위 유사 중복 페이지 인덱스
+
+    - 페이지 본문 SimHash를 8개 밴드로 나누어 저장하고, 밴드가 하나라도 같은 후보만 해밍 거리 비교
+    - 대표 페이지의 임베딩을 float32 바이트로 함께 저장하여 유사 페이지는 임베딩 호출 없이 재사용
+    - 인스턴스별 검사/중복 카운터로 중복 비율 제공
+    """
+
+    def __init__(self, db_path: str, max_distance: int = 6):
+        """
+        Args:
+            db_path: 인덱스 SQLite 파일 경로
+            max_distance: 유사 중복으로 판단할 최대 해밍 거리 (64비트 중, 최대 7)
+        """
+        if not 0 <= max_distance < NUM_BANDS:
+            raise ValueError(f"max_distance는 0~{NUM_BANDS - 1} 사이여야 합니다: {max_distance}")
+        self.db_path = db_path
+        self.max_distance = max_distance
+        self.checked = 0
+        self.duplicates = 0
+        self._lock = threading.Lock()
+
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS pages (
+                project TEXT NOT NULL,
+                simhash INTEGER NOT NULL,
+                {band_columns},
+                doc_id TEXT NOT NULL,
+                filepath TEXT,
+                page TEXT,
+                vector BLOB NOT NULL
+            )
+            """.format(band_columns=",\n                ".join(f"band{i} INTEGER NOT NULL" for i in range(NUM_BANDS)))
+            )
+        for band in range(NUM_BANDS):
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_pages_band{band} ON pages (project, band{band})")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_pages_filepath ON pages (filepath)")
+        self._conn.commit()
+
+    def find(self, project: str, value: int, exclude_filepath: Optional[str] = None) -> Optional[dict]:
+        """
+        가장 가까운 유사 중복 페이지 조회 (없으면 None)
+
+        Args:
+            exclude_filepath: 이 파일에서 등록된 페이지는 제외 (같은 파일을 다시 파싱할 때 이전 자기 자신과 매칭되지 않도록)
+        """
+        bands = _bands(value)
+        where = " OR ".join(f"band{i} = ?" for i in range(NUM_BANDS))
+        query = f"SELECT simhash, doc_id, filepath, page, vector FROM pages WHERE project = ? AND ({where})"
+        params = [project, *bands]
+        if exclude_filepath is not None:
+            query += " AND (filepath IS NULL OR filepath != ?)"
+            params.append(exclude_filepath)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        best = None
+        for stored, doc_id, filepath, page, blob in rows:
+            distance = hamming_distance(value, _to_unsigned(stored))
+            if distance <= self.max_distance and (best is None or distance < best["distance"]):
+                best = {"doc_id": doc_id, "filepath": filepath, "page": page, "distance": distance, "blob": blob}
+
+        if best is not None:
+            vector = array("f")
+            vector.frombytes(best.pop("blob"))
+            best["embedding"] = vector.tolist()
+        return best
+
+    def add_many(self, project: str, items: List[Tuple[int, str, str, str, List[float]]]):
+        """대표 페이지 등록 - (simhash, doc_id, filepath, page, 임베딩) 리스트"""
+        if not items:
+            return
+        rows = [
+            (project, _to_signed(value), *_bands(value), doc_id, filepath, page, array("f", vector).tobytes())
+            for value, doc_id, filepath, page, vector in items
+            ]
+        band_columns = ", ".join(f"band{i}" for i in range(NUM_BANDS))
+        placeholders = ", ".join(["?"] * (NUM_BANDS + 6))
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT INTO pages (project, simhash, {band_columns}, doc_id, filepath, page, vector) VALUES ({placeholders})",
+                rows,
+                )
+            self._conn.commit()
+
+    def remove(self, filepath: str) -> int:
+        """파일에서 등록된 대표 페이지 삭제 (재파싱/삭제된 파일의 예전 내용이 새 페이지를 중복으로 잡지 않도록)"""
+        with self._lock:
+            removed = self._conn.execute("DELETE FROM pages WHERE filepath = ?", (filepath,)).rowcount
+            self._conn.commit()
+        return removed
+
+    def record(self, checked: int, duplicates: int):
+        with self._lock:
+            self.checked += checked
+            self.duplicates += duplicates
+
+    def stats(self) -> dict:
+        """검사/중복 페이지 수와 중복 비율 (현재 프로세스 기준) 및 프로젝트별 대표 페이지 수"""
+        with self._lock:
+            projects = dict(self._conn.execute("SELECT project, COUNT(*) FROM pages GROUP BY project").fetchall())
+        return {
+            "max_distance": self.max_distance,
+            "checked": self.checked,
+            "duplicates": self.duplicates,
+            "dedup_ratio": round(self.duplicates / self.checked, 4) if self.checked else 0.0,
+            "projects": projects,
+            }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
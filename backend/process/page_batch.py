@@ -0,0 +1,148 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+
+from utils.config import get_config
+config = get_config()
+
+# 임베딩이 하나도 없는 배치의 기본 차원 (임베딩이 있으면 첫 벡터 길이를 사용)
+EMBEDDING_DIM = config.EMBEDDING_DIM
+
+# 문자열 메타데이터 컬럼 (RDB 테이블 컬럼과 동일한 이름)
+TEXT_COLUMNS = ['id', 'filename', 'filepath', 'hashed_filename', 'hashed_filepath', 'hashed_page_content',
+                'page', 'lv1_cat', 'lv2_cat', 'lv3_cat', 'lv4_cat', 'status']
+
+# RDB insert 시 사용하는 컬럼 순서 (created_at, updated_at 제외)
+ROW_COLUMNS = ['id', 'page_content', 'filename', 'filepath', 'hashed_filename', 'hashed_filepath', 'hashed_page_content',
+               'page', 'lv1_cat', 'lv2_cat', 'lv3_cat', 'lv4_cat', 'embeddings']
+
+
+class PageBatch:
+    """
+    페이지 묶음을 컬럼 단위로 저장하는 컨테이너
+
+    - embeddings: (페이지 수, dim) float32 연속 행렬 (페이지당 4KB, Document 메타데이터의 float 리스트 대비 약 1/8)
+    - has_embedding: 임베딩 유무 bool 배열 (실패 페이지는 False, 행렬 값은 0)
+    - columns: TEXT_COLUMNS 별 문자열 리스트
+    - extra: 그 외 페이지별 메타데이터 (ocr, text_chars, error, duplicate_of 등) - 없으면 None
+
+    파서, RDB 적재, ES 색인은 이 구조를 그대로 사용하고 Document 변환은 API 응답 등 경계에서만 수행합니다.
+    """
+
+    __slots__ = ("page_content", "columns", "embeddings", "has_embedding", "extra")
+
+    def __init__(self, page_content: List[str], columns: Dict[str, List[Optional[str]]], embeddings: np.ndarray,
+                 has_embedding: np.ndarray, extra: List[Optional[dict]]):
+        self.page_content = page_content
+        self.columns = columns
+        self.embeddings = embeddings
+        self.has_embedding = has_embedding
+        self.extra = extra
+
+    def __len__(self) -> int:
+        return len(self.page_content)
+
+    @classmethod
+    def empty(cls, dim: int = EMBEDDING_DIM) -> "PageBatch":
+        return cls([], {name: [] for name in TEXT_COLUMNS}, np.zeros((0, dim), dtype=np.float32),
+                   np.zeros(0, dtype=bool), [])
+
+    @classmethod
+    def from_records(cls, records: Sequence[Tuple[str, dict, Optional[Sequence[float]]]], dim: Optional[int] = None) -> "PageBatch":
+        """
+        (page_content, 메타데이터 dict, 임베딩 또는 None) 목록으로 생성
+        메타데이터 중 TEXT_COLUMNS는 컬럼으로, 나머지(embeddings 제외)는 extra로 저장
+        dim을 지정하지 않으면 첫 임베딩 길이를 사용 (임베딩이 하나도 없으면 EMBEDDING_DIM)
+        길이가 다른 임베딩이 섞여 있으면 ValueError
+        """
+        if dim is None:
+            dim = next((len(vector) for _, _, vector in records if vector is not None and len(vector)), EMBEDDING_DIM)
+        n = len(records)
+        embeddings = np.zeros((n, dim), dtype=np.float32)
+        has_embedding = np.zeros(n, dtype=bool)
+        columns = {name: [None] * n for name in TEXT_COLUMNS}
+        page_content, extra = [], []
+
+        for i, (content, metadata, vector) in enumerate(records):
+            page_content.append(content)
+            for name in TEXT_COLUMNS:
+                columns[name][i] = metadata.get(name)
+            rest = {k: v for k, v in metadata.items() if k not in columns and k != 'embeddings'}
+            extra.append(rest or None)
+            if vector is None or not len(vector):
+                continue
+            if len(vector) != dim:
+                raise ValueError(f"임베딩 차원 불일치: {i}번째 페이지 {len(vector)} (기대값 {dim})")
+            embeddings[i] = vector
+            has_embedding[i] = True
+        return cls(page_content, columns, embeddings, has_embedding, extra)
+
+    @classmethod
+    def from_documents(cls, docs: Iterable[Document], dim: Optional[int] = None) -> "PageBatch":
+        return cls.from_records([(doc.page_content, doc.metadata, doc.metadata.get('embeddings')) for doc in docs], dim)
+
+    @classmethod
+    def concat(cls, batches: List["PageBatch"], dim: int = EMBEDDING_DIM) -> "PageBatch":
+        batches = [batch for batch in batches if len(batch)]
+        if not batches:
+            return cls.empty(dim)
+        if len(batches) == 1:
+            return batches[0]
+        dims = {batch.embeddings.shape[1] for batch in batches}
+        if len(dims) > 1:
+            raise ValueError(f"임베딩 차원이 다른 배치는 합칠 수 없습니다: {sorted(dims)}")
+        return cls(
+            [content for batch in batches for content in batch.page_content],
+            {name: [value for batch in batches for value in batch.columns[name]] for name in TEXT_COLUMNS},
+            np.concatenate([batch.embeddings for batch in batches]),
+            np.concatenate([batch.has_embedding for batch in batches]),
+            [item for batch in batches for item in batch.extra],
+            )
+
+    def take(self, indices: Sequence[int]) -> "PageBatch":
+        """지정 순서/부분 페이지만 담은 새 배치"""
+        indices = list(indices)
+        return PageBatch(
+            [self.page_content[i] for i in indices],
+            {name: [values[i] for i in indices] for name, values in self.columns.items()},
+            self.embeddings[indices],
+            self.has_embedding[indices],
+            [self.extra[i] for i in indices],
+            )
+
+    def sorted_by_page(self) -> "PageBatch":
+        return self.take(sorted(range(len(self)), key=lambda i: int(self.columns['page'][i])))
+
+    def count_status(self, status: str) -> int:
+        return sum(1 for value in self.columns['status'] if value == status)
+
+    def metadata(self, i: int, with_embeddings: bool = True) -> dict:
+        """i번째 페이지 메타데이터 dict (Document 호환 형식)"""
+        metadata = {name: self.columns[name][i] for name in TEXT_COLUMNS}
+        if with_embeddings:
+            metadata['embeddings'] = self.embedding_list(i)
+        if self.extra[i]:
+            metadata.update(self.extra[i])
+        return metadata
+
+    def embedding_list(self, i: int) -> List[float]:
+        """i번째 임베딩을 float 리스트로 (없으면 빈 리스트) - 외부 라이브러리 전달 직전에만 사용"""
+        return self.embeddings[i].tolist() if self.has_embedding[i] else []
+
+    def to_documents(self) -> List[Document]:
+        """API 응답 등 Document가 필요한 경계에서만 변환"""
+        return [Document(page_content=self.page_content[i], metadata=self.metadata(i)) for i in range(len(self))]
+
+    def iter_rows(self, chunk_size: int = 500) -> Iterator[List[list]]:
+        """RDB insert용 행(ROW_COLUMNS 순서)을 chunk 단위로 생성 (임베딩 리스트는 해당 chunk에서만 생성)"""
+        for start in range(0, len(self), chunk_size):
+            rows = []
+            for i in range(start, min(start + chunk_size, len(self))):
+                rows.append([
+                    self.page_content[i] if name == 'page_content'
+                    else self.embedding_list(i) if name == 'embeddings'
+                    else self.columns[name][i]
+                    for name in ROW_COLUMNS
+                    ])
+            yield rows
@@ -0,0 +1,83 @@
+from collections import defaultdict
+from typing import Any, Dict, Optional, Set
+
+from docling_core.transforms.serializer.markdown import MarkdownDocSerializer, MarkdownParams
+from docling_core.types.doc import DocItem, DoclingDocument, FloatingItem
+from docling_core.types.doc.document import DEFAULT_CONTENT_LAYERS, DOCUMENT_TOKENS_EXPORT_LABELS
+
+
+class _PageExcludedRefs:
+    """현재 페이지에 속하지 않는 DocItem 참조를 '제외'로 판정하는 집합 대용 객체 (docling은 `in` 검사만 사용)"""
+
+    def __init__(self, item_pages: Dict[str, Optional[int]]):
+        self.item_pages = item_pages
+        self.page_no: Optional[int] = None
+
+    def __contains__(self, ref: str) -> bool:
+        return ref in self.item_pages and self.item_pages[ref] != self.page_no
+
+
+class _PageMarkdownSerializer(MarkdownDocSerializer):
+    """페이지 필터를 미리 계산한 참조 표로 판정하는 docling 마크다운 직렬화기"""
+
+    excluded_refs: Any = None
+
+    def get_excluded_refs(self, **kwargs: Any) -> _PageExcludedRefs:
+        return self.excluded_refs
+
+
+def _item_pages(document: DoclingDocument, params: MarkdownParams) -> Dict[str, Optional[int]]:
+    """DocItem별로 출력될 페이지 번호 (export_to_markdown(page_no=...)의 제외 규칙과 동일, 어느 페이지에도 나오지 않으면 None)"""
+    item_pages = {}
+    for item, _level in document.iterate_items(with_groups=True, included_content_layers=params.layers, traverse_pictures=True):
+        if not isinstance(item, DocItem):
+            continue
+        visible = item.prov and item.label in params.labels and item.content_layer in params.layers
+        item_pages[item.self_ref] = item.prov[0].page_no if visible else None
+    return item_pages
+
+
+def _candidate_pages(node, document: DoclingDocument, params: MarkdownParams, item_pages: Dict[str, Optional[int]]) -> Set[int]:
+    """항목(그룹이면 하위 항목 포함)이 내용을 낼 수 있는 페이지 - 캡션은 다른 페이지에 있어도 본 항목과 함께 출력되므로 포함"""
+    pages = set()
+    for item, _level in document.iterate_items(root=node, with_groups=True, included_content_layers=params.layers, traverse_pictures=True):
+        pages.add(item_pages.get(item.self_ref))
+        if isinstance(item, FloatingItem):
+            pages.update(item_pages.get(cap.cref) for cap in item.captions)
+    pages.discard(None)
+    return pages
+
+
+def export_markdown_by_page(document: DoclingDocument) -> Dict[int, str]:
+    """
+    DoclingDocument를 한 번만 순회하여 페이지별 마크다운을 생성합니다.
+
+    export_to_markdown(page_no=...)를 페이지마다 호출하면 매번 문서 전체를 다시 훑으므로
+    (페이지 수)^2 비용이 들지만, 여기서는 docling 마크다운 직렬화기 하나로 각 항목을 해당 페이지에서만 직렬화합니다.
+    직렬화 규칙(캡션, 목록, 이스케이프 등)은 docling과 같으므로 결과는 export_to_markdown(page_no=...)와 동일합니다.
+
+    Returns:
+        {페이지 번호(1부터 시작): 마크다운 문자열}
+    """
+    params = MarkdownParams(labels=DOCUMENT_TOKENS_EXPORT_LABELS, layers=DEFAULT_CONTENT_LAYERS)
+    item_pages = _item_pages(document, params)
+    excluded_refs = _PageExcludedRefs(item_pages)
+    serializer = _PageMarkdownSerializer(doc=document, params=params, excluded_refs=excluded_refs)
+    param_kwargs = params.model_dump()
+
+    # docling get_parts와 같은 순서로 순회하되, 페이지마다 방문 기록을 따로 둠
+    parts = defaultdict(list)
+    visited = defaultdict(set)
+    for node, level in document.iterate_items(with_groups=True, included_content_layers=params.layers):
+        if node is document.body:
+            continue
+        for page_no in sorted(_candidate_pages(node, document, params, item_pages)):
+            if node.self_ref in visited[page_no]:
+                continue
+            visited[page_no].add(node.self_ref)
+            excluded_refs.page_no = page_no
+            part = serializer.serialize(item=node, visited=visited[page_no], **(param_kwargs | dict(level=level)))
+            if part.text:
+                parts[page_no].append(part.text)
+
+    return {page_no: "\n\n".join(texts) for page_no, texts in parts.items()}
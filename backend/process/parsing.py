@@ -6,12 +6,14 @@ from pathlib import Path
 import os
 import time
 import hashlib
+import threading
 from uuid import uuid4
+import sys
 import pickle
-import pdfplumber
+from contextlib import contextmanager
 from tqdm.auto import tqdm
 from langchain_core.documents import Document
-from typing import List, Optional
+from typing import Dict, List, Optional
 from langchain_ollama import OllamaEmbeddings
 
 from docling.backend.pypdfium2_backend import PyPdfiumDocumentBackend
@@ -20,12 +22,112 @@ from docling.document_converter import (
     DocumentConverter,
     PdfFormatOption,
     WordFormatOption,
+    HTMLFormatOption,
     )
 from docling.datamodel.pipeline_options import PdfPipelineOptions, EasyOcrOptions
 from docling.pipeline.simple_pipeline import SimplePipeline
 from docling.pipeline.standard_pdf_pipeline import StandardPdfPipeline
 
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+utils_path = Path(__file__).parent.parent
+sys.path.append(str(utils_path))
+
+from process.embedding_cache import EmbeddingCache
+from process.columnar import save_page_batch
+from process.page_batch import PageBatch
+from process.manifest import IngestionManifest
+from process.checkpoint import PageCheckpoint
+from process.cost_model import CostModel, probe_file_features, simulate_finish_times
+from process.scheduler import SCHEDULE_POLICIES, TaskScheduler
+from process.memory_budget import get_memory_budget, estimate_conversion_mb
+from process.rate_limiter import get_rate_limiter
+from process.page_export import export_markdown_by_page
+from process.pdf_probe import get_pdf_page_count, probe_pdf_text_layer, probe_pdf_features, group_page_runs, split_page_runs
+from process.near_dup import NearDuplicateIndex, simhash, hamming_distance
+from process.text_formats import SUPPORTED_SUFFIXES, PLAIN_TEXT_SUFFIXES, is_supported, is_text_format, read_text_file, split_pseudo_pages
+
+
+# 프로세스 단위 변환기 캐시 (파이프라인 옵션별로 한 번만 생성하여 모델 재로딩 방지)
+_CONVERTER_CACHE: Dict[str, DocumentConverter] = {}
+_CONVERTER_LOCK = threading.Lock()
+
+def _pipeline_options_key(pipeline_options: PdfPipelineOptions) -> str:
+    """파이프라인 옵션을 캐시 키 문자열로 변환"""
+    try:
+        return pipeline_options.model_dump_json()
+    except Exception:
+        return repr(pipeline_options)
+
+def get_converter(pipeline_options: PdfPipelineOptions) -> DocumentConverter:
+    """
+    파이프라인 옵션에 해당하는 DocumentConverter를 반환합니다.
+    프로세스 내 최초 요청 시에만 생성 및 파이프라인(레이아웃/OCR 모델) 초기화를 수행합니다.
+    """
+    key = _pipeline_options_key(pipeline_options)
+    converter = _CONVERTER_CACHE.get(key)
+    if converter is not None:
+        return converter
+
+    with _CONVERTER_LOCK:
+        converter = _CONVERTER_CACHE.get(key)
+        if converter is None:
+            converter = DocumentConverter(
+                allowed_formats=[InputFormat.PDF],
+                format_options={
+                    InputFormat.PDF: PdfFormatOption(
+                        pipeline_options=pipeline_options,
+                        backend=PyPdfiumDocumentBackend
+                    ),
+                }
+            )
+            converter.initialize_pipeline(InputFormat.PDF)
+            _CONVERTER_CACHE[key] = converter
+    return converter
+
+
+def get_simple_converter() -> DocumentConverter:
+    """
+    DOCX/HTML용 변환기 - 레이아웃/OCR 모델을 쓰지 않는 SimplePipeline 기반 (프로세스 내 한 번만 생성)
+    """
+    key = "__simple__"
+    converter = _CONVERTER_CACHE.get(key)
+    if converter is not None:
+        return converter
+
+    with _CONVERTER_LOCK:
+        converter = _CONVERTER_CACHE.get(key)
+        if converter is None:
+            converter = DocumentConverter(
+                allowed_formats=[InputFormat.DOCX, InputFormat.HTML],
+                format_options={
+                    InputFormat.DOCX: WordFormatOption(pipeline_cls=SimplePipeline),
+                    InputFormat.HTML: HTMLFormatOption(pipeline_cls=SimplePipeline),
+                }
+            )
+            _CONVERTER_CACHE[key] = converter
+    return converter
+
+
+# 프로세스 풀 워커별 파서 인스턴스 (워커 초기화 시 한 번만 생성)
+_worker_parser = None
+
+def _init_worker(parser_kwargs: dict):
+    """프로세스 풀 워커 초기화 - 워커마다 파서와 변환기를 미리 준비"""
+    global _worker_parser
+    _worker_parser = DoclingParser(**parser_kwargs)
+    _worker_parser.warm_up()  # 변환기 예열 (레이아웃/OCR 모델 로드)
+
+def _parse_in_worker(pdf_file: str, cats: dict) -> dict:
+    """워커 프로세스에서 단일 파일 파싱"""
+    return _worker_parser._parse_file_task(pdf_file, cats)
+
+def _convert_shard_in_worker(pdf_path: str, do_ocr: bool, start_page: int, end_page: int) -> Dict[int, str]:
+    """워커 프로세스에서 PDF 페이지 구간(샤드) 변환"""
+    options = DoclingParser.DEFAULT_PIPELINE_OPTIONS if do_ocr else DoclingParser.NO_OCR_PIPELINE_OPTIONS
+    return _worker_parser._convert_page_range(Path(pdf_path), options, start_page, end_page)
+
 
 class DoclingParser:
     """PDF 문서를 Docling을 사용하여 파싱하는 클래스"""
@@ -39,15 +141,126 @@ class DoclingParser:
         do_table_structure=True,
         ocr_options=EasyOcrOptions(lang=["en", "ko"])
         )
+
+    # 텍스트 레이어가 있는 페이지용 옵션 (OCR 모델 미사용)
+    NO_OCR_PIPELINE_OPTIONS = PdfPipelineOptions(
+        do_ocr=False,
+        do_table_structure=True,
+        )
+
+    # adaptive 모드: 페이지 구간이 너무 잘게 나뉘면 변환 호출 오버헤드가 커지므로 전체 OCR로 처리
+    MAX_ADAPTIVE_RUNS = 8
+
+    # 체크포인트 사용 시 샤딩을 켜지 않아도 이 페이지 수 단위로 변환 (구간마다 완료 페이지가 기록되고 재개 시 건너뜀)
+    CHECKPOINT_WINDOW_PAGES = 50
     
-    def __init__(self, output_base_path: str = "../docs"):
+    def __init__(self, output_base_path: str = "../docs", num_workers: int = 1, embed_batch_size: int = 32,
+                 embed_cache_path: Optional[str] = None, embed_cache_max_entries: int = 200_000,
+                 ocr_mode: str = "always", ocr_min_text_chars: int = 50,
+                 shard_pages: int = 0, shard_workers: int = 1, output_format: str = "pickle",
+                 checkpoint: bool = False, text_page_chars: int = 3000,
+                 dedup_mode: str = "off", dedup_index_path: Optional[str] = None, dedup_max_distance: int = 6,
+                 dedup_min_chars: int = 200, cost_model_path: Optional[str] = None,
+                 schedule_policy: str = "fifo", project_priorities: Optional[Dict[str, int]] = None,
+                 use_memory_budget: bool = True, worker_max_tasks: int = 0):
         """
         Args:
             output_base_path: 파싱된 문서를 저장할 기본 경로
+            num_workers: 배치 처리 시 사용할 프로세스 수 (1이면 단일 프로세스 순차 처리)
+            embed_batch_size: embed_documents 한 번에 보낼 페이지 수
+            embed_cache_path: 임베딩 캐시 파일 경로 (None이면 캐시 미사용)
+            embed_cache_max_entries: 임베딩 캐시 최대 저장 개수
+            ocr_mode: "always"(모든 페이지 OCR), "adaptive"(텍스트 레이어 없는 페이지만 OCR), "never"
+            ocr_min_text_chars: adaptive 모드에서 텍스트 레이어가 있다고 판단할 최소 글자 수
+            shard_pages: 이 페이지 수보다 큰 PDF는 이 단위의 페이지 구간으로 나누어 변환 (0이면 미사용)
+            shard_workers: 샤드 병렬 변환 프로세스 수 (1이면 순차 변환)
+            output_format: 파싱 결과 저장 형식 - "pickle"(.pkl) 또는 "parquet"(.parquet, float32 임베딩 컬럼)
+            checkpoint: 페이지 단위 체크포인트 사용 여부 (중단 후 재시도 시 완료된 페이지는 변환/임베딩 생략)
+            text_page_chars: 페이지 구분이 없는 텍스트 형식(DOCX/TXT/MD/HTML)을 나눌 가상 페이지 크기(글자 수)
+            dedup_mode: 프로젝트(lv1_cat) 내 유사 중복 페이지 처리 - "off", "reuse"(대표 페이지 임베딩 재사용),
+                        "skip"(임베딩 재사용 후 결과에서 제외하여 RDB/ES 적재 생략)
+            dedup_index_path: 유사 중복 인덱스 SQLite 파일 경로
+            dedup_max_distance: 유사 중복으로 판단할 SimHash 최대 해밍 거리 (0~7)
+            dedup_min_chars: 이보다 짧은 페이지 본문은 중복 검사 제외 (빈 페이지끼리 묶이지 않도록)
+            cost_model_path: 파싱 소요 시간 기록/비용 모델 계수 저장 파일 (None이면 기록을 저장하지 않음)
+            schedule_policy: 배치 파일 배정 순서 - "fifo", "sjf"(예상 비용 작은 파일부터), "lpt"(큰 파일부터),
+                             "fair"(프로젝트별 공정 배분 + 프로젝트 내 sjf)
+            project_priorities: {lv1_cat: 우선순위} - 높은 우선순위 프로젝트 파일이 정책과 관계없이 먼저 배정
+            use_memory_budget: 프로세스 공유 메모리 예산(MEMORY_BUDGET_MB) 안에서만 변환 시작
+                               (워커 프로세스는 메인 프로세스가 배정 시점에 예산을 확인하므로 False)
+            worker_max_tasks: 파싱/샤드 워커 프로세스를 이 개수의 작업 후 새 프로세스로 교체 (0이면 교체 안 함)
         """
+        if ocr_mode not in ("always", "adaptive", "never"):
+            raise ValueError(f"지원하지 않는 ocr_mode 입니다: {ocr_mode}")
+        if output_format not in ("pickle", "parquet"):
+            raise ValueError(f"지원하지 않는 output_format 입니다: {output_format}")
+        if dedup_mode not in ("off", "reuse", "skip"):
+            raise ValueError(f"지원하지 않는 dedup_mode 입니다: {dedup_mode}")
+        if schedule_policy not in SCHEDULE_POLICIES:
+            raise ValueError(f"지원하지 않는 schedule_policy 입니다: {schedule_policy}")
+
         self.output_base_path = output_base_path
+        self.output_format = output_format
+        self.checkpoint = checkpoint
+        self.checkpoint_dir = Path(output_base_path) / "_checkpoints"
+        self.text_page_chars = text_page_chars
+        self.dedup_mode = dedup_mode if dedup_index_path else "off"
+        self.dedup_index_path = dedup_index_path
+        self.dedup_max_distance = dedup_max_distance
+        self.dedup_min_chars = dedup_min_chars
+        self.near_dup = NearDuplicateIndex(dedup_index_path, dedup_max_distance) if self.dedup_mode != "off" else None
+        self.cost_model = CostModel(cost_model_path)
+        self.schedule_policy = schedule_policy
+        self.project_priorities = project_priorities or {}
+        self.memory_budget = get_memory_budget() if use_memory_budget else None
+        self.worker_max_tasks = worker_max_tasks
+        self.ocr_mode = ocr_mode
+        self.ocr_min_text_chars = ocr_min_text_chars
+        self.shard_pages = shard_pages
+        self.shard_workers = shard_workers
+        self._shard_executor = None
+        self.num_workers = num_workers
+        self.embed_batch_size = max(1, embed_batch_size)
+        self.embed_cache_path = embed_cache_path
+        self.embed_cache_max_entries = embed_cache_max_entries
         self.embed_model=OllamaEmbeddings(base_url="http://localhost:11434", model="bge-m3:latest")
+        self.rate_limiter = get_rate_limiter("embedding")
+        self.embed_cache = EmbeddingCache(embed_cache_path, self.embed_model.model, embed_cache_max_entries) if embed_cache_path else None
         self._ensure_output_directory()
+        self.manifest = IngestionManifest(str(Path(output_base_path) / "_ingestion_manifest.json"), self.settings_fingerprint())
+
+    def settings_fingerprint(self) -> str:
+        """파싱 결과에 영향을 주는 설정 지문 (바뀌면 증분 처리 시 변경 없는 파일도 다시 파싱)"""
+        settings = {
+            "ocr_mode": self.ocr_mode,
+            "ocr_min_text_chars": self.ocr_min_text_chars,
+            "shard_pages": self.shard_pages,
+            "embed_model": self.embed_model.model,
+            "text_page_chars": self.text_page_chars,
+            "output_format": self.output_format,
+            "dedup_mode": self.dedup_mode,
+            }
+        return hashlib.md5(json.dumps(settings, sort_keys=True).encode()).hexdigest()
+
+    def _worker_init_kwargs(self) -> dict:
+        """워커 프로세스에서 동일한 설정의 파서를 만들기 위한 인자 (워커 내부는 순차 처리)"""
+        return {
+            "output_base_path": self.output_base_path,
+            "embed_batch_size": self.embed_batch_size,
+            "embed_cache_path": self.embed_cache_path,
+            "embed_cache_max_entries": self.embed_cache_max_entries,
+            "ocr_mode": self.ocr_mode,
+            "ocr_min_text_chars": self.ocr_min_text_chars,
+            "shard_pages": self.shard_pages,
+            "output_format": self.output_format,
+            "checkpoint": self.checkpoint,
+            "text_page_chars": self.text_page_chars,
+            "dedup_mode": self.dedup_mode,
+            "dedup_index_path": self.dedup_index_path,
+            "dedup_max_distance": self.dedup_max_distance,
+            "dedup_min_chars": self.dedup_min_chars,
+            "use_memory_budget": False,
+            }
 
     def _ensure_output_directory(self):
         """출력 디렉토리가 존재하는지 확인하고 없으면 생성"""
@@ -58,19 +271,19 @@ class DoclingParser:
         """개행문자 정규화"""
         return DoclingParser.NEWLINE_PATTERN.sub('\n', text)
 
-    def _setup_converter(self) -> DocumentConverter:
-        """Docling 변환기 설정"""
-        pipeline_options = self.DEFAULT_PIPELINE_OPTIONS
-        
-        return DocumentConverter(
-            allowed_formats=[InputFormat.PDF],
-            format_options={
-                InputFormat.PDF: PdfFormatOption(
-                    pipeline_options=pipeline_options,
-                    backend=PyPdfiumDocumentBackend
-                ),
-            }
-        )
+    def _setup_converter(self, pipeline_options: Optional[PdfPipelineOptions] = None) -> DocumentConverter:
+        """Docling 변환기 설정 (옵션별 프로세스 캐시에서 재사용)"""
+        pipeline_options = pipeline_options or self.DEFAULT_PIPELINE_OPTIONS
+        return get_converter(pipeline_options)
+
+    def warm_up(self):
+        """ocr_mode에 필요한 변환기를 미리 생성하여 첫 파일의 모델 로딩 지연 제거"""
+        start = time.perf_counter()
+        if self.ocr_mode != "never":
+            self._setup_converter()
+        if self.ocr_mode != "always":
+            self._setup_converter(self.NO_OCR_PIPELINE_OPTIONS)
+        print(f"Docling 변환기 준비 완료 ({time.perf_counter() - start:.1f}s)")
 
     def _create_document_output_dir(self, lv1_cat: str, lv2_cat: str, lv3_cat: str, lv4_cat: str) -> str:
         """문서 출력 디렉토리 생성 및 경로 반환"""
@@ -95,64 +308,573 @@ class DoclingParser:
     def _get_embedding(self, text:str):
         return self.embed_model.embed_query(text)
 
-    def _process_single_page(self, loaded_docs, page_num: int, filename: str, filepath:str, lv1_cat: str, lv2_cat: str, lv3_cat: str, lv4_cat: str, first_sentence: str) -> Document:
-        """단일 페이지 처리"""
+    def _embed_texts(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """
+        여러 페이지 텍스트를 임베딩합니다. 캐시에 있는 페이지는 재사용하고,
+        나머지만 모아 _embed_uncached 로 계산한 뒤 캐시에 저장합니다.
+        """
+        if self.embed_cache is None:
+            return self._embed_uncached(texts)
+
+        hashes = [self._get_md5_string(text) for text in texts]
+        cached = self.embed_cache.get_many(hashes)
+        results: List[Optional[List[float]]] = [cached.get(h) for h in hashes]
+
+        missing = [i for i, vector in enumerate(results) if vector is None]
+        if missing:
+            vectors = self._embed_uncached([texts[i] for i in missing])
+            for i, vector in zip(missing, vectors):
+                results[i] = vector
+            self.embed_cache.put_many([(hashes[i], results[i]) for i in missing if results[i]])
+        return results
+
+    def _embed_uncached(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """
+        여러 페이지 텍스트를 배치 단위로 임베딩합니다.
+        배치 호출이 실패하면 해당 배치만 페이지별 embed_query 호출로 대체하고,
+        그래도 실패한 페이지는 None을 반환합니다.
+        """
+        results: List[Optional[List[float]]] = [None] * len(texts)
+        for start in range(0, len(texts), self.embed_batch_size):
+            batch = texts[start:start + self.embed_batch_size]
+            # Ollama 지연/오류가 늘어날 때만 속도 제한 (고정 대기 없음)
+            self.rate_limiter.acquire(len(batch))
+            call_start = time.perf_counter()
+            try:
+                vectors = self.embed_model.embed_documents(batch)
+                if len(vectors) != len(batch):
+                    raise ValueError(f"임베딩 개수 불일치: {len(vectors)} != {len(batch)}")
+                self.rate_limiter.record(time.perf_counter() - call_start, True, len(batch))
+                results[start:start + len(batch)] = [list(v) for v in vectors]
+                continue
+            except Exception as e:
+                self.rate_limiter.record(time.perf_counter() - call_start, False, len(batch))
+                print(f"배치 임베딩 실패 ({start}~{start + len(batch) - 1}), 페이지별 재시도: {e}")
+
+            for offset, text in enumerate(batch):
+                self.rate_limiter.acquire(1)
+                call_start = time.perf_counter()
+                try:
+                    results[start + offset] = list(self._get_embedding(text))
+                    self.rate_limiter.record(time.perf_counter() - call_start, True)
+                except Exception as e:
+                    self.rate_limiter.record(time.perf_counter() - call_start, False)
+                    print(f"페이지 임베딩 실패 ({start + offset}): {e}")
+        return results
+
+    def _extract_page_text(self, page_markdown: str, first_sentence: str) -> str:
+        """단일 페이지 마크다운 정제"""
+        # 텍스트 정제
+        docling_text = page_markdown.replace("<!-- image -->", "")
+        docling_text = self.normalize_newlines(docling_text)
+        return first_sentence + docling_text
+
+    def _build_page_record(self, docling_text: Optional[str], has_embedding: bool, page_num: int, filename: str, filepath: str,
+                           lv1_cat: str, lv2_cat: str, lv3_cat: str, lv4_cat: str, first_sentence: str, error: str = "",
+                           page_info: Optional[dict] = None):
+        """
+        추출 텍스트로 단일 페이지의 (page_content, 메타데이터) 생성 - 임베딩은 PageBatch 행렬에 별도 저장
+        """
+        str_filepath = str(filepath).replace("\\", "/")
+        page_info = page_info or {}
+
+        if docling_text is None:
+            # 텍스트 추출 실패 시 빈 문서 반환
+            return first_sentence + "\n[이 페이지를 처리하는 중 오류가 발생했습니다.]", {
+                'id': str(uuid4()),
+                'filename': filename,
+                'filepath': str_filepath,
+                'hashed_filename': "",
+                'hashed_filepath': "",
+                'hashed_page_content': "",
+                'lv1_cat': lv1_cat,
+                'lv2_cat': lv2_cat,
+                'lv3_cat': lv3_cat,
+                'lv4_cat': lv4_cat,
+                'page': str(page_num),
+                'error': error,
+                'status': "fail",
+                **page_info,
+                }
+
+        metadata = {
+            'id': str(uuid4()),
+            'filename': filename,
+            'filepath': str_filepath,
+            'hashed_filename': self._get_md5_string(filename),
+            'hashed_filepath': self._get_md5_string(str(filepath)),
+            'hashed_page_content': self._get_md5_string(docling_text),
+            'lv1_cat': lv1_cat,
+            'lv2_cat': lv2_cat,
+            'lv3_cat': lv3_cat,
+            'lv4_cat': lv4_cat,
+            'page': str(page_num),
+            'status': 'success',
+            **page_info,
+            }
+        if not has_embedding:
+            # 임베딩만 실패한 경우 추출 텍스트는 유지 (추후 임베딩만 재시도 가능)
+            metadata['error'] = error or "임베딩 생성 실패"
+            metadata['status'] = "fail"
+        return docling_text, metadata
+
+    def _build_page_document(self, docling_text: Optional[str], embeddings: Optional[List[float]], page_num: int, filename: str, filepath: str,
+                             lv1_cat: str, lv2_cat: str, lv3_cat: str, lv4_cat: str, first_sentence: str, error: str = "",
+                             page_info: Optional[dict] = None) -> Document:
+        """추출 텍스트와 임베딩으로 단일 페이지 Document 생성 (복구 등 소량 처리용)"""
+        page_content, metadata = self._build_page_record(
+            docling_text, bool(embeddings), page_num, filename, filepath, lv1_cat, lv2_cat, lv3_cat, lv4_cat,
+            first_sentence, error=error, page_info=page_info,
+            )
+        metadata['embeddings'] = list(embeddings) if embeddings and docling_text is not None else []
+        return Document(page_content=page_content, metadata=metadata)
+
+    def _admit_conversion(self, mb: float, wait: bool = True) -> Optional[int]:
+        """변환 메모리 예약 (예산 미사용 시 0, wait=False이고 예산이 부족하면 None)"""
+        if self.memory_budget is None:
+            return 0
+        return self.memory_budget.acquire(mb) if wait else self.memory_budget.try_acquire(mb)
+
+    def _admission_poll(self) -> Optional[float]:
+        """배정 대기 중 예산 재확인 주기 (예산 미사용 시 작업 완료까지 대기)"""
+        return self.memory_budget.poll_interval if self.memory_budget is not None else None
+
+    def _release_conversion(self, reservation: Optional[int]):
+        if self.memory_budget is not None:
+            self.memory_budget.release(reservation)
+
+    @contextmanager
+    def _conversion_reservation(self, mb: float):
+        reservation = self._admit_conversion(mb)
         try:
-            # Docling으로 마크다운 추출
-            docling_text = loaded_docs.document.export_to_markdown(page_no=page_num + 1)
-            
-            # 텍스트 정제
-            docling_text = docling_text.replace("<!-- image -->", "")
-            docling_text = self.normalize_newlines(docling_text)
-            docling_text = first_sentence + docling_text
-
-            str_filepath = str(filepath).replace("\\", "/")
-            hashed_filename = self._get_md5_string(filename)
-            hashed_filepath = self._get_md5_string(str(filepath))
-            hashed_page_content = self._get_md5_string(docling_text)
-            embeddings = self._get_embedding(docling_text)
-
-            # Document 객체 생성
-            return Document(
-                page_content=docling_text,
-                metadata={
-                    'id': str(uuid4()),
-                    'filename': filename,
-                    'filepath': str_filepath,
-                    'hashed_filename': hashed_filename,
-                    'hashed_filepath': hashed_filepath,
-                    'hashed_page_content': hashed_page_content,
-                    'lv1_cat': lv1_cat,
-                    'lv2_cat': lv2_cat,
-                    'lv3_cat': lv3_cat,
-                    'lv4_cat': lv4_cat,
-                    'embeddings': list(embeddings),
-                    'page': str(page_num),
-                    'status': 'success'
-                    }
+            yield
+        finally:
+            self._release_conversion(reservation)
+
+    def _page_megapixels(self, pdf_path: Path) -> float:
+        """메모리 추정용 평균 페이지 면적 (예산 미사용 시 검사 생략)"""
+        if self.memory_budget is None:
+            return 0.0
+        try:
+            return probe_pdf_features(str(pdf_path), max_sample_pages=4)["page_megapixels"]
+        except Exception:
+            return 0.5
+
+    def _estimate_task_memory(self, features: dict) -> float:
+        """preflight 특징으로 파일 하나의 변환 메모리(MB) 추정"""
+        return estimate_conversion_mb(
+            pages=int(features.get("pages", 0)),
+            ocr_pages=int(features.get("ocr_pages", 0)),
+            page_megapixels=features.get("page_megapixels") or 0.5,
+            max_pages_per_conversion=self.shard_pages,
+            text_format=features.get("text_doc_pages", 0) > 0,
+            size_mb=features.get("size_mb", 0.0),
+            )
+
+    def _convert_page_range(self, pdf_path: Path, pipeline_options: PdfPipelineOptions,
+                            start_page: Optional[int] = None, end_page: Optional[int] = None) -> Dict[int, str]:
+        """
+        지정 옵션으로 PDF(또는 페이지 구간)를 변환하여 {페이지 번호(0부터): 마크다운} 반환
+        (start_page/end_page는 0부터 시작, end_page 포함)
+        """
+        converter = self._setup_converter(pipeline_options)
+        if self.memory_budget is None:
+            pages = 0
+        elif start_page is None:
+            pages = get_pdf_page_count(str(pdf_path))
+        else:
+            pages = end_page - start_page + 1
+        mb = estimate_conversion_mb(pages, pages if pipeline_options.do_ocr else 0, self._page_megapixels(pdf_path) or 0.5)
+
+        with self._conversion_reservation(mb):
+            if start_page is None:
+                loaded_docs = converter.convert(str(pdf_path))
+            else:
+                loaded_docs = converter.convert(str(pdf_path), page_range=(start_page + 1, end_page + 1))
+
+        # 문서를 한 번만 순회하여 페이지별 마크다운 생성
+        page_markdowns = export_markdown_by_page(loaded_docs.document)
+        return {page_no - 1: markdown for page_no, markdown in page_markdowns.items()}
+
+    def _plan_ocr(self, pdf_path: Path):
+        """
+        ocr_mode에 따라 페이지별 OCR 여부를 결정합니다.
+
+        Returns:
+            (전체 페이지 수 또는 None, {페이지 번호: {"ocr": bool, "text_chars": int}})
+            always 모드는 사전 검사 없이 (None, {})를 반환합니다.
+        """
+        if self.ocr_mode == "always":
+            return None, {}
+
+        try:
+            probe = probe_pdf_text_layer(str(pdf_path), min_text_chars=self.ocr_min_text_chars)
+        except Exception as e:
+            print(f"텍스트 레이어 검사 실패, 전체 OCR로 처리합니다: {e}")
+            return None, {}
+
+        page_info = {
+            p["page"]: {"ocr": self.ocr_mode == "adaptive" and p["needs_ocr"], "text_chars": p["text_chars"]}
+            for p in probe["pages"]
+            }
+        return probe["page_count"], page_info
+
+    def _get_shard_executor(self) -> ProcessPoolExecutor:
+        """샤드 변환용 프로세스 풀 (최초 사용 시 생성 후 재사용, 워커별 변환기 유지)"""
+        if self._shard_executor is None:
+            kwargs = self._worker_init_kwargs()
+            self._shard_executor = ProcessPoolExecutor(
+                max_workers=self.shard_workers,
+                initializer=_init_worker,
+                initargs=(kwargs,),
+                max_tasks_per_child=self.worker_max_tasks or None,
                 )
+        return self._shard_executor
+
+    def close(self):
+        """샤드 변환용 프로세스 풀 종료"""
+        if self._shard_executor is not None:
+            self._shard_executor.shutdown(wait=True)
+            self._shard_executor = None
+
+    def _iter_segment_markdowns(self, pdf_path: Path, segments: List[tuple], total_pages: int):
+        """
+        (시작 페이지, 끝 페이지, OCR 여부) 구간들을 변환하여 구간별로 (구간, 페이지별 마크다운)을 반환하는 제너레이터
+        구간이 여러 개이고 shard_workers > 1 이면 프로세스 풀에서 병렬 변환하며 완료 순서대로 반환합니다.
+        """
+        def options_for(do_ocr: bool) -> PdfPipelineOptions:
+            return self.DEFAULT_PIPELINE_OPTIONS if do_ocr else self.NO_OCR_PIPELINE_OPTIONS
+
+        if len(segments) == 1 and segments[0][:2] == (0, total_pages - 1):
+            yield segments[0], self._convert_page_range(pdf_path, options_for(segments[0][2]))
+            return
+
+        if self.shard_workers > 1 and len(segments) > 1:
+            executor = self._get_shard_executor()
+            megapixels = self._page_megapixels(pdf_path) or 0.5
+            pending = list(segments)
+            futures = {}
+            try:
+                with tqdm(total=len(segments), desc=f"샤드 변환 중 - {pdf_path.name}") as progress:
+                    while pending or futures:
+                        # 빈 샤드 워커가 있고 메모리 예산이 허락하는 동안 다음 구간 배정 (진행 중인 구간이 없으면 대기)
+                        while pending and len(futures) < self.shard_workers:
+                            start_page, end_page, do_ocr = pending[0]
+                            pages = end_page - start_page + 1
+                            mb = estimate_conversion_mb(pages, pages if do_ocr else 0, megapixels)
+                            reservation = self._admit_conversion(mb, wait=not futures)
+                            if reservation is None:
+                                break
+                            segment = pending.pop(0)
+                            future = executor.submit(_convert_shard_in_worker, str(pdf_path), do_ocr, start_page, end_page)
+                            futures[future] = (segment, reservation)
+
+                        done, _ = wait(futures, timeout=self._admission_poll(), return_when=FIRST_COMPLETED)
+                        for future in done:
+                            segment, reservation = futures.pop(future)
+                            self._release_conversion(reservation)
+                            progress.update(1)
+                            yield segment, future.result()
+            finally:
+                for _segment, reservation in futures.values():
+                    self._release_conversion(reservation)
+        else:
+            # 순차 처리 시에도 구간 단위로 변환하여 메모리에는 한 구간만 유지
+            for segment in segments:
+                start_page, end_page, do_ocr = segment
+                yield segment, self._convert_page_range(pdf_path, options_for(do_ocr), start_page, end_page)
+
+    def _plan_conversion(self, pdf_path: Path, need_ranges: bool = False):
+        """
+        변환 계획 수립
+        - adaptive 모드에서는 텍스트 레이어가 없는 페이지 구간만 OCR 옵션으로 변환합니다.
+        - shard_pages 보다 큰 문서는 페이지 구간(샤드)으로 나눕니다.
+        - 체크포인트 사용 시 샤딩을 끄더라도 CHECKPOINT_WINDOW_PAGES 단위로 나눕니다.
+        - need_ranges=True(일부 페이지만 변환)이면 always 모드에서도 페이지 수를 확인해 구간 계획을 만듭니다.
+
+        Returns:
+            (전체 페이지 수, 페이지별 OCR 결정 정보 dict, 변환 구간 리스트)
+            페이지 수를 미리 알 수 없으면 (None, {}, None) - 문서 전체를 한 번에 변환
+        """
+        total_pages, page_info = self._plan_ocr(pdf_path)
+        window = self.shard_pages if self.shard_pages > 0 else (self.CHECKPOINT_WINDOW_PAGES if self.checkpoint else 0)
+
+        if total_pages is None and (window > 0 or need_ranges):
+            # always 모드에서도 구간 분할 여부 판단을 위해 페이지 수만 확인
+            try:
+                total_pages = get_pdf_page_count(str(pdf_path))
+                page_info = {page_num: {"ocr": self.ocr_mode != "never"} for page_num in range(total_pages)}
+            except Exception as e:
+                print(f"페이지 수 확인 실패, 전체 변환으로 처리합니다: {e}")
+
+        if total_pages is None:
+            return None, {}, None
+        if total_pages == 0:
+            return 0, {}, []
+
+        flags = [page_info[page_num]["ocr"] for page_num in range(total_pages)]
+        runs = group_page_runs(flags)
+
+        if len(runs) > self.MAX_ADAPTIVE_RUNS:
+            # 스캔/텍스트 페이지가 잘게 섞인 문서는 전체 OCR 한 번이 더 빠름
+            runs = [(0, total_pages - 1, True)]
+            for info in page_info.values():
+                info["ocr"] = True
+
+        # 큰 문서는 샤드(체크포인트 사용 시 체크포인트 구간) 단위로 분할
+        segments = runs
+        if window > 0 and total_pages > window:
+            segments = split_page_runs(runs, window)
+
+        ocr_pages = sum(1 for info in page_info.values() if info["ocr"])
+        print(f"OCR 대상 페이지: {ocr_pages}/{total_pages}, 변환 구간: {len(segments)} - {pdf_path.name}")
+        return total_pages, page_info, segments
+
+    def _convert_whole_pdf(self, pdf_path: Path):
+        """페이지 수를 미리 알 수 없을 때 문서 전체를 기본 옵션으로 한 번에 변환 (메모리 예산 안에서 시작)"""
+        converter = self._setup_converter()
+        mb = 0.0
+        if self.memory_budget is not None:
+            try:
+                pages = get_pdf_page_count(str(pdf_path))
+            except Exception:
+                pages = 0  # 페이지 수를 모르면 추정 없이 실제 RSS 기준으로만 입장 판단
+            mb = estimate_conversion_mb(pages, pages, self._page_megapixels(pdf_path) or 0.5)
+
+        with self._conversion_reservation(mb):
+            loaded_docs = converter.convert(str(pdf_path))
+        # PDF 페이지 수 확인 (변환 결과 기준, 파일 재오픈 없음)
+        total_pages = loaded_docs.input.page_count or loaded_docs.document.num_pages()
+        page_markdowns = {page_no - 1: md for page_no, md in export_markdown_by_page(loaded_docs.document).items()}
+        page_info = {page_num: {"ocr": True} for page_num in range(total_pages)}
+        return page_markdowns, total_pages, page_info
+
+    def _convert_pdf(self, pdf_path: Path):
+        """
+        PDF를 변환하여 페이지별 마크다운을 반환합니다. (구간별 변환 결과를 페이지 번호 기준으로 합침)
+
+        Returns:
+            (페이지별 마크다운 dict, 전체 페이지 수, 페이지별 OCR 결정 정보 dict)
+        """
+        total_pages, page_info, segments = self._plan_conversion(pdf_path)
+        if segments is None:
+            return self._convert_whole_pdf(pdf_path)
+
+        page_markdowns = {}
+        for _segment, markdowns in self._iter_segment_markdowns(pdf_path, segments, total_pages):
+            page_markdowns.update(markdowns)
+        return page_markdowns, total_pages, page_info
+
+    def _convert_text_file(self, file_path: Path) -> List[str]:
+        """
+        텍스트 기반 형식을 가상 페이지별 마크다운으로 변환 (fast lane)
+        - TXT/MD: 파일을 그대로 읽음
+        - DOCX/HTML: Docling SimplePipeline으로 마크다운 변환 (레이아웃/OCR 모델 미사용)
+        """
+        if file_path.suffix.lower() in PLAIN_TEXT_SUFFIXES:
+            text = read_text_file(str(file_path))
+        else:
+            mb = estimate_conversion_mb(0, text_format=True, size_mb=file_path.stat().st_size / (1024 * 1024))
+            with self._conversion_reservation(mb):
+                loaded_docs = get_simple_converter().convert(str(file_path))
+                text = loaded_docs.document.export_to_markdown()
+        return split_pseudo_pages(text, self.text_page_chars)
+
+    def _make_first_sentence(self, pdf_path: Path, lv1_cat: str, lv2_cat: str, lv3_cat: str, lv4_cat: str) -> str:
+        """페이지 앞에 붙는 초기 문장 생성"""
+        enable_cats = [c for c in [lv1_cat, lv2_cat, lv3_cat, lv4_cat] if c] # 공백 Cat 제거
+        first_sentence_cats = ",".join(enable_cats)
+        return f"This page explains {pdf_path.stem} that belongs to {first_sentence_cats} categories.\n"
+
+    def _page_record(self, page_num: int, page_markdown: str, first_sentence: str, page_info: Optional[dict]) -> dict:
+        """변환된 페이지 마크다운을 임베딩 전 페이지 레코드로 정리"""
+        try:
+            return {"page": page_num, "text": self._extract_page_text(page_markdown, first_sentence), "error": "", "page_info": page_info}
         except Exception as e:
             print(f"페이지 {page_num} 처리 중 오류 발생: {e}")
-            # 오류 발생 시 빈 문서 반환
-            return Document(
-                page_content=first_sentence + "\n[이 페이지를 처리하는 중 오류가 발생했습니다.]",
-                metadata={
-                    'id': str(uuid4()),
-                    'filename': filename,
-                    'filepath': str_filepath,
-                    'hashed_filename': "",
-                    'hashed_filepath': "",
-                    'hashed_page_content': "",
-                    'lv1_cat': lv1_cat,
-                    'lv2_cat': lv2_cat,
-                    'lv3_cat': lv3_cat,
-                    'lv4_cat': lv4_cat,
-                    'page': str(page_num),
-                    'embeddings': [],
-                    'error': str(e),
-                    'status': "fail"
-                    }
+            return {"page": page_num, "text": None, "error": str(e), "page_info": page_info}
+
+    @staticmethod
+    def _remaining_segments(segments: List[tuple], skip_pages: set) -> List[tuple]:
+        """변환 구간에서 이미 완료된 페이지를 빼고 남은 연속 구간만 반환"""
+        remaining = []
+        for start_page, end_page, do_ocr in segments:
+            run_start = None
+            for page_num in range(start_page, end_page + 2):
+                pending = page_num <= end_page and page_num not in skip_pages
+                if pending and run_start is None:
+                    run_start = page_num
+                elif not pending and run_start is not None:
+                    remaining.append((run_start, page_num - 1, do_ocr))
+                    run_start = None
+        return remaining
+
+    def iter_page_texts(self, pdf_path: str, lv1_cat: str, lv2_cat: str, lv3_cat: str, lv4_cat: str,
+                        skip_pages: Optional[set] = None):
+        """
+        PDF를 변환 구간 단위로 변환하면서 페이지 레코드(임베딩 전)를 바로바로 반환하는 제너레이터
+
+        Args:
+            skip_pages: 이미 완료되어 변환하지 않을 페이지 번호(0부터) 집합 (체크포인트 재개용)
+
+        Yields:
+            {"page": 페이지 번호(0부터), "text": 정제된 텍스트 또는 None, "error": 오류 메시지, "page_info": OCR 정보}
+        """
+        pdf_path = Path(pdf_path).resolve()
+        if not pdf_path.exists():
+            raise FileNotFoundError(f"PDF 파일을 찾을 수 없습니다: {pdf_path}")
+        first_sentence = self._make_first_sentence(pdf_path, lv1_cat, lv2_cat, lv3_cat, lv4_cat)
+
+        skip_pages = skip_pages or set()
+
+        if is_text_format(str(pdf_path)):
+            # 텍스트 기반 형식은 PDF 파이프라인(OCR 판단/샤딩) 없이 바로 가상 페이지 생성
+            for page_num, page_markdown in enumerate(self._convert_text_file(pdf_path)):
+                if page_num not in skip_pages:
+                    yield self._page_record(page_num, page_markdown, first_sentence, {"ocr": False, "text_chars": len(page_markdown)})
+            return
+
+        # 건너뛸 페이지가 있으면 남은 페이지 구간만 변환하도록 항상 구간 계획 수립 (체크포인트 재개, 실패 페이지 복구)
+        total_pages, page_info, segments = self._plan_conversion(pdf_path, need_ranges=bool(skip_pages))
+        if segments is None:
+            page_markdowns, total_pages, page_info = self._convert_whole_pdf(pdf_path)
+            for page_num in range(total_pages):
+                if page_num not in skip_pages:
+                    yield self._page_record(page_num, page_markdowns.get(page_num, ""), first_sentence, page_info.get(page_num))
+            return
+
+        if skip_pages:
+            segments = self._remaining_segments(segments, skip_pages)
+            print(f"완료 페이지 제외 - {len(skip_pages)}/{total_pages} 페이지 생략, 남은 구간: {len(segments)} - {pdf_path.name}")
+
+        for (start_page, end_page, _do_ocr), markdowns in self._iter_segment_markdowns(pdf_path, segments, total_pages):
+            for page_num in range(start_page, end_page + 1):
+                yield self._page_record(page_num, markdowns.get(page_num, ""), first_sentence, page_info.get(page_num))
+
+    def build_page_batch(self, pages: List[dict], pdf_path: str, lv1_cat: str, lv2_cat: str, lv3_cat: str, lv4_cat: str) -> PageBatch:
+        """
+        페이지 레코드들을 배치 단위로 임베딩하여 PageBatch로 변환
+
+        Args:
+            pages: iter_page_texts 가 반환한 페이지 레코드 리스트
+        """
+        pdf_path = Path(pdf_path).resolve()
+        first_sentence = self._make_first_sentence(pdf_path, lv1_cat, lv2_cat, lv3_cat, lv4_cat)
+
+        # 배치 임베딩 (체크포인트에서 복원된 임베딩, 유사 중복 페이지의 대표 임베딩은 재사용)
+        self._embed_page_records(pages, pdf_path, first_sentence, lv1_cat)
+        return self._pages_to_batch(pages, pdf_path, lv1_cat, lv2_cat, lv3_cat, lv4_cat, first_sentence)
+
+    def _pages_to_batch(self, pages: List[dict], pdf_path: Path, lv1_cat: str, lv2_cat: str, lv3_cat: str, lv4_cat: str,
+                        first_sentence: str) -> PageBatch:
+        """임베딩이 끝난 페이지 레코드를 PageBatch로 변환 (임베딩/유사 중복 검사는 다시 하지 않음)"""
+        if self.dedup_mode == "skip":
+            pages = [page for page in pages if not page.get("duplicate_of")]
+
+        # 페이지별 메타데이터 생성 후 임베딩은 float32 행렬로 모음
+        records = []
+        for page in pages:
+            embedding = page.get("embedding") if page["text"] is not None else None
+            page_content, metadata = self._build_page_record(
+                page["text"], bool(embedding), page["page"], pdf_path.name, pdf_path,
+                lv1_cat, lv2_cat, lv3_cat, lv4_cat, first_sentence, error=page["error"], page_info=page["page_info"],
                 )
+            if page.get("doc_id"):
+                metadata["id"] = page["doc_id"]  # 유사 중복 인덱스에 등록된 id 유지
+            if page.get("duplicate_of"):
+                metadata["duplicate_of"] = page["duplicate_of"]
+                metadata["near_dup_distance"] = page["near_dup_distance"]
+            records.append((page_content, metadata, embedding))
+        return PageBatch.from_records(records)
+
+    def build_page_documents(self, pages: List[dict], pdf_path: str, lv1_cat: str, lv2_cat: str, lv3_cat: str, lv4_cat: str) -> List[Document]:
+        """build_page_batch 결과를 Document 리스트로 변환 (API 응답용)"""
+        return self.build_page_batch(pages, pdf_path, lv1_cat, lv2_cat, lv3_cat, lv4_cat).to_documents()
+
+    def _embed_page_records(self, pages: List[dict], pdf_path: Path, first_sentence: str, project: str):
+        """
+        페이지 레코드에 임베딩("embedding")을 채웁니다.
+        dedup_mode가 켜져 있으면 프로젝트 내 유사 중복 페이지는 대표 페이지 임베딩을 재사용하고
+        ("duplicate_of", "near_dup_distance" 기록), 나머지 페이지는 새 대표 페이지로 인덱스에 등록합니다.
+        """
+        embeddings = [page.get("embedding") for page in pages]
+        filepath = self._near_dup_filepath(pdf_path)
+        duplicates, hashes = self._find_near_duplicates(pages, embeddings, first_sentence, project, filepath)
+        for i, match in duplicates.items():
+            if "embedding" in match:
+                pages[i]["embedding"] = match["embedding"]
+
+        pending = [i for i, page in enumerate(pages) if page["text"] is not None and not page.get("embedding") and i not in duplicates]
+        for i, vector in zip(pending, self._embed_texts([pages[i]["text"] for i in pending])):
+            pages[i]["embedding"] = vector
+
+        if self.near_dup is None:
+            return
+
+        for i in hashes:
+            pages[i].setdefault("doc_id", str(uuid4()))
+        for i, match in duplicates.items():
+            if "local" in match:
+                pages[i]["embedding"] = pages[match["local"]].get("embedding")
+                pages[i]["duplicate_of"] = pages[match["local"]]["doc_id"]
+            else:
+                pages[i]["duplicate_of"] = match["doc_id"]
+            pages[i]["near_dup_distance"] = match["distance"]
+
+        self.near_dup.add_many(project, [
+            (hashes[i], pages[i]["doc_id"], filepath, str(pages[i]["page"]), pages[i]["embedding"])
+            for i in hashes if i not in duplicates and pages[i].get("embedding")
+            ])
+        self.near_dup.record(len(hashes), len(duplicates))
+
+    @staticmethod
+    def _near_dup_filepath(pdf_path) -> str:
+        """유사 중복 인덱스에 기록하는 파일 경로"""
+        return str(Path(pdf_path).resolve()).replace("\\", "/")
+
+    def reset_near_duplicates(self, pdf_path):
+        """
+        파일을 처음부터 다시 파싱하기 전에 이전 실행에서 등록한 대표 페이지 삭제
+        (내용이 바뀌었거나 삭제된 파일의 예전 페이지가 새 페이지를 계속 중복으로 판단하지 않도록)
+        """
+        if self.near_dup is not None:
+            self.near_dup.remove(self._near_dup_filepath(pdf_path))
+
+    def _find_near_duplicates(self, pages: List[dict], embeddings: List[Optional[List[float]]], first_sentence: str, project: str,
+                              filepath: Optional[str] = None):
+        """
+        프로젝트 인덱스 및 같은 배치 안에서 유사 중복 페이지 찾기 (filepath 파일에서 등록된 페이지는 제외)
+
+        Returns:
+            ({페이지 인덱스: 매칭 정보}, {검사한 페이지 인덱스: simhash})
+            매칭 정보는 인덱스의 대표 페이지({"doc_id", "embedding", "distance"}) 또는
+            같은 배치의 앞선 페이지({"local": 인덱스, "distance"})
+        """
+        duplicates, hashes, local = {}, {}, []
+        if self.near_dup is None:
+            return duplicates, hashes
+
+        for i, page in enumerate(pages):
+            if page["text"] is None or embeddings[i]:
+                continue
+            body = page["text"][len(first_sentence):] if page["text"].startswith(first_sentence) else page["text"]
+            if len(body.strip()) < self.dedup_min_chars:
+                continue
+
+            value = simhash(body)
+            hashes[i] = value
+            match = self.near_dup.find(project, value, exclude_filepath=filepath)
+            if match is None:
+                for j, other in local:
+                    distance = hamming_distance(value, other)
+                    if distance <= self.dedup_max_distance:
+                        match = {"local": j, "distance": distance}
+                        break
+            if match is None:
+                local.append((i, value))
+            else:
+                duplicates[i] = match
+        return duplicates, hashes
 
     def _clear_folder(self, folder_path: str):
         """해당 폴더 안의 모든 파일과 하위 폴더를 삭제 (폴더는 유지)"""
@@ -180,54 +902,108 @@ class DoclingParser:
         Returns:
             파싱된 Document 객체 리스트
         """
+        return self.parse_file_to_batch(pdf_path, lv1_cat, lv2_cat, lv3_cat, lv4_cat).to_documents()
+
+    def parse_file_to_batch(self, pdf_path: str, lv1_cat: str, lv2_cat: str, lv3_cat: str, lv4_cat: str) -> PageBatch:
+        """
+        파일을 페이지별로 파싱하여 PageBatch로 반환합니다. (Document 변환 없이 파일 저장까지 수행)
+        """
         # 경로 정규화
         pdf_path = Path(pdf_path).resolve()
         filename = pdf_path.name
         
         if not pdf_path.exists():
             raise FileNotFoundError(f"PDF 파일을 찾을 수 없습니다: {pdf_path}")
-
-        # 초기 문장 생성
-        enable_cats = [c for c in [lv1_cat, lv2_cat, lv3_cat, lv4_cat] if c] # 공백 Cat 제거
-        first_sentence_cats = ",".join(enable_cats)
-        first_sentence = f"This page explains {pdf_path.stem} that belongs to {first_sentence_cats} categories.\n"
+        if not is_supported(str(pdf_path)):
+            raise ValueError(f"지원하지 않는 파일 형식입니다: {pdf_path.suffix} (지원: {', '.join(sorted(SUPPORTED_SUFFIXES))})")
 
         try:
-            # 변환기 설정
-            converter = self._setup_converter()
-            loaded_docs = converter.convert(str(pdf_path))
-            
-            # PDF 페이지 수 확인
-            with pdfplumber.open(pdf_path) as pdf:
-                total_pages = len(pdf.pages)
-                
-            # 페이지별 처리
-            docs = []
-            for page_num in tqdm(range(total_pages), desc=f"파싱 중 - {filename}"):
-                doc = self._process_single_page(loaded_docs, page_num, filename, pdf_path, lv1_cat, lv2_cat, lv3_cat, lv4_cat, first_sentence)
-                docs.append(doc)
-                time.sleep(0.1)  # 시스템 부하 방지
-
-            # 결과 저장
-            self._save_documents(docs, filename, lv1_cat, lv2_cat, lv3_cat, lv4_cat)
+            if self.checkpoint:
+                # 페이지 변환 + 배치 임베딩을 진행하면서 완료된 배치마다 체크포인트 기록
+                batch = self._parse_pages_with_checkpoint(pdf_path, lv1_cat, lv2_cat, lv3_cat, lv4_cat)
+            else:
+                # 1) 페이지별 텍스트 추출 (adaptive 모드는 스캔 페이지만 OCR)
+                self.reset_near_duplicates(pdf_path)
+                pages = list(tqdm(self.iter_page_texts(pdf_path, lv1_cat, lv2_cat, lv3_cat, lv4_cat), desc=f"파싱 중 - {filename}"))
+                pages.sort(key=lambda page: page["page"])
+
+                # 2) 배치 임베딩 및 PageBatch 생성
+                batch = self.build_page_batch(pages, pdf_path, lv1_cat, lv2_cat, lv3_cat, lv4_cat)
+
+            # 결과 저장 (저장이 끝난 뒤에만 체크포인트 삭제)
+            self._save_documents(batch, filename, lv1_cat, lv2_cat, lv3_cat, lv4_cat)
+            if self.checkpoint:
+                self._open_checkpoint(pdf_path).remove()
             
-            return docs
+            return batch
 
         except Exception as e:
             print(f"PDF 파싱 중 오류 발생: {e}")
             raise
 
-    def _save_documents(self, docs: List[Document], filename: str, 
-                       lv1_cat: str, lv2_cat: str, lv3_cat: str, lv4_cat: str):
-        """파싱된 문서를 파일로 저장"""
+    def _open_checkpoint(self, pdf_path: Path) -> PageCheckpoint:
+        """파일별 체크포인트 (결과에 영향을 주는 설정이 바뀌면 기존 체크포인트는 무효)"""
+        settings = {"ocr_mode": self.ocr_mode, "ocr_min_text_chars": self.ocr_min_text_chars, "embed_model": self.embed_model.model}
+        return PageCheckpoint(str(self.checkpoint_dir), str(pdf_path), settings)
+
+    def _parse_pages_with_checkpoint(self, pdf_path: Path, lv1_cat: str, lv2_cat: str, lv3_cat: str, lv4_cat: str) -> PageBatch:
+        """
+        체크포인트를 사용한 페이지 변환/임베딩
+        - 이미 완료된 페이지는 변환과 임베딩을 모두 생략
+        - 나머지 페이지는 embed_batch_size 단위로 임베딩한 뒤 체크포인트에 기록
+        - 기록이 끝난 배치는 바로 PageBatch(float32 행렬)로 변환하여 float 리스트를 오래 들고 있지 않음
+
+        Returns:
+            페이지 번호 순으로 정렬된 전체 PageBatch
+        """
+        checkpoint = self._open_checkpoint(pdf_path)
+        done = checkpoint.load()
+        first_sentence = self._make_first_sentence(pdf_path, lv1_cat, lv2_cat, lv3_cat, lv4_cat)
+        done_pages = set(done)
+        if not done:
+            # 이어서 파싱하는 경우에는 이미 완료된 페이지의 대표 등록을 유지
+            self.reset_near_duplicates(pdf_path)
+
+        # 체크포인트에서 복원된 페이지 (임베딩이 비어 있던 페이지는 이때 다시 임베딩)
+        parts = [self.build_page_batch(list(done.values()), pdf_path, lv1_cat, lv2_cat, lv3_cat, lv4_cat)] if done else []
+        del done
+
+        def flush(pages: List[dict]):
+            # 임베딩/유사 중복 검사는 한 번만 - 체크포인트 기록 후 같은 결과로 PageBatch 생성
+            self._embed_page_records(pages, pdf_path, first_sentence, lv1_cat)
+            checkpoint.append(pages)
+            parts.append(self._pages_to_batch(pages, pdf_path, lv1_cat, lv2_cat, lv3_cat, lv4_cat, first_sentence))
+
+        pending = []
+        page_iter = self.iter_page_texts(pdf_path, lv1_cat, lv2_cat, lv3_cat, lv4_cat, skip_pages=done_pages)
+        for page in tqdm(page_iter, desc=f"파싱 중 - {pdf_path.name}", initial=len(done_pages)):
+            pending.append(page)
+            if len(pending) >= self.embed_batch_size:
+                flush(pending)
+                pending = []
+        flush(pending)
+        return PageBatch.concat(parts).sorted_by_page()
+
+    def _get_output_path(self, filename: str, lv1_cat: str, lv2_cat: str, lv3_cat: str, lv4_cat: str) -> Path:
+        """파싱 결과 파일 경로"""
         output_dir = self._create_document_output_dir(lv1_cat, lv2_cat, lv3_cat, lv4_cat)
         parsed_filename = Path(filename).stem
-        output_path = Path(output_dir) / f"{parsed_filename}.pkl"
-        
-        with open(output_path, 'wb') as file:  # 'wb' 모드로 변경
-            pickle.dump(docs, file)
+        suffix = ".parquet" if self.output_format == "parquet" else ".pkl"
+        return Path(output_dir) / f"{parsed_filename}{suffix}"
+
+    def _save_documents(self, docs, filename: str, 
+                       lv1_cat: str, lv2_cat: str, lv3_cat: str, lv4_cat: str) -> str:
+        """
+        파싱된 문서를 파일로 저장 (PageBatch 또는 Document 리스트)
+        - pickle: PageBatch 객체를 그대로 저장 (임베딩은 float32 행렬)
+        - parquet: float32 고정 길이 리스트 컬럼
+        """
+        output_path = self._get_output_path(filename, lv1_cat, lv2_cat, lv3_cat, lv4_cat)
+        batch = docs if isinstance(docs, PageBatch) else PageBatch.from_documents(docs)
+        save_page_batch(batch, str(output_path), self.output_format)
         
         print(f"문서 저장 완료: {output_path}")
+        return str(output_path)
 
     def _list_files_recursive(self, folder_path: str):
         """폴더 안의 파일을 재귀적으로 읽어서 제너레이터로 반환하는 함수"""
@@ -242,50 +1018,280 @@ class DoclingParser:
             count += len(files)
         return count
 
-    def batch_parse_pdfs(self, folder_path: str, remove_original: bool = False) -> List[List[Document]]:
+    def _extract_cats(self, pdf_file: str) -> dict:
+        """파일 폴더 경로에서 level cat 추출 (최대 4개까지)"""
+        file_path, file_name = os.path.split(pdf_file)
+        target_file_path = file_path.split("uploaded")[1].replace("\\", "/")
+        target_file_path = target_file_path.split("/")
+
+        cats = defaultdict(str)
+        for i in range(1,5,1):
+            try: cats[f"lv{i}_cat"] = target_file_path[i]
+            except: cats[f"lv{i}_cat"] = ""
+        return dict(cats)
+
+    def _parse_file_task(self, pdf_file: str, cats: dict) -> dict:
+        """
+        단일 파일 파싱 작업 - 성공/실패 여부와 결과를 파일 단위로 반환합니다.
+        (프로세스 풀에서도 그대로 사용되므로 예외를 밖으로 던지지 않음)
+        """
+        start = time.perf_counter()
+        duplicates_before = self.near_dup.duplicates if self.near_dup is not None else 0
+        try:
+            batch = self.parse_file_to_batch(str(pdf_file), cats["lv1_cat"], cats["lv2_cat"], cats["lv3_cat"], cats["lv4_cat"])
+            output_path = self._get_output_path(Path(pdf_file).name, cats["lv1_cat"], cats["lv2_cat"], cats["lv3_cat"], cats["lv4_cat"])
+            return {
+                "file": str(pdf_file),
+                "status": "success",
+                "pages": len(batch),
+                "failed_pages": batch.count_status("fail"),
+                "duplicate_pages": (self.near_dup.duplicates - duplicates_before) if self.near_dup is not None else 0,
+                "output": str(output_path).replace("\\", "/"),
+                "elapsed": time.perf_counter() - start,
+                "batch": batch,
+                }
+        except Exception as e:
+            return {
+                "file": str(pdf_file),
+                "status": "fail",
+                "pages": 0,
+                "elapsed": time.perf_counter() - start,
+                "error": str(e),
+                "batch": None,
+                }
+
+    def list_batch_files(self, folder_path: str) -> List[str]:
+        """배치 처리 대상 파일 목록 (PDF + 텍스트 기반 형식, 그 외 형식은 건너뜀)"""
+        files, skipped = [], []
+        for f in self._list_files_recursive(folder_path=folder_path):
+            (files if is_supported(f) else skipped).append(str(f))
+        if skipped:
+            print(f"지원하지 않는 형식 {len(skipped)}건 건너뜀: {skipped[:10]}")
+        return files
+
+    def plan_batch_files(self, folder_path: str, incremental: bool = False, dry_run: bool = False):
+        """
+        배치 처리할 파일 목록을 결정합니다.
+        incremental=True 이면 매니페스트와 비교하여 새 파일/변경된 파일만 대상으로 하고,
+        사라진 파일은 매니페스트에서 제거 후 deleted 목록으로 보고합니다. (dry_run=True 이면 매니페스트 변경 없음)
+
+        Returns:
+            (파싱 대상 파일 목록, diff 요약 dict 또는 None)
+        """
+        files = self.list_batch_files(folder_path)
+        if not incremental:
+            return files, None
+
+        diff = self.manifest.diff(files, folder_path=str(folder_path))
+        if not dry_run:
+            self.manifest.forget(diff["deleted"])
+            self.manifest.save()
+            for deleted in diff["deleted"]:
+                self.reset_near_duplicates(deleted)
+        summary = {
+            "new": len(diff["new"]),
+            "changed": len(diff["changed"]),
+            "unchanged": len(diff["unchanged"]),
+            "deleted": diff["deleted"],
+            }
+        print(f"증분 처리 - 신규 {summary['new']}, 변경 {summary['changed']}, 변경 없음 {summary['unchanged']}, 삭제 {len(diff['deleted'])}")
+        return diff["new"] + diff["changed"], summary
+
+    def probe_file(self, file_path: str) -> dict:
+        """비용 추정용 파일 특징 (검사 실패 시 파일 크기만 사용)"""
+        try:
+            return probe_file_features(file_path, self.ocr_mode, self.ocr_min_text_chars, self.text_page_chars)
+        except Exception as e:
+            print(f"파일 특징 검사 실패: {file_path} - {e}")
+            size_mb = os.path.getsize(file_path) / (1024 * 1024) if os.path.exists(file_path) else 0.0
+            return {"size_mb": size_mb, "pages": 0, "probe_error": str(e)}
+
+    def _make_scheduler(self, estimates: List[dict], priority: Optional[int] = None) -> TaskScheduler:
+        """preflight 추정치로 스케줄러 구성 (priority 지정 시 프로젝트 우선순위 대신 사용)"""
+        scheduler = TaskScheduler(self.schedule_policy, self.project_priorities)
+        for estimate in estimates:
+            scheduler.push({
+                "file": estimate["file"],
+                "cats": self._extract_cats(estimate["file"]),
+                "cost": estimate["estimated_seconds"],
+                "memory_mb": estimate.get("memory_mb", 0.0),
+                "priority": priority,
+                })
+        return scheduler
+
+    def preflight(self, files: List[str], num_workers: Optional[int] = None) -> dict:
+        """
+        파싱 전에 파일별 예상 소요 시간과 배치 예상 완료 시간(ETA)을 계산합니다.
+
+        Returns:
+            {
+                "files": [{"file", "size_mb", "pages", "text_coverage", "images_per_page", "estimated_seconds",
+                           "memory_mb", "estimated_finish_seconds", "features"}, ...] (스케줄 정책에 따른 배정 순서),
+                "total_seconds": 예상 시간 합계 (단일 워커 기준),
+                "eta_seconds": num_workers개 워커에 배정 순서대로 처리했을 때 예상 완료 시간,
+                "num_workers": 워커 수,
+                "policy": 스케줄 정책,
+                "model": 비용 모델 학습 기록 수와 계수
+            }
+        """
+        num_workers = num_workers or self.num_workers
+        estimates = {}
+        for file_path in files:
+            features = self.probe_file(file_path)
+            estimates[str(file_path)] = {
+                "file": str(file_path),
+                "size_mb": round(features["size_mb"], 3),
+                "pages": features.get("pages", 0),
+                "text_coverage": features.get("text_coverage"),
+                "images_per_page": features.get("images_per_page"),
+                "estimated_seconds": self.cost_model.estimate(features),
+                "memory_mb": self._estimate_task_memory(features),
+                "features": features,
+                }
+
+        ordered = [estimates[task["file"]] for task in self._make_scheduler(list(estimates.values())).drain()]
+        finish_times = simulate_finish_times([e["estimated_seconds"] for e in ordered], num_workers)
+        for estimate, finish in zip(ordered, finish_times):
+            estimate["estimated_finish_seconds"] = round(finish, 1)
+
+        return {
+            "files": ordered,
+            "total_seconds": round(sum(e["estimated_seconds"] for e in ordered), 1),
+            "eta_seconds": round(max(finish_times, default=0.0), 1),
+            "num_workers": num_workers,
+            "policy": self.schedule_policy,
+            "model": self.cost_model.stats(),
+            }
+
+    def _iter_task_results(self, scheduler: TaskScheduler, num_workers: int):
+        """
+        스케줄러 순서대로 작업을 꺼내 순차 또는 프로세스 풀로 처리하여 완료 순서대로 결과 반환
+        (빈 워커가 있고 메모리 예산이 허락할 때만 다음 작업을 꺼냄)
+        """
+        if num_workers <= 1 or len(scheduler) <= 1:
+            # 메인 프로세스에서 변환 - 예산 확인은 변환 직전(_convert_page_range 등)에서 수행
+            while len(scheduler):
+                task = scheduler.pop()
+                yield self._parse_file_task(task["file"], task["cats"])
+            return
+
+        # 워커마다 자체 DocumentConverter를 예열해 두고 파일 단위로 작업 분배
+        # worker_max_tasks 개 파일을 처리한 워커는 새 프로세스로 교체 (변환 라이브러리 메모리 누수 차단)
+        workers = min(num_workers, len(scheduler))
+        futures, ready = {}, []
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self._worker_init_kwargs(),),
+            max_tasks_per_child=self.worker_max_tasks or None,
+            ) as executor:
+            try:
+                while len(scheduler) or futures or ready:
+                    # 진행 중인 작업이 없으면 예산이 날 때까지 대기, 있으면 예산 부족 시 다음 완료를 기다림
+                    while len(scheduler) and len(futures) < workers:
+                        task = scheduler.peek()
+                        reservation = self._admit_conversion(task["memory_mb"], wait=not futures)
+                        if reservation is None:
+                            break
+                        scheduler.pop()
+                        futures[executor.submit(_parse_in_worker, task["file"], task["cats"])] = (task, reservation)
+
+                    for result in ready:
+                        yield result
+                    ready = []
+                    if not futures:
+                        continue
+
+                    done, _ = wait(futures, timeout=self._admission_poll(), return_when=FIRST_COMPLETED)
+                    for future in done:
+                        task, reservation = futures.pop(future)
+                        self._release_conversion(reservation)
+                        try:
+                            ready.append(future.result())
+                        except Exception as e:
+                            # 워커 프로세스 비정상 종료 등
+                            ready.append({"file": str(task["file"]), "status": "fail", "pages": 0, "elapsed": 0.0, "error": str(e), "batch": None})
+            finally:
+                for _task, reservation in futures.values():
+                    self._release_conversion(reservation)
+
+    def iter_batch_results(self, folder_path: str, num_workers: Optional[int] = None,
+                           files: Optional[List[str]] = None, incremental: bool = False,
+                           plan: Optional[dict] = None, priority: Optional[int] = None):
+        """
+        폴더 내 파일을 파싱하면서 파일 단위 결과를 완료되는 순서대로 반환하는 제너레이터
+        성공한 파일은 매니페스트에 기록되어 다음 증분 처리 시 건너뜁니다.
+        파일 배정 순서는 스케줄 정책(schedule_policy)을 따르고, 실제 소요 시간은 비용 모델 학습에 사용합니다.
+
+        Args:
+            folder_path: PDF 파일들이 있는 폴더 경로
+            num_workers: 프로세스 수 (None이면 인스턴스 설정값 사용, 1이면 순차 처리)
+            files: 처리할 파일 목록 (None이면 plan_batch_files로 결정)
+            incremental: files가 None일 때 변경된 파일만 처리할지 여부
+            plan: 미리 계산한 preflight 결과 (None이면 여기서 계산)
+            priority: 모든 파일에 적용할 우선순위 (None이면 project_priorities 사용)
+        """
+        num_workers = num_workers or self.num_workers
+        if files is None:
+            files, _ = self.plan_batch_files(folder_path, incremental=incremental)
+        if plan is None:
+            plan = self.preflight(files, num_workers)
+        estimates = {e["file"]: e for e in plan["files"]}
+        selected = {str(f) for f in files}
+        scheduler = self._make_scheduler([e for e in plan["files"] if e["file"] in selected], priority)
+
+        try:
+            for result in self._iter_task_results(scheduler, num_workers):
+                estimate = estimates.get(result["file"])
+                if estimate is not None:
+                    result["estimated_seconds"] = estimate["estimated_seconds"]
+                if result["status"] == "success":
+                    self.manifest.record(result["file"], output=result.get("output", ""), pages=result["pages"])
+                    if estimate is not None and "probe_error" not in estimate["features"]:
+                        self.cost_model.observe(estimate["features"], result["elapsed"])
+                yield result
+        finally:
+            self.manifest.save()
+            self.cost_model.save()
+
+    def batch_parse_pdfs(self, folder_path: str, remove_original: bool = False, num_workers: Optional[int] = None,
+                         incremental: bool = False, return_report: bool = False):
         """
         폴더 내 모든 PDF 파일을 배치 처리합니다.
         
         Args:
             folder_path: PDF 파일들이 있는 폴더 경로
             remove_original: 파싱 후 원본 파일 삭제 여부
+            num_workers: 병렬 처리 프로세스 수 (None이면 인스턴스 설정값 사용)
+            incremental: True이면 매니페스트 기준 신규/변경 파일만 파싱
+            return_report: True이면 (Document 리스트, {"results": 파일별 성공/실패 요약, "diff": 증분 비교 결과}) 반환
+                           (파서 인스턴스는 여러 요청이 공유하므로 결과를 인스턴스에 저장하지 않음)
             
         Returns:
             각 PDF의 Document 객체 리스트를 포함하는 리스트
         """
         folder_path = Path(folder_path)
-        pdf_files = self._list_files_recursive(folder_path=folder_path)
-        
-        if not pdf_files:
-            print("처리할 PDF 파일이 없습니다.")
-            return []
+        files, diff = self.plan_batch_files(folder_path, incremental=incremental)
 
         all_docs = []
-        for pdf_file in tqdm(pdf_files):
-
-            file_path, file_name = os.path.split(pdf_file)
-            target_file_path = file_path.split("uploaded")[1].replace("\\", "/")
-            target_file_path = target_file_path.split("/")
+        results = []
+        for result in tqdm(self.iter_batch_results(folder_path, num_workers=num_workers, files=files)):
+            batch = result.pop("batch")
+            results.append(result)
 
-            # 파일 폴더 경로에서 level cat 추출 (최대 4개까지)
-            cats = defaultdict(str)
-            for i in range(1,5,1):
-                try: cats[f"lv{i}_cat"] = target_file_path[i]
-                except: cats[f"lv{i}_cat"] = ""
-            cats = dict(cats)
-            lv1_cat, lv2_cat, lv3_cat, lv4_cat = cats["lv1_cat"], cats["lv2_cat"], cats["lv3_cat"], cats["lv4_cat"]
+            if result["status"] == "success":
+                all_docs.append(batch.to_documents())
+            else:
+                print(f"{result['file']} 처리 중 오류: {result['error']}")
 
-            try:
-                docs = self.parse_pdf_by_page(str(pdf_file), lv1_cat, lv2_cat, lv3_cat, lv4_cat)
-                all_docs.append(docs)
-            except Exception as e:
-                print(f"{pdf_file} 처리 중 오류: {e}")
-                continue
-        
-        # 업로드 파일 삭제
-        if remove_original in [True, "true", "True"] :
+        if not results:
+            print("처리할 PDF 파일이 없습니다.")
+        elif remove_original in [True, "true", "True"]:
+            # 업로드 파일 삭제
             self._clear_folder(folder_path=folder_path)
 
+        if return_report:
+            return all_docs, {"results": results, "diff": diff}
         return all_docs
 
 
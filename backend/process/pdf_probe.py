@@ -0,0 +1,126 @@
+from pathlib import Path
+from typing import List, Tuple
+
+import pypdfium2 as pdfium
+import pypdfium2.raw as pdfium_c
+
+
+def get_pdf_page_count(pdf_path: str) -> int:
+    """PDF 페이지 수만 빠르게 확인"""
+    pdf = pdfium.PdfDocument(str(Path(pdf_path)))
+    try:
+        return len(pdf)
+    finally:
+        pdf.close()
+
+
+def probe_pdf_text_layer(pdf_path: str, min_text_chars: int = 50) -> dict:
+    """
+    pypdfium2로 PDF 각 페이지의 텍스트 레이어를 빠르게 확인합니다.
+    (레이아웃/OCR 모델 없이 텍스트 레이어만 읽으므로 페이지당 수 ms 수준)
+
+    Args:
+        pdf_path: PDF 파일 경로
+        min_text_chars: 이 글자 수(공백 제외) 미만이면 스캔/이미지 페이지로 보고 OCR 대상으로 분류
+
+    Returns:
+        {
+            "page_count": 전체 페이지 수,
+            "pages": [{"page": 0부터 시작하는 페이지 번호, "text_chars": 글자 수, "needs_ocr": bool}, ...]
+        }
+    """
+    pdf = pdfium.PdfDocument(str(Path(pdf_path)))
+    try:
+        pages = []
+        for index in range(len(pdf)):
+            page = pdf[index]
+            textpage = page.get_textpage()
+            try:
+                text_chars = len("".join(textpage.get_text_range().split()))
+            finally:
+                textpage.close()
+                page.close()
+            pages.append({"page": index, "text_chars": text_chars, "needs_ocr": text_chars < min_text_chars})
+    finally:
+        pdf.close()
+
+    return {"page_count": len(pages), "pages": pages}
+
+
+def probe_pdf_features(pdf_path: str, min_text_chars: int = 50, max_sample_pages: int = 64) -> dict:
+    """
+    파싱 비용 추정용 PDF 특징 추출 (텍스트 레이어 비율, 이미지 밀도)
+    페이지가 많으면 고르게 max_sample_pages 페이지만 검사하여 전체 값을 추정합니다.
+
+    Returns:
+        {
+            "page_count": 전체 페이지 수,
+            "sampled_pages": 검사한 페이지 수,
+            "text_coverage": 텍스트 레이어가 있는 페이지 비율 (0~1),
+            "images_per_page": 페이지당 평균 이미지 객체 수,
+            "page_megapixels": 72dpi 기준 평균 페이지 면적 (백만 픽셀, A4 ≈ 0.5)
+        }
+    """
+    pdf = pdfium.PdfDocument(str(Path(pdf_path)))
+    try:
+        page_count = len(pdf)
+        if page_count <= max_sample_pages:
+            indices = list(range(page_count))
+        else:
+            step = page_count / max_sample_pages
+            indices = [int(i * step) for i in range(max_sample_pages)]
+
+        text_pages, images, area = 0, 0, 0.0
+        for index in indices:
+            page = pdf[index]
+            width, height = page.get_size()
+            area += width * height
+            textpage = page.get_textpage()
+            try:
+                if len("".join(textpage.get_text_range().split())) >= min_text_chars:
+                    text_pages += 1
+                images += sum(1 for _ in page.get_objects(filter=[pdfium_c.FPDF_PAGEOBJ_IMAGE], max_depth=2))
+            finally:
+                textpage.close()
+                page.close()
+    finally:
+        pdf.close()
+
+    sampled = len(indices)
+    return {
+        "page_count": page_count,
+        "sampled_pages": sampled,
+        "text_coverage": text_pages / sampled if sampled else 0.0,
+        "images_per_page": images / sampled if sampled else 0.0,
+        "page_megapixels": area / sampled / 1e6 if sampled else 0.0,
+        }
+
+
+def group_page_runs(flags: List[bool]) -> List[Tuple[int, int, bool]]:
+    """
+    페이지별 플래그를 연속 구간으로 묶습니다.
+
+    Returns:
+        [(시작 페이지, 끝 페이지(포함), 플래그), ...]  - 페이지 번호는 0부터 시작
+    """
+    runs = []
+    for index, flag in enumerate(flags):
+        if runs and runs[-1][2] == flag and runs[-1][1] == index - 1:
+            runs[-1] = (runs[-1][0], index, flag)
+        else:
+            runs.append((index, index, flag))
+    return runs
+
+
+def split_page_runs(runs: List[Tuple[int, int, bool]], max_pages: int) -> List[Tuple[int, int, bool]]:
+    """
+    연속 구간을 최대 max_pages 페이지 단위의 구간으로 다시 나눕니다. (max_pages <= 0 이면 그대로 반환)
+    """
+    if max_pages <= 0:
+        return list(runs)
+
+    windows = []
+    for start, end, flag in runs:
+        for window_start in range(start, end + 1, max_pages):
+            windows.append((window_start, min(window_start + max_pages - 1, end), flag))
+    return windows
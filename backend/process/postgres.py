@@ -1,4 +1,5 @@
 import json
+import hashlib
 import pickle
 import psycopg2
 from psycopg2.extras import execute_batch
@@ -12,6 +13,9 @@ utils_path = Path(__file__).parent.parent
 sys.path.append(str(utils_path))
 # print(utils_path)
 
+from process.columnar import iter_parquet_rows, load_page_batch
+from process.page_batch import PageBatch
+
 from utils.config import get_config
 from utils.setlogger import setup_logger
 config = get_config()
@@ -223,15 +227,16 @@ class PostgresPipeline:
                 conn.close()
                 logger.info("데이터베이스 연결 종료")
 
-    def insert_data_from_pickle(self, table_name: str, pickle_path: str):
+    def insert_data_from_pickle(self, table_name: str, pickle_path: str, chunk_size: int = 500):
         """
+        파싱 결과 피클(PageBatch 또는 이전 형식의 Document 리스트)을 insert 합니다.
+        임베딩 리스트는 chunk 단위로만 생성하여 전체 문서를 dict/list로 다시 만들지 않습니다.
         """
         conn = None
         cur = None
         pickle_path = pickle_path.replace("\\", "/")
 
-        with open(pickle_path, 'rb') as f:
-            docs = pickle.load(f)
+        batch = load_page_batch(pickle_path)
 
         # 컬럼 이름을 SQL 쿼리 형식으로 변환
         columns = ['id', 'page_content', 'filename', 'filepath','hashed_filename', 'hashed_filepath', 'hashed_page_content',
@@ -247,34 +252,9 @@ class PostgresPipeline:
             conn = self._get_db_connection()
             cur = conn.cursor()
 
-            # Convert to dictionary
-            data = [{"page_content": doc.page_content,"metadata": doc.metadata} for doc in docs]
-            # print(len(data))
-
-            # 데이터 정규화
-            normalized = []
-            for row in tqdm(data):
-                new_row = [
-                    row["metadata"].get("id"),
-                    row.get("page_content"),
-                    row["metadata"].get("filename"),
-                    row["metadata"].get("filepath"),
-                    row["metadata"].get("hashed_filename"),
-                    row["metadata"].get("hashed_filepath"),
-                    row["metadata"].get("hashed_page_content"),
-                    row["metadata"].get("page"),
-                    row["metadata"].get("lv1_cat"),
-                    row["metadata"].get("lv2_cat"),
-                    row["metadata"].get("lv3_cat"),
-                    row["metadata"].get("lv4_cat"),
-                    row["metadata"].get("embeddings"),
-                    row.get("created_at", datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")),
-                    row.get("updated_at", datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f"))
-                    ]
-
-                normalized.append(new_row)
-
-            execute_batch(cur, sql, normalized)
+            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")
+            for rows in tqdm(batch.iter_rows(chunk_size), total=-(-len(batch) // chunk_size)):
+                execute_batch(cur, sql, [row + [now, now] for row in rows])
             conn.commit()
                     
         except Exception as error:
@@ -289,6 +269,153 @@ class PostgresPipeline:
                 conn.close()
                 logger.info("데이터베이스 연결 종료")
 
+    def insert_data_from_parquet(self, table_name: str, parquet_path: str, batch_size: int = 500):
+        """
+        Parquet 파일을 row batch 단위로 읽어 insert 합니다. (파일 전체를 메모리에 올리지 않음)
+        """
+        conn = None
+        cur = None
+        parquet_path = parquet_path.replace("\\", "/")
+
+        columns = ['id', 'page_content', 'filename', 'filepath','hashed_filename', 'hashed_filepath', 'hashed_page_content',
+                    'page', 'lv1_cat', 'lv2_cat', 'lv3_cat', 'lv4_cat', 'embeddings', 'created_at', 'updated_at']
+        columns_sql = ", ".join(columns)
+        placeholders = ", ".join(["%s"] * len(columns))
+        sql = f"INSERT INTO {table_name} ({columns_sql}) VALUES ({placeholders})"
+
+        try:
+            logger.info("START - INSERT DATA FROM PARQUET")
+            conn = self._get_db_connection()
+            cur = conn.cursor()
+
+            total_inserted = 0
+            for rows in iter_parquet_rows(parquet_path, batch_size=batch_size):
+                now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")
+                execute_batch(cur, sql, [row + [now, now] for row in rows])
+                conn.commit()
+                total_inserted += len(rows)
+
+            logger.info(f"Parquet 데이터 삽입 완료: 총 {total_inserted}개의 행 - {parquet_path}")
+
+        except Exception as error:
+            logger.error(f"전체 처리 중 오류 발생: {error}")
+            if conn:
+                conn.rollback()
+        finally:
+            if cur:
+                cur.close()
+            if conn:
+                conn.close()
+                logger.info("데이터베이스 연결 종료")
+
+    def delete_file_rows(self, table_name: str, filepath: str) -> int:
+        """
+        파일 하나의 기존 행을 모두 삭제합니다. (스트리밍 재적재용)
+        실패 페이지는 hashed_filepath가 비어 있으므로 filepath로도 함께 찾습니다.
+        """
+        resolved = str(Path(filepath).resolve())
+        hashed_filepath = hashlib.md5(resolved.encode()).hexdigest()
+        delete_sql = f"DELETE FROM {table_name} WHERE hashed_filepath = %s OR filepath = %s"
+
+        conn = None
+        cur = None
+        try:
+            conn = self._get_db_connection()
+            cur = conn.cursor()
+            cur.execute(delete_sql, (hashed_filepath, resolved.replace("\\", "/")))
+            deleted = cur.rowcount
+            conn.commit()
+            return deleted
+        except Exception as error:
+            logger.error(f"파일 행 삭제 오류: {error}")
+            if conn:
+                conn.rollback()
+            raise
+        finally:
+            if cur:
+                cur.close()
+            if conn:
+                conn.close()
+
+    def insert_batch(self, table_name: str, batch: PageBatch):
+        """
+        PageBatch를 바로 저장합니다. (스트리밍 적재용)
+        재처리 시 중복은 파일 시작 시점의 delete_file_rows로 막습니다.
+        """
+        if not len(batch):
+            return 0
+
+        columns = ['id', 'page_content', 'filename', 'filepath','hashed_filename', 'hashed_filepath', 'hashed_page_content',
+                    'page', 'lv1_cat', 'lv2_cat', 'lv3_cat', 'lv4_cat', 'embeddings', 'created_at', 'updated_at']
+        columns_sql = ", ".join(columns)
+        placeholders = ", ".join(["%s"] * len(columns))
+        insert_sql = f"INSERT INTO {table_name} ({columns_sql}) VALUES ({placeholders})"
+
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")
+        conn = None
+        cur = None
+        try:
+            conn = self._get_db_connection()
+            cur = conn.cursor()
+            for rows in batch.iter_rows():
+                execute_batch(cur, insert_sql, [row + [now, now] for row in rows])
+            conn.commit()
+            return len(batch)
+        except Exception as error:
+            logger.error(f"INSERT 오류: {error}")
+            if conn:
+                conn.rollback()
+            raise
+        finally:
+            if cur:
+                cur.close()
+            if conn:
+                conn.close()
+
+    def update_pages(self, table_name: str, docs: list) -> int:
+        """
+        복구된 Document를 id 기준으로 기존 행에 덮어씁니다. (행 id는 유지)
+        """
+        if not docs:
+            return 0
+
+        sql = (
+            f"UPDATE {table_name} SET page_content = %s, hashed_filename = %s, hashed_filepath = %s, "
+            f"hashed_page_content = %s, embeddings = %s, updated_at = %s WHERE id = %s"
+            )
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")
+        rows = [
+            [
+                doc.page_content,
+                doc.metadata.get("hashed_filename"),
+                doc.metadata.get("hashed_filepath"),
+                doc.metadata.get("hashed_page_content"),
+                doc.metadata.get("embeddings"),
+                now,
+                doc.metadata.get("id"),
+                ]
+            for doc in docs
+            ]
+
+        conn = None
+        cur = None
+        try:
+            conn = self._get_db_connection()
+            cur = conn.cursor()
+            execute_batch(cur, sql, rows)
+            conn.commit()
+            return len(rows)
+        except Exception as error:
+            logger.error(f"UPDATE 오류: {error}")
+            if conn:
+                conn.rollback()
+            raise
+        finally:
+            if cur:
+                cur.close()
+            if conn:
+                conn.close()
+
     def select_all_data(self, table_name: str, limit: Optional[int] = 10, order_by: str = "id"):
         """지정된 테이블의 10게 데이터를 조회합니다."""
         conn = None
@@ -0,0 +1,126 @@
+import time
+import threading
+from typing import Dict
+
+from utils.config import get_config
+from utils.setlogger import setup_logger
+config = get_config()
+logger = setup_logger(f"{__name__}", level=config.LOG_LEVEL)
+
+
+class AdaptiveRateLimiter:
+    """
+    임베딩 호출용 토큰 버킷 레이트 리미터
+
+    - 평소에는 max_rate(초당 페이지 수)까지 제한 없이 호출
+    - 호출 결과(지연 시간, 성공 여부)를 record()로 받아 AIMD 방식으로 속도 조절
+        * 오류 발생 또는 페이지당 지연이 latency_target 초과 → 속도 절반으로 감소
+        * 정상 응답 → 속도를 조금씩 증가 (max_rate 까지)
+    """
+
+    def __init__(self, max_rate: float = 200.0, min_rate: float = 2.0, burst: float = 64.0,
+                 latency_target: float = 0.5, increase_step: float = 5.0, cooldown: float = 2.0):
+        """
+        Args:
+            max_rate: 최대 처리 속도 (초당 페이지 수)
+            min_rate: 최소 처리 속도 (부하가 높아도 이 속도 이상은 유지)
+            burst: 버킷 최대 토큰 수 (한 번에 몰아서 보낼 수 있는 페이지 수)
+            latency_target: 페이지당 목표 지연 시간(초) - 초과 시 속도 감소
+            increase_step: 정상 응답마다 증가시킬 속도 (초당 페이지 수)
+            cooldown: 속도 감소 후 다음 감소까지 최소 대기 시간(초)
+        """
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.burst = max(burst, 1.0)
+        self.latency_target = latency_target
+        self.increase_step = increase_step
+        self.cooldown = cooldown
+
+        self.rate = max_rate
+        self._tokens = self.burst
+        self._last_refill = time.monotonic()
+        self._last_decrease = 0.0
+        self._latency_ewma = 0.0
+        self._calls = 0
+        self._errors = 0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self._last_refill
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._last_refill = now
+
+    def acquire(self, tokens: float = 1.0):
+        """토큰이 충분해질 때까지 대기 (버킷보다 큰 요청은 버킷 크기만큼만 차감)"""
+        tokens = min(tokens, self.burst)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def record(self, latency: float, success: bool, tokens: float = 1.0):
+        """
+        호출 결과를 반영하여 처리 속도를 조절합니다.
+
+        Args:
+            latency: 호출에 걸린 시간(초)
+            success: 호출 성공 여부
+            tokens: 호출에 포함된 페이지 수
+        """
+        per_item = latency / max(tokens, 1.0)
+        with self._lock:
+            self._calls += 1
+            self._latency_ewma = per_item if self._calls == 1 else 0.8 * self._latency_ewma + 0.2 * per_item
+
+            now = time.monotonic()
+            overloaded = (not success) or self._latency_ewma > self.latency_target
+            if not success:
+                self._errors += 1
+
+            if overloaded:
+                if now - self._last_decrease >= self.cooldown:
+                    previous = self.rate
+                    self.rate = max(self.min_rate, self.rate * 0.5)
+                    self._last_decrease = now
+                    if self.rate != previous:
+                        logger.warning(
+                            f"임베딩 속도 제한: {previous:.1f} → {self.rate:.1f} pages/s "
+                            f"(지연 {self._latency_ewma:.3f}s/page, 성공 {success})"
+                            )
+            else:
+                self.rate = min(self.max_rate, self.rate + self.increase_step)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "rate": round(self.rate, 2),
+                "max_rate": self.max_rate,
+                "min_rate": self.min_rate,
+                "latency_ewma": round(self._latency_ewma, 4),
+                "calls": self._calls,
+                "errors": self._errors,
+                }
+
+
+# 프로세스 내 공유 리미터 (이름별 싱글톤)
+_LIMITERS: Dict[str, AdaptiveRateLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+def get_rate_limiter(name: str = "embedding") -> AdaptiveRateLimiter:
+    """설정값으로 생성된 공유 레이트 리미터 반환"""
+    with _LIMITERS_LOCK:
+        limiter = _LIMITERS.get(name)
+        if limiter is None:
+            limiter = AdaptiveRateLimiter(
+                max_rate=config.EMBED_RATE_MAX,
+                min_rate=config.EMBED_RATE_MIN,
+                burst=config.EMBED_RATE_BURST,
+                latency_target=config.EMBED_LATENCY_TARGET,
+                )
+            _LIMITERS[name] = limiter
+        return limiter
@@ -0,0 +1,234 @@
+import os
+from pathlib import Path
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from langchain_core.documents import Document
+
+from process.columnar import load_page_batch, save_page_batch
+from process.page_batch import PageBatch
+from process.pdf_probe import get_pdf_page_count
+from process.text_formats import is_text_format
+from utils.retry import retry_call, retry_pending
+from utils.config import get_config
+from utils.setlogger import setup_logger
+config = get_config()
+logger = setup_logger(f"{__name__}", level=config.LOG_LEVEL)
+
+
+# Document 메타데이터 중 OCR 판단 정보 (복구 후에도 유지)
+PAGE_INFO_KEYS = ("ocr", "text_chars")
+
+
+class PageRepairer:
+    """
+    실패 페이지(status "fail" 또는 빈 임베딩)만 골라 다시 처리하는 복구 도구
+
+    - 텍스트 추출까지 실패한 페이지: 원본 PDF에서 해당 페이지 구간만 다시 변환 후 임베딩
+    - 임베딩만 실패한 페이지: 저장된 텍스트로 임베딩만 다시 계산
+    - 변환/임베딩 모두 실패 항목만 지수 백오프로 재시도
+    - 복구된 페이지는 기존 id를 유지한 채 파싱 결과 파일 또는 RDB 행에 덮어씀
+    """
+
+    def __init__(self, parser, attempts: int = 4, base_delay: float = 2.0, max_delay: float = 60.0):
+        """
+        Args:
+            parser: DoclingParser 인스턴스 (변환기/임베딩 모델/캐시 재사용)
+            attempts: 페이지별 최대 시도 횟수
+            base_delay: 첫 재시도 대기 시간(초)
+            max_delay: 재시도 대기 시간 상한(초)
+        """
+        self.parser = parser
+        self.retry_kwargs = {"attempts": attempts, "base_delay": base_delay, "max_delay": max_delay}
+
+    @staticmethod
+    def is_failed(doc: Document) -> bool:
+        return doc.metadata.get("status") == "fail" or not doc.metadata.get("embeddings")
+
+    @staticmethod
+    def _needs_text(doc: Document) -> bool:
+        """텍스트 추출 자체가 실패한 페이지 (placeholder 문서는 hashed_page_content가 비어 있음)"""
+        return not doc.metadata.get("hashed_page_content")
+
+    def _reextract_pages(self, pdf_path: Path, page_nums: List[int], cats: dict) -> Dict[int, dict]:
+        """
+        원본 PDF에서 지정 페이지만 다시 변환하여 {페이지 번호: 페이지 레코드} 반환
+        (나머지 페이지를 skip_pages로 넘기므로 시도마다 아직 실패한 페이지 구간만 변환)
+        """
+        # 텍스트 기반 형식은 변환이 가벼우므로 전체를 다시 읽고 필요한 페이지만 사용
+        total_pages = None if is_text_format(str(pdf_path)) else get_pdf_page_count(str(pdf_path))
+
+        def extract_pages(pending: List[int]) -> Dict[int, dict]:
+            skip_pages = set(range(total_pages)) - set(pending) if total_pages is not None else set()
+            records = self.parser.iter_page_texts(
+                pdf_path, cats["lv1_cat"], cats["lv2_cat"], cats["lv3_cat"], cats["lv4_cat"], skip_pages=skip_pages
+                )
+            # 구간 변환이 도중에 실패해도 앞서 변환된 페이지는 성공으로 남겨 다음 시도에서 제외
+            done = {}
+            try:
+                for record in records:
+                    if record["page"] in pending and record["text"] is not None:
+                        done[record["page"]] = record
+            except Exception as e:
+                logger.warning(f"페이지 재변환 중 오류 ({len(done)}/{len(pending)} 완료): {pdf_path} - {e}")
+            return done
+
+        if total_pages is not None:
+            page_nums = [p for p in page_nums if p < total_pages]
+        return retry_pending(extract_pages, page_nums, **self.retry_kwargs)
+
+    def _embed_pages(self, texts: Dict[str, str]) -> Dict[str, List[float]]:
+        """{문서 id: 텍스트} 임베딩 - 실패한 페이지만 백오프 후 재시도"""
+        def embed_pending(pending: List[str]) -> Dict[str, Optional[List[float]]]:
+            vectors = self.parser._embed_texts([texts[doc_id] for doc_id in pending])
+            return dict(zip(pending, vectors))
+
+        return retry_pending(embed_pending, list(texts), **self.retry_kwargs)
+
+    def repair_documents(self, docs: List[Document]) -> List[Document]:
+        """
+        실패 페이지 Document들을 복구합니다.
+
+        Returns:
+            복구에 성공한 Document 리스트 (원래 id 유지)
+        """
+        by_file = defaultdict(list)
+        for doc in docs:
+            if self.is_failed(doc):
+                by_file[doc.metadata.get("filepath")].append(doc)
+
+        repaired = []
+        for filepath, file_docs in by_file.items():
+            pdf_path = Path(filepath)
+            first = file_docs[0].metadata
+            cats = {f"lv{i}_cat": first.get(f"lv{i}_cat") or "" for i in range(1, 5)}
+            first_sentence = self.parser._make_first_sentence(pdf_path, cats["lv1_cat"], cats["lv2_cat"], cats["lv3_cat"], cats["lv4_cat"])
+
+            # 1) 임베딩 대상 텍스트 확보 (텍스트 추출 실패 페이지는 원본에서 재변환)
+            texts, page_infos = {}, {}
+            need_text = [doc for doc in file_docs if self._needs_text(doc)]
+            records = {}
+            if need_text:
+                if pdf_path.exists():
+                    try:
+                        records = self._reextract_pages(pdf_path, [int(doc.metadata["page"]) for doc in need_text], cats)
+                    except Exception as e:
+                        logger.error(f"페이지 재변환 실패: {filepath} - {e}")
+                else:
+                    logger.warning(f"원본 파일이 없어 텍스트 복구 불가: {filepath} ({len(need_text)} 페이지)")
+
+            for doc in file_docs:
+                doc_id = doc.metadata["id"]
+                if self._needs_text(doc):
+                    record = records.get(int(doc.metadata["page"]))
+                    if record is None:
+                        continue
+                    texts[doc_id], page_infos[doc_id] = record["text"], record["page_info"]
+                else:
+                    texts[doc_id] = doc.page_content
+                    page_infos[doc_id] = {k: doc.metadata[k] for k in PAGE_INFO_KEYS if k in doc.metadata}
+
+            # 2) 임베딩 (백오프 재시도)
+            vectors = self._embed_pages(texts)
+
+            # 3) 기존 id로 Document 재생성
+            file_repaired = 0
+            for doc in file_docs:
+                doc_id = doc.metadata["id"]
+                if doc_id not in vectors:
+                    continue
+                new_doc = self.parser._build_page_document(
+                    texts[doc_id], vectors[doc_id], int(doc.metadata["page"]), pdf_path.name, pdf_path,
+                    cats["lv1_cat"], cats["lv2_cat"], cats["lv3_cat"], cats["lv4_cat"], first_sentence,
+                    page_info=page_infos.get(doc_id),
+                    )
+                new_doc.metadata["id"] = doc_id
+                repaired.append(new_doc)
+                file_repaired += 1
+
+            logger.info(f"페이지 복구: {filepath} - {file_repaired}/{len(file_docs)}")
+        return repaired
+
+    # -----------------------------
+    # 파싱 결과 파일 복구
+    # -----------------------------
+    @staticmethod
+    def _write_output(output_path: Path, batch: PageBatch):
+        """임시 파일에 쓴 뒤 교체 (복구 중 중단되어도 기존 결과 파일 보존)"""
+        tmp_path = output_path.with_name(output_path.name + ".tmp")
+        save_page_batch(batch, str(tmp_path), "parquet" if output_path.suffix == ".parquet" else "pickle")
+        os.replace(tmp_path, output_path)
+
+    def repair_output_file(self, output_path: str) -> dict:
+        """파싱 결과 파일(.pkl/.parquet) 하나의 실패 페이지 복구 후 같은 파일에 덮어쓰기"""
+        output_path = Path(output_path)
+        batch = load_page_batch(str(output_path))
+        # 실패 페이지만 Document로 변환하여 복구
+        failed_idx = [i for i in range(len(batch)) if batch.columns["status"][i] == "fail" or not batch.has_embedding[i]]
+        failed = batch.take(failed_idx).to_documents()
+        result = {"file": str(output_path).replace("\\", "/"), "status": "success", "failed_pages": len(failed), "repaired_pages": 0}
+        if not failed:
+            return result
+
+        repaired = {doc.metadata["id"]: doc for doc in self.repair_documents(failed)}
+        if repaired:
+            # 복구된 페이지만 같은 위치에 덮어씀
+            patched = PageBatch.from_documents(repaired.values())
+            position = {doc_id: i for i, doc_id in enumerate(patched.columns["id"])}
+            for i in failed_idx:
+                j = position.get(batch.columns["id"][i])
+                if j is None:
+                    continue
+                batch.page_content[i] = patched.page_content[j]
+                for name in batch.columns:
+                    batch.columns[name][i] = patched.columns[name][j]
+                batch.embeddings[i] = patched.embeddings[j]
+                batch.has_embedding[i] = patched.has_embedding[j]
+                batch.extra[i] = patched.extra[j]
+            self._write_output(output_path, batch)
+        result["repaired_pages"] = len(repaired)
+        if len(repaired) < len(failed):
+            result["status"] = "partial"
+        return result
+
+    def list_output_files(self, folder_path: Optional[str] = None) -> List[str]:
+        """복구 대상 파싱 결과 파일 목록 (체크포인트 폴더 제외)"""
+        folder = Path(folder_path or self.parser.output_base_path)
+        return sorted(
+            str(path) for path in folder.rglob("*")
+            if path.suffix in (".pkl", ".parquet") and "_checkpoints" not in path.parts
+            )
+
+    def iter_repair_outputs(self, folder_path: Optional[str] = None):
+        """폴더 내 파싱 결과 파일을 하나씩 복구하며 파일별 결과를 반환하는 제너레이터"""
+        for output_path in self.list_output_files(folder_path):
+            try:
+                yield self.repair_output_file(output_path)
+            except Exception as e:
+                logger.error(f"결과 파일 복구 실패: {output_path} - {e}")
+                yield {"file": output_path, "status": "fail", "failed_pages": 0, "repaired_pages": 0, "error": str(e)}
+
+    # -----------------------------
+    # RDB 테이블 복구
+    # -----------------------------
+    def repair_table(self, pg_pipe, table_name: str, es_indexer=None, limit: Optional[int] = None) -> dict:
+        """
+        RDB 테이블에서 임베딩이 비어 있는 행을 찾아 복구 후 같은 id의 행에 덮어씁니다.
+        es_indexer가 주어지면 복구된 페이지를 같은 _id로 다시 색인합니다.
+        """
+        rows = pg_pipe.select_failed_pages(table_name, limit=limit)
+        columns = ["id", "page_content", "filename", "filepath", "hashed_filename", "hashed_filepath",
+                   "hashed_page_content", "page", "lv1_cat", "lv2_cat", "lv3_cat", "lv4_cat"]
+        docs = []
+        for row in rows:
+            metadata = dict(zip(columns, row))
+            page_content = metadata.pop("page_content")
+            metadata["embeddings"] = []
+            docs.append(Document(page_content=page_content, metadata=metadata))
+
+        repaired = self.repair_documents(docs)
+        if repaired:
+            retry_call(pg_pipe.update_pages, table_name, repaired, **self.retry_kwargs)
+        indexed = es_indexer.index_documents(repaired) if es_indexer is not None and repaired else 0
+
+        return {"table": table_name, "failed_pages": len(docs), "repaired_pages": len(repaired), "indexed": indexed}
@@ -0,0 +1,99 @@
+import heapq
+import itertools
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+
+SCHEDULE_POLICIES = ("fifo", "sjf", "lpt", "fair")
+
+
+def parse_priorities(spec: str) -> Dict[str, int]:
+    """설정 문자열 "프로젝트:우선순위,..." 파싱 (예: "legal:2,hr:1" → {"legal": 2, "hr": 1})"""
+    priorities = {}
+    for item in (spec or "").split(","):
+        project, sep, level = item.strip().rpartition(":")
+        if sep and project:
+            priorities[project.strip()] = int(level)
+    return priorities
+
+
+class TaskScheduler:
+    """
+    파싱 작업(파일) 배정 순서를 정하는 스케줄러
+
+    - 우선순위(priority)가 높은 작업이 항상 먼저
+    - 같은 우선순위 안에서는 정책에 따라 선택
+        fifo: 등록 순서
+        sjf:  예상 비용이 작은 파일부터 (작은 업로드가 큰 스캔 PDF 뒤에서 기다리지 않음)
+        lpt:  예상 비용이 큰 파일부터 (배치 전체 완료 시간 최소화)
+        fair: 지금까지 배정된 비용이 가장 적은 프로젝트(lv1_cat)를 고르고 그 안에서 sjf
+    - 작업은 {"file", "cats", "cost", "priority", "memory_mb"} dict (project는 cats["lv1_cat"])
+    """
+
+    def __init__(self, policy: str = "fifo", project_priorities: Optional[Dict[str, int]] = None):
+        if policy not in SCHEDULE_POLICIES:
+            raise ValueError(f"지원하지 않는 스케줄 정책입니다: {policy}")
+        self.policy = policy
+        self.project_priorities = project_priorities or {}
+        # {우선순위: {프로젝트: [(정렬 키, 순번, 작업), ...]}}
+        self._queues: Dict[int, Dict[str, list]] = defaultdict(lambda: defaultdict(list))
+        # 프로젝트별 누적 배정 비용 (fair 정책)
+        self._served: Dict[str, float] = defaultdict(float)
+        self._seq = itertools.count()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _sort_key(self, cost: float, seq: int):
+        if self.policy == "sjf" or self.policy == "fair":
+            return (cost, seq)
+        if self.policy == "lpt":
+            return (-cost, seq)
+        return (seq,)
+
+    def push(self, task: dict):
+        project = task["cats"].get("lv1_cat", "")
+        priority = task.get("priority")
+        if priority is None:
+            priority = self.project_priorities.get(project, 0)
+            task["priority"] = priority
+        seq = next(self._seq)
+        heapq.heappush(self._queues[priority][project], (self._sort_key(task["cost"], seq), seq, task))
+        self._size += 1
+
+    def _select(self):
+        """다음 작업의 (우선순위 큐, 프로젝트) 선택"""
+        level = self._queues[max(p for p, projects in self._queues.items() if projects)]
+
+        if self.policy == "fair":
+            # 처음 보는 프로젝트는 현재 최소 누적값에서 시작 (뒤늦게 온 프로젝트가 독점하지 않도록)
+            floor = min((self._served[p] for p in level if p in self._served), default=0.0)
+            for project in level:
+                if project not in self._served:
+                    self._served[project] = floor
+            return level, min(level, key=lambda p: (self._served[p], level[p][0][0]))
+        return level, min(level, key=lambda p: level[p][0][0])
+
+    def peek(self) -> Optional[dict]:
+        """다음에 실행할 작업을 꺼내지 않고 확인 (없으면 None)"""
+        if not self._size:
+            return None
+        level, project = self._select()
+        return level[project][0][2]
+
+    def pop(self) -> Optional[dict]:
+        """다음에 실행할 작업 (없으면 None)"""
+        if not self._size:
+            return None
+        level, project = self._select()
+        _, _, task = heapq.heappop(level[project])
+        if not level[project]:
+            del level[project]
+        self._served[project] += task["cost"]
+        self._size -= 1
+        return task
+
+    def drain(self) -> List[dict]:
+        """남은 작업 전체를 배정 순서대로 꺼냄"""
+        return [self.pop() for _ in range(self._size)]
@@ -0,0 +1,255 @@
+import time
+import queue
+import hashlib
+import threading
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from process.page_batch import PageBatch
+from utils.config import get_config
+from utils.setlogger import setup_logger
+config = get_config()
+logger = setup_logger(f"{__name__}", level=config.LOG_LEVEL)
+
+
+# 큐 사이에서 전달되는 제어 메시지
+_FILE_START = "file_start"
+_FILE_END = "file_end"
+_PAGE = "page"
+_STOP = "stop"
+
+
+class StreamingIngestor:
+    """
+    파싱 → 임베딩 → Postgres/ES 적재를 동시에 진행하는 스트리밍 파이프라인
+
+    [변환 스레드] --(페이지 큐)--> [임베딩 스레드] --(문서 큐)--> [적재 스레드]
+
+    - 큐 크기가 제한되어 있어 느린 단계가 있으면 앞 단계가 자동으로 대기 (메모리 상한 유지)
+    - 페이지는 변환 구간(샤드) 단위로 흘러가므로 배치 전체가 끝나기 전에 검색 가능
+    - 피클/Parquet 파일 저장은 save_output=True 일 때만 부가적으로 수행
+    """
+
+    def __init__(self, parser, pg_pipe, table_name: str, es_indexer=None, queue_size: int = 64,
+                 embed_batch_size: Optional[int] = None, save_output: bool = False):
+        """
+        Args:
+            parser: DoclingParser 인스턴스
+            pg_pipe: PostgresPipeline 인스턴스
+            table_name: 적재할 RDB 테이블명
+            es_indexer: ElasticsearchIndexer 인스턴스 (None이면 ES 색인 생략)
+            queue_size: 단계 사이 큐 최대 길이
+            embed_batch_size: 임베딩 배치 크기 (None이면 parser 설정값)
+            save_output: 파일별 파싱 결과(.pkl/.parquet)도 저장할지 여부
+        """
+        self.parser = parser
+        self.pg_pipe = pg_pipe
+        self.table_name = table_name
+        self.es_indexer = es_indexer
+        self.embed_batch_size = embed_batch_size or parser.embed_batch_size
+        self.save_output = save_output
+
+        self._page_queue = queue.Queue(maxsize=queue_size)
+        # 문서 큐는 배치 단위이므로 페이지 큐보다 작게 유지
+        self._doc_queue = queue.Queue(maxsize=max(2, queue_size // self.embed_batch_size))
+        self._stop = threading.Event()
+        self._errors: List[str] = []
+
+    def _put(self, q: queue.Queue, item):
+        """중단 신호를 확인하면서 큐에 넣기 (하위 단계가 죽었을 때 영원히 막히지 않도록)"""
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _put_stop(self, q: queue.Queue):
+        """
+        STOP은 중단 여부와 관계없이 반드시 전달
+        (중단된 상태에서 큐가 가득 차 있으면 어차피 버려질 항목을 꺼내고 넣음)
+        """
+        while True:
+            try:
+                q.put((_STOP, None, None), timeout=0.5)
+                return
+            except queue.Full:
+                if self._stop.is_set():
+                    try:
+                        q.get_nowait()
+                    except queue.Empty:
+                        pass
+
+    def _get(self, q: queue.Queue):
+        """중단 신호를 확인하면서 큐에서 꺼내기 (중단되면 STOP으로 간주)"""
+        while not self._stop.is_set():
+            try:
+                return q.get(timeout=0.5)
+            except queue.Empty:
+                continue
+        return (_STOP, None, None)
+
+    def _fail(self, stage: str, e: Exception):
+        logger.error(f"스트리밍 {stage} 단계 오류: {e}")
+        self._errors.append(str(e))
+        self._stop.set()
+
+    # -----------------------------
+    # 1) 변환 단계
+    # -----------------------------
+    def _parse_stage(self, files: List[str]):
+        try:
+            for pdf_file in files:
+                if self._stop.is_set():
+                    break
+                cats = self.parser._extract_cats(pdf_file)
+                file_ctx = {"file": str(pdf_file), "cats": cats, "start": time.perf_counter()}
+                self._put(self._page_queue, (_FILE_START, file_ctx, None))
+                try:
+                    for page in self.parser.iter_page_texts(pdf_file, cats["lv1_cat"], cats["lv2_cat"], cats["lv3_cat"], cats["lv4_cat"]):
+                        if not self._put(self._page_queue, (_PAGE, file_ctx, page)):
+                            break
+                except Exception as e:
+                    logger.error(f"스트리밍 변환 실패: {pdf_file} - {e}")
+                    file_ctx["error"] = str(e)
+                self._put(self._page_queue, (_FILE_END, file_ctx, None))
+        except Exception as e:
+            self._fail("변환", e)
+        finally:
+            self._put_stop(self._page_queue)
+
+    # -----------------------------
+    # 2) 임베딩 단계
+    # -----------------------------
+    def _embed_stage(self):
+        pending, pending_ctx = [], None
+
+        def flush():
+            nonlocal pending
+            if not pending:
+                return
+            cats = pending_ctx["cats"]
+            batch = self.parser.build_page_batch(
+                pending, pending_ctx["file"], cats["lv1_cat"], cats["lv2_cat"], cats["lv3_cat"], cats["lv4_cat"]
+                )
+            pending = []
+            self._put(self._doc_queue, (_PAGE, pending_ctx, batch))
+
+        try:
+            while True:
+                kind, file_ctx, page = self._get(self._page_queue)
+                if kind == _STOP:
+                    break
+                if kind == _FILE_START:
+                    pending_ctx = file_ctx
+                    self.parser.reset_near_duplicates(file_ctx["file"])
+                    self._put(self._doc_queue, (_FILE_START, file_ctx, None))
+                elif kind == _PAGE:
+                    pending.append(page)
+                    if len(pending) >= self.embed_batch_size:
+                        flush()
+                elif kind == _FILE_END:
+                    flush()
+                    self._put(self._doc_queue, (_FILE_END, file_ctx, None))
+        except Exception as e:
+            self._fail("임베딩", e)
+        finally:
+            self._put_stop(self._doc_queue)
+
+    # -----------------------------
+    # 3) 적재 단계 (Postgres insert + ES bulk)
+    # -----------------------------
+    def _sink_stage(self, on_file_done: Optional[Callable[[dict], None]]):
+        file_batches = []
+        try:
+            while True:
+                kind, file_ctx, batch = self._get(self._doc_queue)
+                if kind == _STOP:
+                    break
+                if kind == _FILE_START:
+                    file_batches = []
+                    file_ctx["pages"] = 0
+                    file_ctx["failed_pages"] = 0
+                    file_ctx["indexed"] = 0
+                    # 재적재 시 이전 행(실패 페이지 포함)을 파일 단위로 먼저 지워 PG/ES를 같은 기준으로 맞춤
+                    self.pg_pipe.delete_file_rows(self.table_name, file_ctx["file"])
+                    if self.es_indexer is not None:
+                        hashed_filepath = hashlib.md5(str(Path(file_ctx["file"]).resolve()).encode()).hexdigest()
+                        self.es_indexer.delete_documents_by_hashed_filepath(hashed_filepath)
+                elif kind == _PAGE:
+                    self.pg_pipe.insert_batch(self.table_name, batch)
+                    if self.es_indexer is not None:
+                        file_ctx["indexed"] += self.es_indexer.index_batch(batch)
+                    file_ctx["pages"] += len(batch)
+                    file_ctx["failed_pages"] += batch.count_status("fail")
+                    if self.save_output:
+                        file_batches.append(batch)
+                elif kind == _FILE_END:
+                    self._finish_file(file_ctx, file_batches, on_file_done)
+                    file_batches = []
+        except Exception as e:
+            # 중단 신호로 앞 단계도 멈추고, 앞 단계의 STOP 전달은 _put_stop이 보장
+            self._fail("적재", e)
+
+    def _finish_file(self, file_ctx: dict, file_batches: List[PageBatch], on_file_done: Optional[Callable[[dict], None]]):
+        """파일 하나 적재 완료 처리 - 결과 요약 생성, 부가 출력 저장, 매니페스트 기록"""
+        cats = file_ctx["cats"]
+        result = {
+            "file": file_ctx["file"],
+            "status": "fail" if file_ctx.get("error") else "success",
+            "pages": file_ctx.get("pages", 0),
+            "failed_pages": file_ctx.get("failed_pages", 0),
+            "indexed": file_ctx.get("indexed", 0),
+            "elapsed": time.perf_counter() - file_ctx["start"],
+            }
+        if file_ctx.get("error"):
+            result["error"] = file_ctx["error"]
+        elif self.save_output and file_batches:
+            result["output"] = self.parser._save_documents(
+                PageBatch.concat(file_batches).sorted_by_page(), Path(file_ctx["file"]).name, cats["lv1_cat"], cats["lv2_cat"], cats["lv3_cat"], cats["lv4_cat"]
+                )
+
+        if result["status"] == "success":
+            self.parser.manifest.record(file_ctx["file"], output=result.get("output", ""), pages=result["pages"])
+        if on_file_done is not None:
+            on_file_done(result)
+
+    def run(self, files: List[str], on_file_done: Optional[Callable[[dict], None]] = None) -> dict:
+        """
+        파일 목록을 스트리밍 방식으로 적재합니다.
+
+        Args:
+            files: 처리할 PDF 파일 목록
+            on_file_done: 파일 하나가 적재 완료될 때마다 결과 dict로 호출되는 콜백
+
+        Returns:
+            전체 처리 요약
+        """
+        results = []
+
+        def collect(result: dict):
+            results.append(result)
+            if on_file_done is not None:
+                on_file_done(result)
+
+        self._threads = [
+            threading.Thread(target=self._parse_stage, args=(files,), name="stream-parse", daemon=True),
+            threading.Thread(target=self._embed_stage, name="stream-embed", daemon=True),
+            threading.Thread(target=self._sink_stage, args=(collect,), name="stream-sink", daemon=True),
+            ]
+        for thread in self._threads:
+            thread.start()
+        for thread in self._threads:
+            thread.join()
+        self.parser.manifest.save()
+
+        if self._errors:
+            raise RuntimeError(f"스트리밍 적재 중단: {self._errors[0]}")
+
+        return {
+            "done_files": len(results),
+            "failed_files": sum(1 for r in results if r["status"] == "fail"),
+            "total_pages": sum(r["pages"] for r in results),
+            "indexed": sum(r["indexed"] for r in results),
+            }
@@ -0,0 +1,67 @@
+import re
+from pathlib import Path
+from typing import List
+
+
+# 레이아웃/OCR 모델이 필요한 형식
+PDF_SUFFIXES = {".pdf"}
+
+# 텍스트 기반 형식 - 무거운 PDF 파이프라인 없이 바로 텍스트 추출 (fast lane)
+PLAIN_TEXT_SUFFIXES = {".txt", ".md", ".markdown"}
+DOCLING_SIMPLE_SUFFIXES = {".docx", ".html", ".htm"}
+TEXT_SUFFIXES = PLAIN_TEXT_SUFFIXES | DOCLING_SIMPLE_SUFFIXES
+
+SUPPORTED_SUFFIXES = PDF_SUFFIXES | TEXT_SUFFIXES
+
+# 텍스트 파일 인코딩 후보 (한글 문서는 cp949로 저장된 경우가 많음)
+TEXT_ENCODINGS = ("utf-8-sig", "cp949", "latin-1")
+
+_PARAGRAPH_SPLIT = re.compile(r"\n\s*\n")
+
+
+def is_text_format(file_path: str) -> bool:
+    return Path(file_path).suffix.lower() in TEXT_SUFFIXES
+
+
+def is_supported(file_path: str) -> bool:
+    return Path(file_path).suffix.lower() in SUPPORTED_SUFFIXES
+
+
+def read_text_file(file_path: str) -> str:
+    """인코딩을 순서대로 시도하여 텍스트 파일 읽기"""
+    raw = Path(file_path).read_bytes()
+    for encoding in TEXT_ENCODINGS:
+        try:
+            return raw.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    return raw.decode("utf-8", errors="replace")
+
+
+def split_pseudo_pages(text: str, page_chars: int = 3000) -> List[str]:
+    """
+    페이지 개념이 없는 문서를 문단 경계 기준으로 page_chars 안팎의 가상 페이지로 나눕니다.
+    (문단 하나가 page_chars보다 길면 그 문단은 글자 수 기준으로 자름)
+    """
+    pages, current, current_len = [], [], 0
+    for paragraph in _PARAGRAPH_SPLIT.split(text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+
+        while len(paragraph) > page_chars:
+            if current:
+                pages.append("\n\n".join(current))
+                current, current_len = [], 0
+            pages.append(paragraph[:page_chars])
+            paragraph = paragraph[page_chars:]
+
+        if current and current_len + len(paragraph) > page_chars:
+            pages.append("\n\n".join(current))
+            current, current_len = [], 0
+        current.append(paragraph)
+        current_len += len(paragraph) + 2
+
+    if current:
+        pages.append("\n\n".join(current))
+    return pages or [""]
@@ -0,0 +1,481 @@
+import os
+import json
+import time
+import shutil
+import asyncio
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+
+try:
+    import zstandard
+except ImportError:  # 없으면 압축 전송을 협상하지 않음 (원본 그대로 수신)
+    zstandard = None
+
+from process.manifest import file_sha256
+
+
+# 서버가 받을 수 있는 청크 압축 방식 (클라이언트 선호 순서와 맞춰 협상)
+SUPPORTED_ENCODINGS = ("zstd",) if zstandard is not None else ()
+
+
+def choose_encoding(accepted: Optional[List[str]]) -> Optional[str]:
+    """클라이언트가 보낸 압축 방식 목록 중 서버가 지원하는 첫 번째 (없으면 None = 원본 전송)"""
+    for encoding in accepted or []:
+        if encoding in SUPPORTED_ENCODINGS:
+            return encoding
+    return None
+
+
+# 압축 해제 시 한 번에 넣는 입력 크기 - zstd는 입력 1바이트당 최대 약 32KB(RLE 블록)를 내므로
+# 호출당 해제 출력이 약 8MB를 넘지 않음 (기대 길이 초과는 호출마다 바로 확인)
+ZSTD_INPUT_STEP = 256
+
+
+class ChunkChecksumError(ValueError):
+    """청크 체크섬 불일치 (전송 중 손상 - 클라이언트가 같은 청크를 다시 보내면 되는 유일한 오류)"""
+
+
+class ChunkWriter:
+    """
+    청크 하나를 작은 버퍼 단위로 받아 오프셋 위치에 바로 기록하는 writer
+    (청크 전체를 메모리에 올리지 않고 기록과 동시에 SHA-256 계산)
+
+    encoding="zstd"이면 받은 블록을 스트리밍으로 압축 해제하며 기록 (길이/체크섬은 해제된 원본 기준)
+    - 입력을 ZSTD_INPUT_STEP 단위로 나눠 넣고 기대 길이를 넘으면 바로 중단하므로 압축 폭탄에도 메모리가 늘지 않음
+    - 청크 본문은 zstd 프레임 하나 - 프레임이 끝나지 않았거나(잘린 본문) 프레임 뒤에 데이터가 있으면 거부
+    """
+
+    def __init__(self, data_path: Path, bitmap_path: Path, index: int, offset: int, expected: int,
+                 encoding: Optional[str] = None):
+        if encoding is not None and encoding not in SUPPORTED_ENCODINGS:
+            raise ValueError(f"지원하지 않는 압축 방식입니다: {encoding}")
+        self.bitmap_path = bitmap_path
+        self.index = index
+        self.offset = offset
+        self.expected = expected
+        self.written = 0
+        self.received = 0
+        self._digest = hashlib.sha256()
+        self._decoder = None
+        if encoding == "zstd":
+            self._decoder = zstandard.ZstdDecompressor().decompressobj()
+        self._fd = os.open(data_path, os.O_WRONLY)
+
+    def _write_raw(self, block: bytes) -> int:
+        if self.written + len(block) > self.expected:
+            raise ValueError(f"청크 길이가 기대값({self.expected})을 넘었습니다.")
+        os.pwrite(self._fd, block, self.offset + self.written)
+        self._digest.update(block)
+        self.written += len(block)
+        return len(block)
+
+    def write(self, block: bytes):
+        self.received += len(block)
+        if self._decoder is None:
+            self._write_raw(block)
+            return
+        for start in range(0, len(block), ZSTD_INPUT_STEP):
+            if self._decoder.eof:
+                raise ValueError(f"압축 프레임 뒤에 데이터가 있습니다: offset={self.offset}")
+            try:
+                self._write_raw(self._decoder.decompress(block[start:start + ZSTD_INPUT_STEP]))
+            except zstandard.ZstdError as e:
+                raise ValueError(f"압축 해제 실패: offset={self.offset} - {e}")
+            if self._decoder.unused_data:
+                raise ValueError(f"압축 프레임 뒤에 데이터가 있습니다: offset={self.offset}")
+
+    def _finish_decoder(self):
+        """남은 해제 출력을 기록하고 프레임이 끝까지 왔는지 확인 (잘린 본문 거부)"""
+        try:
+            self._write_raw(self._decoder.flush())
+        except zstandard.ZstdError as e:
+            raise ValueError(f"압축 해제 실패: offset={self.offset} - {e}")
+        if not self._decoder.eof:
+            raise ValueError(f"압축 프레임이 완전하지 않습니다(잘린 본문): offset={self.offset}")
+
+    def commit(self, chunk_sha256: Optional[str] = None) -> dict:
+        """길이/체크섬 확인 후 디스크에 기록하고 비트맵에 수신 표시"""
+        if self._decoder is not None:
+            self._finish_decoder()
+        if self.written != self.expected:
+            raise ValueError(f"청크 길이가 맞지 않습니다: {self.written} (기대값 {self.expected})")
+        digest = self._digest.hexdigest()
+        if chunk_sha256 and digest != chunk_sha256.lower():
+            raise ChunkChecksumError(f"청크 체크섬이 맞지 않습니다: offset={self.offset}")
+
+        os.fsync(self._fd)
+        # 데이터가 디스크에 기록된 뒤에만 수신 표시
+        fd = os.open(self.bitmap_path, os.O_WRONLY)
+        try:
+            os.pwrite(fd, b"\x01", self.index)
+        finally:
+            os.close(fd)
+        return {"chunk_index": self.index, "received_bytes": self.written, "wire_bytes": self.received, "chunk_sha256": digest}
+
+    def close(self):
+        self._decoder = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+class InflightBytesLimiter:
+    """
+    동시에 수신 중인 청크 바이트 합계 상한 (asyncio 전용, 프로세스 단위)
+    상한을 넘으면 요청 본문을 읽기 전에 대기하므로 클라이언트 전송도 TCP 수준에서 멈춥니다.
+    수신 중인 청크가 없으면 상한보다 큰 청크도 받음 (교착 방지)
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.in_flight = 0
+        self._cond = asyncio.Condition()
+
+    @asynccontextmanager
+    async def reserve(self, nbytes: int):
+        async with self._cond:
+            await self._cond.wait_for(
+                lambda: self.max_bytes <= 0 or self.in_flight == 0 or self.in_flight + nbytes <= self.max_bytes
+                )
+            self.in_flight += nbytes
+        try:
+            yield
+        finally:
+            async with self._cond:
+                self.in_flight -= nbytes
+                self._cond.notify_all()
+
+
+class FileHashIndex:
+    """
+    업로드 폴더 파일의 SHA-256 캐시 (경로 → 크기, mtime, 해시)
+
+    - 크기와 mtime이 같으면 저장된 해시를 그대로 사용하여 협상(negotiate) 때마다 파일을 다시 읽지 않음
+    - 해시로 같은 내용의 다른 경로 파일을 찾아 서버 안에서 복사 (폴더 이동/이름 변경 시 재전송 불필요)
+    - SQLite WAL 모드라 여러 uvicorn 워커가 함께 사용 가능
+    """
+
+    def __init__(self, db_path: str):
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS file_hashes (path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, sha256 TEXT)"
+            )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_file_hashes_sha256 ON file_hashes (sha256)")
+        self._conn.commit()
+
+    def _cached(self, path: Path) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT size, mtime_ns, sha256 FROM file_hashes WHERE path = ?", (str(path),)).fetchone()
+        if row is None:
+            return None
+        stat = path.stat()
+        return row[2] if (row[0], row[1]) == (stat.st_size, stat.st_mtime_ns) else None
+
+    def put(self, path: Path, sha256: str):
+        stat = path.stat()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO file_hashes (path, size, mtime_ns, sha256) VALUES (?, ?, ?, ?)",
+                (str(path), stat.st_size, stat.st_mtime_ns, sha256),
+                )
+            self._conn.commit()
+
+    def sha256(self, path: Path) -> str:
+        """캐시된 해시 (없거나 파일이 바뀌었으면 계산 후 저장)"""
+        digest = self._cached(path)
+        if digest is None:
+            digest = file_sha256(str(path))
+            self.put(path, digest)
+        return digest
+
+    def find(self, sha256: str, size: int) -> Optional[Path]:
+        """같은 내용의 현재 파일 경로 (캐시 이후 바뀐 파일은 제외)"""
+        with self._lock:
+            rows = self._conn.execute("SELECT path FROM file_hashes WHERE sha256 = ? AND size = ?", (sha256, size)).fetchall()
+        for (path,) in rows:
+            path = Path(path)
+            if path.exists() and self._cached(path) == sha256:
+                return path
+        return None
+
+
+class UploadSessionStore:
+    """
+    오프셋 기반 이어받기(resumable) 청크 업로드 세션 저장소
+
+    세션 폴더 구성 ({base_dir}/{upload_id}/)
+    - meta.json : 파일명, 저장 경로, 전체 크기, 청크 크기, 전체 SHA-256
+    - data.part : 전체 크기로 미리 할당한 임시 파일 (청크를 오프셋 위치에 직접 기록)
+    - received  : 청크별 수신 여부 비트맵 (청크당 1바이트, 위치 기록이라 동시 요청/여러 uvicorn 워커에서도 안전)
+
+    upload_id는 (저장 경로, 파일명, 크기, SHA-256)으로 정해지므로 클라이언트가 연결이 끊긴 뒤
+    같은 파일로 다시 시작하면 같은 세션을 이어서 받은 청크는 건너뜁니다.
+    완료된 세션은 {base_dir}/{upload_id}.done.json 에 결과를 남겨 완료 요청을 다시 보내도 같은 결과를 반환합니다.
+    """
+
+    META_FILE = "meta.json"
+    DATA_FILE = "data.part"
+    BITMAP_FILE = "received"
+    DONE_SUFFIX = ".done.json"
+
+    def __init__(self, base_dir: str, upload_root: str, ttl_seconds: int = 48 * 3600):
+        """
+        Args:
+            base_dir: 업로드 중인 임시 파일 폴더 (파싱 대상 폴더 바깥)
+            upload_root: 완료된 파일을 옮길 폴더 (./docs/uploaded)
+            ttl_seconds: 이 시간 동안 갱신이 없는 미완료 세션은 정리
+        """
+        self.base_dir = Path(base_dir)
+        self.upload_root = Path(upload_root)
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        self.hashes = FileHashIndex(str(self.base_dir / "file_hashes.sqlite3"))
+
+    @staticmethod
+    def make_upload_id(server_path: str, filename: str, total_size: int, sha256: str) -> str:
+        key = f"{server_path.strip('/')}/{filename}:{total_size}:{sha256.lower()}"
+        return hashlib.sha256(key.encode()).hexdigest()[:32]
+
+    def target_path(self, server_path: str, filename: str) -> Path:
+        """완료 파일 저장 경로 (upload_root 밖으로 나가는 경로는 거부)"""
+        target = (self.upload_root / server_path.strip("/") / Path(filename).name).resolve()
+        if self.upload_root.resolve() not in target.parents:
+            raise ValueError(f"허용되지 않는 저장 경로입니다: {server_path}/{filename}")
+        return target
+
+    def _session_dir(self, upload_id: str) -> Path:
+        if not upload_id.isalnum():
+            raise ValueError(f"잘못된 upload_id 입니다: {upload_id}")
+        return self.base_dir / upload_id
+
+    def _load_meta(self, upload_id: str) -> dict:
+        meta_path = self._session_dir(upload_id) / self.META_FILE
+        if not meta_path.exists():
+            raise KeyError(upload_id)
+        with open(meta_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def create(self, filename: str, server_path: str, total_size: int, chunk_size: int, sha256: str) -> dict:
+        """세션 생성 (같은 파일의 세션이 이미 있으면 그대로 반환)"""
+        if total_size < 0 or chunk_size <= 0:
+            raise ValueError("total_size는 0 이상, chunk_size는 1 이상이어야 합니다.")
+        self.target_path(server_path, filename)
+        upload_id = self.make_upload_id(server_path, filename, total_size, sha256)
+        session_dir = self._session_dir(upload_id)
+
+        with self._lock:
+            if (session_dir / self.META_FILE).exists():
+                meta = self._load_meta(upload_id)
+                if meta["chunk_size"] == chunk_size:
+                    return self.status(upload_id)
+                # 청크 크기가 바뀌면 비트맵을 재사용할 수 없으므로 새로 시작
+                shutil.rmtree(session_dir, ignore_errors=True)
+
+            total_chunks = max(1, -(-total_size // chunk_size))
+            session_dir.mkdir(parents=True, exist_ok=True)
+            with open(session_dir / self.DATA_FILE, "wb") as f:
+                f.truncate(total_size)
+            with open(session_dir / self.BITMAP_FILE, "wb") as f:
+                f.write(bytes(total_chunks))
+            meta = {
+                "upload_id": upload_id,
+                "filename": Path(filename).name,
+                "server_path": server_path.strip("/"),
+                "total_size": total_size,
+                "chunk_size": chunk_size,
+                "total_chunks": total_chunks,
+                "sha256": sha256.lower(),
+                "created_at": time.time(),
+                }
+            tmp_path = session_dir / (self.META_FILE + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(meta, f, ensure_ascii=False)
+            os.replace(tmp_path, session_dir / self.META_FILE)
+        return self.status(upload_id)
+
+    def chunk_range(self, meta: dict, offset: int) -> tuple:
+        """오프셋 검증 후 (청크 번호, 기대 길이) 반환"""
+        if offset < 0 or offset % meta["chunk_size"] or (offset >= meta["total_size"] and meta["total_size"] > 0):
+            raise ValueError(f"청크 경계가 아닌 오프셋입니다: {offset}")
+        index = offset // meta["chunk_size"]
+        return index, min(meta["chunk_size"], meta["total_size"] - offset)
+
+    def open_chunk(self, upload_id: str, offset: int, encoding: Optional[str] = None) -> ChunkWriter:
+        """
+        오프셋 위치에 청크를 기록할 writer 생성 (encoding: 본문 압축 방식, None이면 원본)
+
+        Raises:
+            KeyError: 세션 없음
+            ValueError: 청크 경계가 아닌 오프셋, 지원하지 않는 압축 방식
+        """
+        meta = self._load_meta(upload_id)
+        index, expected = self.chunk_range(meta, offset)
+        session_dir = self._session_dir(upload_id)
+        return ChunkWriter(session_dir / self.DATA_FILE, session_dir / self.BITMAP_FILE, index, offset, expected, encoding)
+
+    def write_chunk(self, upload_id: str, offset: int, data: bytes, chunk_sha256: Optional[str] = None) -> dict:
+        """
+        메모리에 있는 청크를 한 번에 기록 (같은 청크를 다시 보내도 결과 동일)
+
+        Raises:
+            KeyError: 세션 없음
+            ChunkChecksumError: 청크 체크섬 불일치
+            ValueError: 오프셋/길이 불일치
+        """
+        writer = self.open_chunk(upload_id, offset)
+        try:
+            writer.write(data)
+            return {"upload_id": upload_id, **writer.commit(chunk_sha256)}
+        finally:
+            writer.close()
+
+    def _received(self, upload_id: str) -> bytes:
+        with open(self._session_dir(upload_id) / self.BITMAP_FILE, "rb") as f:
+            return f.read()
+
+    def missing_chunks(self, upload_id: str) -> List[int]:
+        return [index for index, flag in enumerate(self._received(upload_id)) if not flag]
+
+    def status(self, upload_id: str) -> dict:
+        meta = self._load_meta(upload_id)
+        missing = self.missing_chunks(upload_id)
+        return {
+            **meta,
+            "received_chunks": meta["total_chunks"] - len(missing),
+            "missing_chunks": missing,
+            "complete": not missing,
+            }
+
+    def _done_path(self, upload_id: str) -> Path:
+        return self._session_dir(upload_id).with_name(upload_id + self.DONE_SUFFIX)
+
+    def _finalized(self, upload_id: str) -> Optional[dict]:
+        """이미 완료 처리된 세션의 결과 (최종 파일이 그 내용 그대로 남아 있을 때만, 아니면 None)"""
+        try:
+            with open(self._done_path(upload_id), "r", encoding="utf-8") as f:
+                result = json.load(f)
+            target = Path(result["saved_path"])
+            if target.stat().st_size == result["total_size"] and self.hashes.sha256(target) == result["sha256"]:
+                return {k: result[k] for k in ("upload_id", "saved_path", "filename", "sha256")}
+        except (OSError, ValueError, KeyError):
+            pass
+        return None
+
+    def finalize(self, upload_id: str) -> dict:
+        """
+        모든 청크 수신 확인 후 전체 SHA-256 검증, 최종 경로로 이동
+        이미 완료된 세션이면 (동시에 들어온 완료 요청, 응답을 못 받은 클라이언트의 재요청) 같은 결과를 반환
+
+        Raises:
+            KeyError: 세션 없음
+            ValueError: 누락 청크 존재 또는 체크섬 불일치 (불일치 시 비트맵을 초기화하여 전체 재전송 요청)
+        """
+        try:
+            return self._finalize(upload_id)
+        except (KeyError, FileNotFoundError):
+            # 다른 요청이 먼저 파일을 옮기고 세션 폴더를 지운 경우
+            result = self._finalized(upload_id)
+            if result is None:
+                raise KeyError(upload_id)
+            return result
+
+    def _finalize(self, upload_id: str) -> dict:
+        meta = self._load_meta(upload_id)
+        missing = self.missing_chunks(upload_id)
+        if missing:
+            raise ValueError(f"누락된 청크 {len(missing)}개: {missing[:20]}")
+
+        session_dir = self._session_dir(upload_id)
+        data_path = session_dir / self.DATA_FILE
+        digest = file_sha256(str(data_path))
+        if digest != meta["sha256"]:
+            with open(session_dir / self.BITMAP_FILE, "wb") as f:
+                f.write(bytes(meta["total_chunks"]))
+            raise ValueError(f"파일 체크섬이 맞지 않습니다: {digest} (기대값 {meta['sha256']})")
+
+        target = self.target_path(meta["server_path"], meta["filename"])
+        target.parent.mkdir(parents=True, exist_ok=True)
+        result = {"upload_id": upload_id, "saved_path": str(target), "filename": meta["filename"], "sha256": digest}
+        # 완료 기록을 이동보다 먼저 남겨, 이동 직후 들어온 요청도 완료 결과를 찾을 수 있도록 함
+        done_path = self._done_path(upload_id)
+        tmp_path = done_path.with_name(done_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({**result, "total_size": meta["total_size"]}, f, ensure_ascii=False)
+        os.replace(tmp_path, done_path)
+
+        shutil.move(str(data_path), str(target))
+        shutil.rmtree(session_dir, ignore_errors=True)
+        self.hashes.put(target, digest)
+        return result
+
+    def negotiate(self, files: List[dict], chunk_size: int) -> List[dict]:
+        """
+        업로드 전 협상 - 클라이언트 파일 목록(server_path, filename, size, sha256)과 서버 상태 비교
+
+        Returns:
+            파일별 {"server_path", "filename", "status", ...}
+            - present: 같은 경로에 같은 내용이 이미 있음 (전송 불필요)
+            - copied: 다른 경로의 같은 내용 파일을 서버에서 복사함 (전송 불필요)
+            - upload: 전송 필요 - upload_id와 누락 청크(missing_chunks) 포함 (이전에 받던 세션이면 남은 청크만)
+            - error: 잘못된 경로 등
+
+        청크 단위 비교는 진행 중인 세션에만 적용 - 같은 경로에 내용이 다른 이전 버전 파일이 있어도
+        청크별로 대조하지 않고 파일 전체를 새로 받습니다.
+        """
+        results = []
+        for item in files:
+            entry = {"server_path": item["server_path"], "filename": item["filename"]}
+            try:
+                target = self.target_path(item["server_path"], item["filename"])
+                sha256 = item["sha256"].lower()
+
+                if target.exists() and target.stat().st_size == item["size"] and self.hashes.sha256(target) == sha256:
+                    entry["status"] = "present"
+                else:
+                    source = self.hashes.find(sha256, item["size"])
+                    if source is not None and source != target:
+                        target.parent.mkdir(parents=True, exist_ok=True)
+                        shutil.copy2(source, target)
+                        self.hashes.put(target, sha256)
+                        entry.update(status="copied", source=str(source))
+                    else:
+                        session = self.create(item["filename"], item["server_path"], item["size"], chunk_size, sha256)
+                        entry.update(
+                            status="upload",
+                            upload_id=session["upload_id"],
+                            chunk_size=session["chunk_size"],
+                            total_chunks=session["total_chunks"],
+                            missing_chunks=session["missing_chunks"],
+                            )
+            except (ValueError, OSError) as e:
+                entry.update(status="error", error=str(e))
+            results.append(entry)
+        return results
+
+    def abort(self, upload_id: str):
+        shutil.rmtree(self._session_dir(upload_id), ignore_errors=True)
+
+    def cleanup_expired(self) -> int:
+        """ttl_seconds 동안 갱신이 없는 미완료 세션과 오래된 완료 기록 삭제"""
+        removed = 0
+        now = time.time()
+        for session_dir in self.base_dir.iterdir():
+            if session_dir.name.endswith(self.DONE_SUFFIX):
+                if now - session_dir.stat().st_mtime > self.ttl_seconds:
+                    session_dir.unlink(missing_ok=True)
+                continue
+            if not session_dir.is_dir():
+                continue
+            mtimes = [p.stat().st_mtime for p in session_dir.iterdir()] or [session_dir.stat().st_mtime]
+            if now - max(mtimes) > self.ttl_seconds:
+                shutil.rmtree(session_dir, ignore_errors=True)
+                removed += 1
+        return removed
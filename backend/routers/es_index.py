@@ -4,10 +4,30 @@ from langchain_ollama import OllamaEmbeddings
 from elasticsearch import Elasticsearch
 from typing import Optional, List
 from process.elasticsearch_index import ElasticsearchIndexer
+from process.embedding_cache import EmbeddingCache
+
+from utils.config import get_config
+config = get_config()
 
 es_api = APIRouter()
 es = Elasticsearch("http://localhost:9200")
 embed_model = OllamaEmbeddings(base_url="http://localhost:11434", model="bge-m3:latest")
+embed_cache = EmbeddingCache(config.EMBED_CACHE_PATH, embed_model.model, config.EMBED_CACHE_MAX_ENTRIES) if config.EMBED_CACHE_PATH else None
+
+
+def get_query_embedding(query_text: str) -> list:
+    """검색어 임베딩 - 캐시에 있으면 Ollama 호출 없이 재사용"""
+    if embed_cache is None:
+        return embed_model.embed_query(query_text)
+
+    content_hash = EmbeddingCache.hash_text(query_text)
+    cached = embed_cache.get(content_hash)
+    if cached is not None:
+        return cached
+
+    query_embedding = embed_model.embed_query(query_text)
+    embed_cache.put(content_hash, query_embedding)
+    return query_embedding
 
 
 # --- 공통: 요청마다 동적으로 Indexer 생성 ---
@@ -102,7 +122,7 @@ async def search_documents_endpoint(request: SearchRequest):
             detail="query_text는 필수입니다."
             )
 
-    query_embedding = embed_model.embed_query(query_text)
+    query_embedding = get_query_embedding(query_text)
 
     if len(query_embedding) != 1024:
         raise HTTPException(
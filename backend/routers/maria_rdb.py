@@ -104,6 +104,9 @@ async def insert_from_pickle(
             if file_path.endswith(".pkl"):
                 pg_pipe.insert_data_from_pickle(table_name, file_path)
                 inserted_files.append(file_path)
+            elif file_path.endswith(".parquet"):
+                pg_pipe.insert_data_from_parquet(table_name, file_path)
+                inserted_files.append(file_path)
 
         if not inserted_files:
             return {"message": "Pickle 파일을 찾지 못했습니다."}
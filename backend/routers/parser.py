@@ -4,6 +4,12 @@ from fastapi import APIRouter, HTTPException, UploadFile, File, Form, HTTPExcept
 from fastapi.responses import JSONResponse
 from typing import Optional
 from process.parsing import DoclingParser
+from process.jobs import create_job_manager
+from process.streaming import StreamingIngestor
+from process.repair import PageRepairer
+from process.postgres import PostgresPipeline
+from process.elasticsearch_index import ElasticsearchIndexer
+from process.scheduler import parse_priorities
 
 from utils.config import get_config
 from utils.setlogger import setup_logger
@@ -12,9 +18,33 @@ logger = setup_logger(f"{__name__}", level=config.LOG_LEVEL)
 
 
 # DoclingParser 인스턴스 생성
-parser = DoclingParser(output_base_path="./docs/parsed")
+parser = DoclingParser(
+    output_base_path="./docs/parsed",
+    num_workers=config.PARSER_WORKERS,
+    embed_batch_size=config.EMBED_BATCH_SIZE,
+    embed_cache_path=config.EMBED_CACHE_PATH or None,
+    embed_cache_max_entries=config.EMBED_CACHE_MAX_ENTRIES,
+    ocr_mode=config.OCR_MODE,
+    ocr_min_text_chars=config.OCR_MIN_TEXT_CHARS,
+    shard_pages=config.SHARD_PAGES,
+    shard_workers=config.SHARD_WORKERS,
+    output_format=config.OUTPUT_FORMAT,
+    checkpoint=config.PARSE_CHECKPOINT,
+    text_page_chars=config.TEXT_PAGE_CHARS,
+    dedup_mode=config.DEDUP_MODE,
+    dedup_index_path=config.DEDUP_INDEX_PATH or None,
+    dedup_max_distance=config.DEDUP_MAX_DISTANCE,
+    dedup_min_chars=config.DEDUP_MIN_CHARS,
+    cost_model_path=config.COST_MODEL_PATH or None,
+    schedule_policy=config.SCHEDULE_POLICY,
+    project_priorities=parse_priorities(config.SCHEDULE_PROJECT_PRIORITY),
+    worker_max_tasks=config.WORKER_MAX_TASKS,
+    )
 parser_api = APIRouter()
 
+# 백그라운드 작업 관리자 (JOB_BACKEND=memory|redis)
+job_manager = create_job_manager()
+
 @parser_api.post("/parse_pdf_by_path", tags=["Parser"])
 async def parse_pdf_by_path(
     pdf_path: str = Form(...),
@@ -52,19 +82,24 @@ async def parse_pdf_by_path(
 
 
 @parser_api.post("/batch_parse_by_folder", tags=["Parser"])
-async def batch_parse_by_folder(
+def batch_parse_by_folder(
     folder_path: str = Form(...),
-    remove_original: bool = Form(False)
+    remove_original: bool = Form(False),
+    incremental: bool = Form(False)
     ):
     """
-    이미 저장된 폴더 내 PDF를 모두 배치 처리
+    이미 저장된 폴더 내 PDF를 모두 배치 처리 (처리 완료까지 응답 대기)
+    - 기본은 기존과 같이 폴더 전체를 다시 파싱
+    - incremental=True 이면 매니페스트 기준 신규/변경 파일(파싱 설정이 바뀐 파일 포함)만 파싱
+    - 대용량 폴더는 /jobs/batch_parse 사용 권장
     """
     folder = Path(folder_path)
     if not folder.exists() or not folder.is_dir():
         raise HTTPException(status_code=400, detail=f"폴더를 찾을 수 없습니다: {folder_path}")
 
     try:
-        all_docs = parser.batch_parse_pdfs(folder_path=str(folder), remove_original=remove_original)
+        all_docs, report = parser.batch_parse_pdfs(folder_path=str(folder), remove_original=remove_original,
+                                                   incremental=incremental, return_report=True)
         result = []
         for doc_list in all_docs:
             docs = []
@@ -80,7 +115,304 @@ async def batch_parse_by_folder(
                 })
             result.append(docs)
 
+        if report["diff"] and report["diff"]["deleted"]:
+            logger.warning(f"업로드 폴더에서 삭제된 파일 {len(report['diff']['deleted'])}건: {report['diff']['deleted']}")
+
+        failed = [r for r in report["results"] if r["status"] == "fail"]
+        if failed:
+            logger.warning(f"배치 파싱 실패 파일 {len(failed)}건: {[r['file'] for r in failed]}")
+
         return result
 
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@parser_api.get("/embed_cache/stats", tags=["Parser"])
+def embed_cache_stats():
+    """
+    임베딩 캐시 hit/miss 통계 조회 (현재 서버 프로세스 기준)
+    """
+    if parser.embed_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **parser.embed_cache.stats()}
+
+
+@parser_api.get("/dedup/stats", tags=["Parser"])
+def dedup_stats():
+    """
+    유사 중복 페이지 검사 수/중복 수/중복 비율 조회 (현재 서버 프로세스 기준)
+    """
+    if parser.near_dup is None:
+        return {"enabled": False}
+    return {"enabled": True, "mode": parser.dedup_mode, **parser.near_dup.stats()}
+
+
+@parser_api.post("/preflight", tags=["Parser"])
+def preflight(
+    folder_path: str = Form(...),
+    num_workers: Optional[int] = Form(None),
+    incremental: bool = Form(True),
+    ):
+    """
+    파싱 없이 폴더 내 파일별 예상 소요 시간과 배치 ETA 계산 (매니페스트 변경 없음)
+    - 페이지 수, 텍스트 레이어 비율, 이미지 밀도, 파일 크기로 추정하며 계수는 이전 실행 기록으로 학습
+    """
+    folder = Path(folder_path)
+    if not folder.exists() or not folder.is_dir():
+        raise HTTPException(status_code=400, detail=f"폴더를 찾을 수 없습니다: {folder_path}")
+
+    files, diff = parser.plan_batch_files(str(folder), incremental=incremental, dry_run=True)
+    workers = num_workers or max(config.PARSER_WORKERS, config.JOB_WORKERS)
+    plan = parser.preflight(files, workers)
+    for estimate in plan["files"]:
+        estimate.pop("features")
+    return {**plan, "diff": diff}
+
+
+@parser_api.get("/preflight/model", tags=["Parser"])
+def preflight_model():
+    """
+    비용 모델 학습 기록 수와 현재 계수 조회
+    """
+    return parser.cost_model.stats()
+
+
+@parser_api.get("/memory/stats", tags=["Parser"])
+def memory_stats():
+    """
+    변환 메모리 예산/예약량/현재 RSS(서버 + 워커 프로세스) 및 대기 횟수 조회
+    """
+    if parser.memory_budget is None:
+        return {"enabled": False}
+    return {"enabled": parser.memory_budget.enabled, **parser.memory_budget.stats()}
+
+
+@parser_api.get("/embed_rate/stats", tags=["Parser"])
+def embed_rate_stats():
+    """
+    임베딩 레이트 리미터 현재 속도/지연 통계 조회 (현재 서버 프로세스 기준)
+    """
+    return parser.rate_limiter.stats()
+
+
+
+# -----------------------------
+# 💠 백그라운드 배치 파싱 작업
+# -----------------------------
+def _run_batch_parse_job(job_id: str, folder_path: str, remove_original: bool, num_workers: int, incremental: bool,
+                         defer_over_seconds: Optional[float] = None) -> dict:
+    """배치 파싱 작업 실행 - 파일별 결과를 완료되는 대로 작업 상태에 기록"""
+    files, diff = parser.plan_batch_files(folder_path, incremental=incremental)
+    plan = parser.preflight(files, num_workers)
+
+    # 예상 시간이 기준을 넘는 파일은 이번 작업에서 제외 (별도 작업으로 나누어 처리)
+    deferred = []
+    if defer_over_seconds:
+        deferred = [e for e in plan["files"] if e["estimated_seconds"] > defer_over_seconds]
+        if deferred:
+            deferred_files = {e["file"] for e in deferred}
+            files = [f for f in files if str(f) not in deferred_files]
+            plan = parser.preflight(files, num_workers)
+            logger.info(f"[{job_id}] 예상 시간 {defer_over_seconds}초 초과 파일 {len(deferred)}건 보류")
+
+    job_manager.register_files(job_id, files)
+    job_manager.update(job_id, estimated_seconds=plan["eta_seconds"])
+
+    done_files, failed_files, total_pages, duplicate_pages = 0, 0, 0, 0
+    for file_result in parser.iter_batch_results(folder_path, num_workers=num_workers, files=files, plan=plan):
+        done_files += 1
+        if file_result["status"] == "success":
+            total_pages += file_result["pages"]
+            duplicate_pages += file_result.get("duplicate_pages", 0)
+        else:
+            failed_files += 1
+            logger.warning(f"[{job_id}] 파싱 실패: {file_result['file']} - {file_result.get('error')}")
+        job_manager.record_file(job_id, file_result, done_files=done_files, failed_files=failed_files)
+
+    if remove_original:
+        if deferred:
+            logger.warning(f"[{job_id}] 보류된 파일이 있어 원본 폴더를 삭제하지 않습니다.")
+        else:
+            parser._clear_folder(folder_path=folder_path)
+
+    # diff: 증분 처리 시 신규/변경/변경없음 개수와 삭제된 파일 목록 (하위 DB/인덱스 정리용)
+    # skip 모드에서는 중복 페이지가 결과(pages)에서 빠지므로 분모에 다시 더함
+    checked_pages = total_pages + (duplicate_pages if parser.dedup_mode == "skip" else 0)
+    dedup_ratio = round(duplicate_pages / checked_pages, 4) if checked_pages else 0.0
+    return {"done_files": done_files, "failed_files": failed_files, "total_pages": total_pages,
+            "duplicate_pages": duplicate_pages, "dedup_ratio": dedup_ratio, "estimated_seconds": plan["eta_seconds"],
+            "deferred": [{"file": e["file"], "estimated_seconds": e["estimated_seconds"]} for e in deferred], "diff": diff}
+
+
+@parser_api.post("/jobs/batch_parse", tags=["Parser"])
+def submit_batch_parse_job(
+    folder_path: str = Form(...),
+    remove_original: bool = Form(False),
+    num_workers: Optional[int] = Form(None),
+    incremental: bool = Form(True),
+    defer_over_seconds: Optional[float] = Form(None),
+    priority: int = Form(0),
+    ):
+    """
+    폴더 배치 파싱을 백그라운드 작업으로 등록하고 job_id를 즉시 반환
+    - 진행 상황과 예상 완료 시간(estimated_seconds)은 /jobs/{job_id} 로 조회
+    - defer_over_seconds 지정 시 예상 시간이 이를 넘는 파일은 처리하지 않고 결과의 deferred 목록으로 보고
+    - priority가 높은 작업은 대기 중인 다른 작업보다 먼저 시작 (폴더 내 파일 순서는 SCHEDULE_POLICY)
+    """
+    folder = Path(folder_path)
+    if not folder.exists() or not folder.is_dir():
+        raise HTTPException(status_code=400, detail=f"폴더를 찾을 수 없습니다: {folder_path}")
+
+    workers = num_workers or max(config.PARSER_WORKERS, config.JOB_WORKERS)
+    job_id = job_manager.submit(
+        job_type="batch_parse",
+        params={"folder_path": str(folder), "remove_original": remove_original, "num_workers": workers,
+                "incremental": incremental, "defer_over_seconds": defer_over_seconds},
+        runner=lambda job_id: _run_batch_parse_job(job_id, str(folder), remove_original, workers, incremental, defer_over_seconds),
+        priority=priority,
+        )
+    return {"job_id": job_id, "status": "queued"}
+
+
+# -----------------------------
+# 💠 스트리밍 적재 작업 (파싱 → Postgres/ES 바로 적재)
+# -----------------------------
+def _run_stream_ingest_job(job_id: str, folder_path: str, table_name: str, index_name: Optional[str],
+                           save_output: bool, incremental: bool) -> dict:
+    """스트리밍 적재 작업 실행 - 파일이 DB/인덱스에 적재될 때마다 작업 상태에 기록"""
+    files, diff = parser.plan_batch_files(folder_path, incremental=incremental)
+    # 스트리밍 적재도 스케줄 정책 순서대로 (작은 파일이 먼저 검색 가능해지도록)
+    plan = parser.preflight(files, num_workers=1)
+    files = [estimate["file"] for estimate in plan["files"]]
+    job_manager.register_files(job_id, files)
+    job_manager.update(job_id, estimated_seconds=plan["eta_seconds"])
+
+    es_indexer = ElasticsearchIndexer(index_name=index_name) if index_name else None
+    ingestor = StreamingIngestor(
+        parser,
+        PostgresPipeline(),
+        table_name=table_name,
+        es_indexer=es_indexer,
+        queue_size=config.STREAM_QUEUE_SIZE,
+        save_output=save_output,
+        )
+
+    progress = {"done": 0, "failed": 0}
+    def on_file_done(file_result: dict):
+        progress["done"] += 1
+        if file_result["status"] != "success":
+            progress["failed"] += 1
+            logger.warning(f"[{job_id}] 적재 실패: {file_result['file']} - {file_result.get('error')}")
+        job_manager.record_file(job_id, file_result, done_files=progress["done"], failed_files=progress["failed"])
+
+    result = ingestor.run(files, on_file_done=on_file_done)
+    return {**result, "diff": diff}
+
+
+@parser_api.post("/jobs/stream_ingest", tags=["Parser"])
+def submit_stream_ingest_job(
+    folder_path: str = Form(...),
+    table_name: str = Form(...),
+    index_name: Optional[str] = Form(None),
+    save_output: bool = Form(False),
+    incremental: bool = Form(True),
+    priority: int = Form(0),
+    ):
+    """
+    폴더 PDF를 파싱하면서 페이지 배치 단위로 Postgres(upsert)와 Elasticsearch에 바로 적재
+    - 중간 파일(.pkl/.parquet)은 save_output=True 일 때만 저장
+    - 진행 상황은 /jobs/{job_id} 로 조회
+    """
+    folder = Path(folder_path)
+    if not folder.exists() or not folder.is_dir():
+        raise HTTPException(status_code=400, detail=f"폴더를 찾을 수 없습니다: {folder_path}")
+
+    job_id = job_manager.submit(
+        job_type="stream_ingest",
+        params={"folder_path": str(folder), "table_name": table_name, "index_name": index_name,
+                "save_output": save_output, "incremental": incremental},
+        runner=lambda job_id: _run_stream_ingest_job(job_id, str(folder), table_name, index_name, save_output, incremental),
+        priority=priority,
+        )
+    return {"job_id": job_id, "status": "queued"}
+
+
+@parser_api.get("/jobs", tags=["Parser"])
+def list_jobs():
+    """
+    전체 작업 목록 (파일별 상세 제외)
+    """
+    return {"jobs": job_manager.list()}
+
+
+@parser_api.get("/jobs/{job_id}", tags=["Parser"])
+def get_job(job_id: str, with_files: bool = True):
+    """
+    작업 상태 및 파일별 진행 상황/결과 조회
+    """
+    job = job_manager.get(job_id, with_files=with_files)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"작업을 찾을 수 없습니다: {job_id}")
+    return job
+
+
+# -----------------------------
+# 💠 실패 페이지 복구 작업
+# -----------------------------
+def _run_repair_outputs_job(job_id: str, folder_path: Optional[str]) -> dict:
+    """파싱 결과 파일의 실패 페이지 복구 - 파일별 결과를 작업 상태에 기록"""
+    repairer = PageRepairer(parser, attempts=config.REPAIR_ATTEMPTS, base_delay=config.REPAIR_BASE_DELAY)
+    files = repairer.list_output_files(folder_path)
+    job_manager.register_files(job_id, files)
+
+    done_files, failed_files, failed_pages, repaired_pages = 0, 0, 0, 0
+    for file_result in repairer.iter_repair_outputs(folder_path):
+        done_files += 1
+        failed_pages += file_result["failed_pages"]
+        repaired_pages += file_result["repaired_pages"]
+        if file_result["status"] != "success":
+            failed_files += 1
+        job_manager.record_file(job_id, file_result, done_files=done_files, failed_files=failed_files)
+
+    return {"done_files": done_files, "failed_pages": failed_pages, "repaired_pages": repaired_pages}
+
+
+@parser_api.post("/jobs/repair_outputs", tags=["Parser"])
+def submit_repair_outputs_job(folder_path: Optional[str] = Form(None)):
+    """
+    파싱 결과 파일(.pkl/.parquet)에서 status "fail" 또는 빈 임베딩 페이지만 다시 처리하여 덮어쓰기
+    - folder_path 미지정 시 파싱 결과 폴더 전체
+    """
+    if folder_path and not Path(folder_path).is_dir():
+        raise HTTPException(status_code=400, detail=f"폴더를 찾을 수 없습니다: {folder_path}")
+
+    job_id = job_manager.submit(
+        job_type="repair_outputs",
+        params={"folder_path": folder_path},
+        runner=lambda job_id: _run_repair_outputs_job(job_id, folder_path),
+        )
+    return {"job_id": job_id, "status": "queued"}
+
+
+@parser_api.post("/jobs/repair_table", tags=["Parser"])
+def submit_repair_table_job(
+    table_name: str = Form(...),
+    index_name: Optional[str] = Form(None),
+    limit: Optional[int] = Form(None),
+    ):
+    """
+    RDB 테이블에서 임베딩이 비어 있는 행만 다시 처리하여 같은 id의 행에 덮어쓰기
+    - index_name 지정 시 복구된 페이지를 Elasticsearch에 다시 색인
+    """
+    def run(job_id: str) -> dict:
+        repairer = PageRepairer(parser, attempts=config.REPAIR_ATTEMPTS, base_delay=config.REPAIR_BASE_DELAY)
+        es_indexer = ElasticsearchIndexer(index_name=index_name) if index_name else None
+        return repairer.repair_table(PostgresPipeline(), table_name, es_indexer=es_indexer, limit=limit)
+
+    job_id = job_manager.submit(
+        job_type="repair_table",
+        params={"table_name": table_name, "index_name": index_name, "limit": limit},
+        runner=run,
+        )
+    return {"job_id": job_id, "status": "queued"}
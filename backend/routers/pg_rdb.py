@@ -98,7 +98,7 @@ async def insert_from_pickle(
     pickle_path: str = Form(...)
     ):
     """
-    서버 내 pickle 파일 경로를 받아 데이터를 DB에 insert
+    서버 내 pickle(.pkl) / parquet(.parquet) 파일 경로를 받아 데이터를 DB에 insert
     """
     try:
         # 실제 삽입 처리
@@ -107,6 +107,8 @@ async def insert_from_pickle(
             pickle_path = pickle_path.replace("\\", "/")
             if pickle_path.endswith(".pkl"):
                 pg.insert_data_from_pickle(table_name, pickle_path)     
+            elif pickle_path.endswith(".parquet"):
+                pg.insert_data_from_parquet(table_name, pickle_path)
 
         return {"message": f"Data inserted successfully from {pickle_path}"}
 
@@ -1,7 +1,13 @@
 import os
 import shutil
 import aiofiles
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form, HTTPException
+from typing import List, Optional
+from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, HTTPException, Request, Header
+from fastapi.concurrency import run_in_threadpool
+from process.upload_sessions import (
+    UploadSessionStore, InflightBytesLimiter, ChunkChecksumError, SUPPORTED_ENCODINGS, choose_encoding,
+    )
 
 from utils.config import get_config
 from utils.setlogger import setup_logger
@@ -10,6 +16,16 @@ logger = setup_logger(f"{__name__}", level=config.LOG_LEVEL)
 
 upload_api = APIRouter()
 
+# 이어받기 청크 업로드 세션 (임시 파일은 파싱 대상 폴더 바깥에 보관)
+upload_sessions = UploadSessionStore(
+    base_dir=config.UPLOAD_TMP_DIR,
+    upload_root="./docs/uploaded",
+    ttl_seconds=int(config.UPLOAD_SESSION_TTL_HOURS * 3600),
+    )
+
+# 동시에 수신 중인 청크 바이트 상한 (청크 크기/동시 요청 수와 무관하게 메모리 사용량 유지, /uploads 세션 API 전용)
+inflight_limiter = InflightBytesLimiter(config.UPLOAD_MAX_INFLIGHT_BYTES)
+
 @upload_api.post("/upload", tags=["Upload"])
 async def upload(file: UploadFile = File(...), local_path: str = Form(...), server_path: str = Form(...)):
     """
@@ -54,7 +70,8 @@ async def upload_chunk(
     청크 단위 파일 업로드 API
     
     대용량 파일을 청크(chunk)로 분할하여 순차적으로 업로드합니다.
-    각 청크는 서버에서 임시 저장되며, 모든 청크 업로드 완료 시 최종 파일이 생성됩니다.
+    첫 청크에서 파일을 새로 만들고 이후 청크는 순서대로 이어 붙입니다.
+    (병렬 전송/이어받기가 필요하면 /uploads 세션 API 사용)
     
     Args:
         file (UploadFile): 업로드할 파일 청크 데이터
@@ -73,10 +90,12 @@ async def upload_chunk(
         HTTPException: 파일 저장 중 오류 발생 시 422 에러 반환
     
     Notes:
-        - 각 청크는 append 모드로 저장되어 최종 파일을 구성합니다
-        - chunk_index는 0-based 인덱스입니다 (0, 1, 2, ...)
+        - 첫 청크(chunk_index 0)는 새 파일로, 이후 청크는 append 모드로 저장되어 최종 파일을 구성합니다
+        - chunk_index는 0-based 인덱스입니다 (0, 1, 2, ...) - 반드시 순서대로 전송
         - 마지막 청크 업로드 시 완료 메시지와 함께 저장 경로 정보를 반환합니다
         - 중간 청크 업로드 시 진행 상태 메시지만 반환합니다
+        - multipart 본문은 이 함수가 실행되기 전에 임시 파일로 모두 받아지므로 스트리밍 수신/수신 바이트 상한은
+          적용되지 않습니다 (임시 파일에서 최종 파일로 복사할 때만 작은 버퍼 사용) - 스트리밍 수신은 /uploads 세션 API만 지원
     """
     try:
         # 최종 저장될 파일 경로
@@ -84,10 +103,10 @@ async def upload_chunk(
         folder = f"./docs/uploaded/{server_path}"
         os.makedirs(folder, exist_ok=True)
         save_path = f"{folder}/{filename}"
-        # 각 chunk를 append 형식으로 저장
-        async with aiofiles.open(save_path, "wb") as f:
-            content = await file.read()
-            await f.write(content)
+        # 첫 chunk는 새로 쓰고 이후 chunk는 append 형식으로 저장 (임시 파일에서 작은 버퍼 단위로 복사)
+        async with aiofiles.open(save_path, "wb" if chunk_index == 0 else "ab") as f:
+            while block := await file.read(config.UPLOAD_BUFFER_SIZE):
+                await f.write(block)
 
         # 마지막 chunk라면 로그 출력
         if chunk_index + 1 == total_chunks:
@@ -102,4 +121,164 @@ async def upload_chunk(
 
     except Exception as e:
         logger.error(f"업로드 실패: {str(e)}")
-        raise HTTPException(status_code=422, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+# -----------------------------
+# 💠 이어받기(resumable) 청크 업로드
+# -----------------------------
+@upload_api.post("/uploads", tags=["Upload"])
+async def create_upload_session(
+    filename: str = Form(...),
+    server_path: str = Form(...),
+    total_size: int = Form(...),
+    chunk_size: int = Form(...),
+    sha256: str = Form(...),
+    encodings: str = Form(""),
+    ):
+    """
+    청크 업로드 세션 생성 또는 기존 세션 조회
+
+    같은 파일(저장 경로, 파일명, 크기, SHA-256)로 다시 요청하면 같은 upload_id와 함께
+    아직 받지 못한 청크 번호(missing_chunks)를 반환하므로 클라이언트는 그 청크만 보내면 됩니다.
+    encodings(쉼표 구분, 예: "zstd")를 보내면 서버가 받을 수 있는 청크 압축 방식을 encoding으로 알려줍니다.
+
+    Returns:
+        dict: upload_id, total_chunks, chunk_size, missing_chunks, complete, encoding 등 세션 상태
+    """
+    try:
+        await run_in_threadpool(upload_sessions.cleanup_expired)
+        session = await run_in_threadpool(upload_sessions.create, filename, server_path, total_size, chunk_size, sha256)
+        return {**session, "encoding": choose_encoding([e.strip() for e in encodings.split(",") if e.strip()])}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+class UploadManifestItem(BaseModel):
+    server_path: str
+    filename: str
+    size: int
+    sha256: str
+
+
+class NegotiateRequest(BaseModel):
+    chunk_size: int
+    files: List[UploadManifestItem]
+    encodings: List[str] = []   # 클라이언트가 보낼 수 있는 청크 압축 방식 (선호 순서)
+
+
+@upload_api.post("/uploads/negotiate", tags=["Upload"])
+async def negotiate_uploads(data: NegotiateRequest):
+    """
+    업로드 전 협상 - 클라이언트가 보낸 파일 목록(저장 경로, 파일명, 크기, SHA-256)과 서버 파일 비교
+
+    Returns:
+        dict:
+            - files: 파일별 status
+                present(이미 있음) / copied(서버 내 같은 내용 파일 복사) / upload(upload_id, missing_chunks 포함) / error
+            - transfer_files: 전송이 필요한 파일 수
+            - transfer_chunks: 전송이 필요한 청크 수
+            - encoding: 청크 압축 방식 (클라이언트와 서버가 모두 지원하는 것, 없으면 None)
+    """
+    await run_in_threadpool(upload_sessions.cleanup_expired)
+    files = await run_in_threadpool(upload_sessions.negotiate, [item.model_dump() for item in data.files], data.chunk_size)
+    uploads = [f for f in files if f["status"] == "upload"]
+    logger.info(f"업로드 협상 - 파일 {len(files)}건 중 전송 필요 {len(uploads)}건")
+    return {
+        "files": files,
+        "transfer_files": len(uploads),
+        "transfer_chunks": sum(len(f["missing_chunks"]) for f in uploads),
+        "encoding": choose_encoding(data.encodings),
+        }
+
+
+@upload_api.get("/uploads/{upload_id}", tags=["Upload"])
+async def get_upload_session(upload_id: str):
+    """
+    업로드 세션 상태 (받은 청크 수, 누락 청크 번호)
+    """
+    try:
+        return await run_in_threadpool(upload_sessions.status, upload_id)
+    except (KeyError, ValueError):
+        raise HTTPException(status_code=404, detail=f"업로드 세션을 찾을 수 없습니다: {upload_id}")
+
+
+@upload_api.put("/uploads/{upload_id}/chunks", tags=["Upload"])
+async def upload_session_chunk(
+    upload_id: str,
+    request: Request,
+    offset: int,
+    chunk_sha256: Optional[str] = Header(None, alias="X-Chunk-SHA256"),
+    content_encoding: Optional[str] = Header(None, alias="Content-Encoding"),
+    ):
+    """
+    요청 본문(application/octet-stream)을 파일 내 바이트 오프셋 위치에 기록
+
+    - offset(쿼리)은 chunk_size의 배수, 본문 길이는 chunk_size(마지막 청크는 남은 크기)와 같아야 함
+    - 본문은 UPLOAD_BUFFER_SIZE 단위로 바로 디스크에 쓰며 SHA-256도 함께 계산 (청크 전체를 메모리에 올리지 않음)
+    - X-Chunk-SHA256 헤더를 보내면 청크 내용 검증 - 불일치면 409 {"code": "chunk_checksum_mismatch"} (전송 중 손상, 재전송 가능)
+    - 오프셋/길이/압축 오류 등 다시 보내도 결과가 같은 요청은 422
+    - Content-Encoding: zstd 이면 받으면서 압축 해제 (길이/체크섬은 해제된 원본 기준, 청크마다 압축 여부 선택 가능)
+    - 청크 순서와 무관하게 동시에 보내도 되고, 같은 청크를 다시 보내도 결과는 같음
+    """
+    encoding = None if content_encoding in (None, "", "identity") else content_encoding.strip().lower()
+    if encoding is not None and encoding not in SUPPORTED_ENCODINGS:
+        raise HTTPException(status_code=415, detail=f"지원하지 않는 압축 방식입니다: {content_encoding}")
+
+    try:
+        writer = await run_in_threadpool(upload_sessions.open_chunk, upload_id, offset, encoding)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"업로드 세션을 찾을 수 없습니다: {upload_id}")
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    try:
+        async with inflight_limiter.reserve(writer.expected):
+            buffer = bytearray()
+            async for block in request.stream():
+                buffer += block
+                if len(buffer) >= config.UPLOAD_BUFFER_SIZE:
+                    await run_in_threadpool(writer.write, bytes(buffer))
+                    buffer.clear()
+            if buffer:
+                await run_in_threadpool(writer.write, bytes(buffer))
+            result = await run_in_threadpool(writer.commit, chunk_sha256)
+    except ChunkChecksumError as e:
+        logger.warning(f"청크 체크섬 불일치: {upload_id} - {e}")
+        raise HTTPException(status_code=409, detail={"code": "chunk_checksum_mismatch", "message": str(e)})
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    finally:
+        writer.close()
+    return {"upload_id": upload_id, **result}
+
+
+@upload_api.post("/uploads/{upload_id}/complete", tags=["Upload"])
+async def complete_upload_session(upload_id: str):
+    """
+    모든 청크 수신 확인 후 전체 SHA-256 검증, ./docs/uploaded/{server_path}/{filename} 으로 이동
+
+    - 누락 청크가 있거나 체크섬이 맞지 않으면 409 (체크섬 불일치 시 모든 청크를 다시 받아야 함)
+    """
+    try:
+        result = await run_in_threadpool(upload_sessions.finalize, upload_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"업로드 세션을 찾을 수 없습니다: {upload_id}")
+    except ValueError as e:
+        logger.warning(f"업로드 완료 처리 실패: {upload_id} - {e}")
+        raise HTTPException(status_code=409, detail=str(e))
+
+    logger.info({"message": "업로드 완료", **result})
+    return {"message": "업로드 완료", **result}
+
+
+@upload_api.delete("/uploads/{upload_id}", tags=["Upload"])
+async def abort_upload_session(upload_id: str):
+    """
+    업로드 세션과 임시 파일 삭제
+    """
+    try:
+        await run_in_threadpool(upload_sessions.abort, upload_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"message": "업로드 취소", "upload_id": upload_id}
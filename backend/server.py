@@ -3,11 +3,26 @@ from utils.setlogger import setup_logger
 config = get_config()
 logger = setup_logger(f"{__name__}", level=config.LOG_LEVEL)
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 서버 시작 시 Docling 변환기(레이아웃/OCR 모델) 예열
+    if config.WARM_CONVERTER:
+        from routers.parser import parser
+        logger.info("Warming up Docling converter...")
+        await run_in_threadpool(parser.warm_up)
+    yield
+    # 샤드 변환용 프로세스 풀 정리
+    from routers.parser import parser
+    parser.close()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -34,4 +49,4 @@ app.include_router(es_api)
 if __name__ == "__main__":
     import uvicorn
     logger.info("Starting FastAPI server...")
-    uvicorn.run("server:app", host="0.0.0.0", port=8000, reload=True, workers=2)
\ No newline at end of file
+    uvicorn.run("server:app", host="0.0.0.0", port=8000, reload=True, workers=config.SERVER_WORKERS)
\ No newline at end of file
@@ -0,0 +1,15 @@
+import os
+import sys
+import atexit
+import shutil
+import tempfile
+
+# 서버와 같은 방식으로 import (from process..., from utils...) 하도록 backend 폴더를 경로에 추가
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# 모듈 import 시 생성되는 ./logs, ./docs 등이 작업 트리에 남지 않도록 임시 폴더에서 실행 (종료 시 삭제)
+# 테스트 모듈보다 먼저 로드되므로 setup_logger의 ./logs/도 항상 이 폴더 아래에 생성됨
+WORK_DIR = tempfile.mkdtemp(prefix="backend-tests-")
+os.chdir(WORK_DIR)
+atexit.register(shutil.rmtree, WORK_DIR, ignore_errors=True)
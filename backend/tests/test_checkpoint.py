@@ -0,0 +1,60 @@
+import os
+
+from process.checkpoint import PageCheckpoint
+
+
+SETTINGS = {"ocr_mode": "always", "embed_model": "bge-m3"}
+
+
+def make_source(tmp_path, content=b"%PDF-1.7 source"):
+    source = tmp_path / "doc.pdf"
+    source.write_bytes(content)
+    return source
+
+
+def record(page):
+    return {"page": page, "text": f"page {page}", "error": None, "page_info": None, "embedding": [0.1, 0.2]}
+
+
+def test_resume_returns_completed_pages(tmp_path):
+    source = make_source(tmp_path)
+    PageCheckpoint(str(tmp_path / "ckpt"), str(source), SETTINGS).append([record(0), record(1)])
+    PageCheckpoint(str(tmp_path / "ckpt"), str(source), SETTINGS).append([record(2)])
+
+    pages = PageCheckpoint(str(tmp_path / "ckpt"), str(source), SETTINGS).load()
+    assert sorted(pages) == [0, 1, 2]
+    assert pages[2]["embedding"] == [0.1, 0.2]
+
+
+def test_truncated_last_line_is_dropped_and_cut(tmp_path):
+    source = make_source(tmp_path)
+    checkpoint = PageCheckpoint(str(tmp_path / "ckpt"), str(source), SETTINGS)
+    checkpoint.append([record(0), record(1)])
+    valid_size = checkpoint.path.stat().st_size
+    with open(checkpoint.path, "ab") as f:
+        f.write(b'{"page": 2, "text": "cut')
+
+    assert sorted(checkpoint.load()) == [0, 1]
+    assert checkpoint.path.stat().st_size == valid_size
+
+    # 잘린 뒤 이어 쓴 레코드도 정상적으로 읽힘
+    checkpoint.append([record(2)])
+    assert sorted(checkpoint.load()) == [0, 1, 2]
+
+
+def test_changed_settings_discard_checkpoint(tmp_path):
+    source = make_source(tmp_path)
+    PageCheckpoint(str(tmp_path / "ckpt"), str(source), SETTINGS).append([record(0)])
+
+    checkpoint = PageCheckpoint(str(tmp_path / "ckpt"), str(source), {**SETTINGS, "ocr_mode": "adaptive"})
+    assert checkpoint.load() == {}
+    assert not checkpoint.path.exists()
+
+
+def test_changed_source_discards_checkpoint(tmp_path):
+    source = make_source(tmp_path)
+    PageCheckpoint(str(tmp_path / "ckpt"), str(source), SETTINGS).append([record(0)])
+
+    source.write_bytes(b"%PDF-1.7 a different, longer source")
+    os.utime(source, ns=(1, 1))
+    assert PageCheckpoint(str(tmp_path / "ckpt"), str(source), SETTINGS).load() == {}
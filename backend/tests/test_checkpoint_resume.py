@@ -0,0 +1,53 @@
+import pytest
+
+pytest.importorskip("docling")
+pdfium = pytest.importorskip("pypdfium2")
+
+from process.parsing import DoclingParser
+
+
+TOTAL_PAGES = 7
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    doc = pdfium.PdfDocument.new()
+    for _ in range(TOTAL_PAGES):
+        doc.new_page(200, 200)
+    path = tmp_path / "big.pdf"
+    doc.save(str(path))
+    return path
+
+
+def make_parser(tmp_path, monkeypatch, calls, fail_from=None):
+    """변환(docling)/임베딩(ollama) 호출만 기록용 함수로 바꾼 파서 - fail_from 페이지를 변환하면 중단"""
+    parser = DoclingParser(output_base_path=str(tmp_path / "docs"), checkpoint=True, embed_batch_size=2,
+                           use_memory_budget=False)
+    parser.CHECKPOINT_WINDOW_PAGES = 3
+
+    def convert(pdf_path, options, start_page=None, end_page=None):
+        start_page = 0 if start_page is None else start_page
+        end_page = TOTAL_PAGES - 1 if end_page is None else end_page
+        calls.append((start_page, end_page))
+        if fail_from is not None and start_page <= fail_from <= end_page:
+            raise RuntimeError("변환 중단")
+        return {page: f"page {page} text" for page in range(start_page, end_page + 1)}
+
+    monkeypatch.setattr(parser, "_convert_page_range", convert)
+    monkeypatch.setattr(parser, "_embed_texts", lambda texts: [[0.1, 0.2] for _ in texts])
+    return parser
+
+
+def test_resume_does_not_convert_checkpointed_pages(tmp_path, monkeypatch, pdf_path):
+    # 기본값(always, shard_pages=0)이어도 체크포인트 구간(3페이지) 단위로 변환
+    calls = []
+    with pytest.raises(RuntimeError):
+        make_parser(tmp_path, monkeypatch, calls, fail_from=6).parse_file_to_batch(str(pdf_path), "proj", "", "", "")
+    assert calls == [(0, 2), (3, 5), (6, 6)]
+
+    # 재시도 시 완료된 0~5 페이지는 변환하지 않음
+    calls = []
+    batch = make_parser(tmp_path, monkeypatch, calls).parse_file_to_batch(str(pdf_path), "proj", "", "", "")
+    assert calls == [(6, 6)]
+    assert [int(page) for page in batch.columns["page"]] == list(range(TOTAL_PAGES))
+    assert batch.has_embedding.all()
@@ -0,0 +1,79 @@
+import pickle
+
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+
+from process.columnar import load_page_batch, save_page_batch
+from process.page_batch import PageBatch, EMBEDDING_DIM
+
+
+def make_docs(dim=EMBEDDING_DIM):
+    return [
+        Document(page_content=f"page {i}", metadata={"page": str(i), "filename": "a.pdf", "ocr": False,
+                                                     "embeddings": [float(i)] * dim})
+        for i in range(3)
+        ]
+
+
+def test_pkl_keeps_legacy_document_list(tmp_path):
+    path = tmp_path / "a.pkl"
+    save_page_batch(PageBatch.from_documents(make_docs()), str(path))
+
+    # 기존 소비자처럼 그대로 unpickle 하면 Document 리스트
+    with open(path, "rb") as f:
+        docs = pickle.load(f)
+    assert isinstance(docs, list) and all(isinstance(doc, Document) for doc in docs)
+    assert docs[1].page_content == "page 1"
+    assert docs[1].metadata["embeddings"] == [1.0] * EMBEDDING_DIM
+    assert docs[1].metadata["ocr"] is False
+
+
+def test_pkl_stores_matrix_without_building_documents(tmp_path, monkeypatch):
+    batch = PageBatch.from_documents(make_docs())
+    path = tmp_path / "a.pkl"
+
+    # 저장과 load_page_batch 복원 모두 Document/float 리스트 변환을 거치지 않아야 함
+    def fail(*args, **kwargs):
+        raise AssertionError("Document 변환 발생")
+    monkeypatch.setattr(PageBatch, "to_documents", fail)
+    monkeypatch.setattr(PageBatch, "from_documents", fail)
+    save_page_batch(batch, str(path))
+    loaded = load_page_batch(str(path))
+
+    assert loaded.embeddings.dtype == np.float32
+    assert np.array_equal(loaded.embeddings, batch.embeddings)
+    assert loaded.columns == batch.columns
+
+
+def test_pkl_round_trip_and_legacy_formats(tmp_path):
+    batch = PageBatch.from_documents(make_docs())
+    path = tmp_path / "a.pkl"
+    save_page_batch(batch, str(path))
+    loaded = load_page_batch(str(path))
+    assert loaded.page_content == batch.page_content
+    assert np.array_equal(loaded.embeddings, batch.embeddings)
+
+    # 이전 버전이 저장한 PageBatch 피클, dict 리스트 피클도 읽힘
+    with open(path, "wb") as f:
+        pickle.dump(batch, f)
+    assert load_page_batch(str(path)).page_content == batch.page_content
+    with open(path, "wb") as f:
+        pickle.dump([{"page_content": doc.page_content, "metadata": doc.metadata} for doc in make_docs()], f)
+    assert load_page_batch(str(path)).columns["page"] == ["0", "1", "2"]
+
+
+def test_embedding_dim_from_first_vector():
+    batch = PageBatch.from_records([("a", {"page": "0"}, None), ("b", {"page": "1"}, [0.5] * 8)])
+    assert batch.embeddings.shape == (2, 8)
+    assert batch.has_embedding.tolist() == [False, True]
+
+    # 임베딩이 없으면 설정 차원, 실패 페이지의 빈 리스트는 임베딩 없음으로 처리
+    assert PageBatch.from_records([("a", {"embeddings": []}, [])]).embeddings.shape == (1, EMBEDDING_DIM)
+
+
+def test_mismatched_embedding_dim_raises():
+    with pytest.raises(ValueError):
+        PageBatch.from_records([("a", {}, [0.1] * 8), ("b", {}, [0.1] * 4)])
+    with pytest.raises(ValueError):
+        PageBatch.concat([PageBatch.from_records([("a", {}, [0.1] * 8)]), PageBatch.from_records([("b", {}, [0.1] * 4)])])
@@ -0,0 +1,70 @@
+import os
+
+from process.manifest import IngestionManifest, normalize_path
+
+
+def write(path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    return str(path)
+
+
+def make_folder(tmp_path):
+    folder = tmp_path / "uploaded" / "proj"
+    files = {name: write(folder / name, f"content of {name}".encode()) for name in ("a.pdf", "b.pdf", "c.pdf")}
+    return folder, files
+
+
+def test_first_run_reports_all_files_new(tmp_path):
+    folder, files = make_folder(tmp_path)
+    manifest = IngestionManifest(str(tmp_path / "manifest.json"), settings="s1")
+    diff = manifest.diff(list(files.values()), folder_path=str(folder))
+    assert sorted(diff["new"]) == sorted(files.values())
+    assert diff["changed"] == diff["unchanged"] == diff["deleted"] == []
+
+
+def test_diff_detects_changed_touched_and_deleted(tmp_path):
+    folder, files = make_folder(tmp_path)
+    manifest = IngestionManifest(str(tmp_path / "manifest.json"), settings="s1")
+    for path in files.values():
+        manifest.record(path, output="out.pkl", pages=1)
+    manifest.save()
+
+    # b: 내용 변경, c: mtime만 변경 (내용 동일), a: 삭제
+    write(folder / "b.pdf", b"new content of b.pdf, longer")
+    st = os.stat(files["c.pdf"])
+    os.utime(files["c.pdf"], ns=(st.st_atime_ns, st.st_mtime_ns + 10_000_000_000))
+    os.remove(files["a.pdf"])
+
+    reloaded = IngestionManifest(str(tmp_path / "manifest.json"), settings="s1")
+    diff = reloaded.diff([files["b.pdf"], files["c.pdf"]], folder_path=str(folder))
+    assert diff["changed"] == [files["b.pdf"]]
+    assert diff["unchanged"] == [files["c.pdf"]]
+    assert diff["deleted"] == [normalize_path(files["a.pdf"])]
+
+    reloaded.forget(diff["deleted"])
+    assert normalize_path(files["a.pdf"]) not in reloaded.entries
+
+
+def test_changed_settings_mark_files_changed(tmp_path):
+    folder, files = make_folder(tmp_path)
+    manifest = IngestionManifest(str(tmp_path / "manifest.json"), settings="s1")
+    for path in files.values():
+        manifest.record(path)
+    manifest.save()
+
+    assert IngestionManifest(str(tmp_path / "manifest.json"), settings="s1").diff(list(files.values()))["changed"] == []
+    diff = IngestionManifest(str(tmp_path / "manifest.json"), settings="s2").diff(list(files.values()))
+    assert sorted(diff["changed"]) == sorted(files.values())
+    assert diff["unchanged"] == []
+
+
+def test_deleted_scope_limited_to_folder(tmp_path):
+    folder, files = make_folder(tmp_path)
+    other = write(tmp_path / "uploaded" / "other" / "x.pdf", b"x")
+    manifest = IngestionManifest(str(tmp_path / "manifest.json"))
+    for path in [*files.values(), other]:
+        manifest.record(path)
+
+    diff = manifest.diff(list(files.values()), folder_path=str(folder))
+    assert diff["deleted"] == []
@@ -0,0 +1,48 @@
+from process.near_dup import NearDuplicateIndex, simhash, hamming_distance
+
+
+BODY = " ".join(f"clause {i} of the standard confidentiality notice applies to all parties" for i in range(20))
+
+
+def make_index(tmp_path):
+    return NearDuplicateIndex(str(tmp_path / "near_dup.sqlite3"), max_distance=6)
+
+
+def test_simhash_is_close_for_near_identical_text():
+    assert hamming_distance(simhash(BODY), simhash(BODY.upper() + "!")) <= 6
+    assert hamming_distance(simhash(BODY), simhash("completely different page about quarterly revenue " * 20)) > 6
+
+
+def test_find_matches_page_from_other_file(tmp_path):
+    index = make_index(tmp_path)
+    value = simhash(BODY)
+    index.add_many("proj", [(value, "doc-1", "/data/a.pdf", "0", [0.5, 0.25])])
+
+    match = index.find("proj", value, exclude_filepath="/data/b.pdf")
+    assert match["doc_id"] == "doc-1"
+    assert match["distance"] == 0
+    assert match["embedding"] == [0.5, 0.25]
+    assert index.find("other-project", value) is None
+
+
+def test_find_excludes_pages_from_same_file(tmp_path):
+    index = make_index(tmp_path)
+    value = simhash(BODY)
+    index.add_many("proj", [(value, "doc-1", "/data/a.pdf", "0", [0.5])])
+
+    assert index.find("proj", value, exclude_filepath="/data/a.pdf") is None
+    assert index.find("proj", value) is not None
+
+
+def test_remove_drops_signatures_of_file(tmp_path):
+    index = make_index(tmp_path)
+    value = simhash(BODY)
+    index.add_many("proj", [
+        (value, "doc-1", "/data/a.pdf", "0", [0.5]),
+        (value, "doc-2", "/data/a.pdf", "1", [0.5]),
+        (value, "doc-3", "/data/c.pdf", "0", [0.5]),
+        ])
+
+    assert index.remove("/data/a.pdf") == 2
+    assert index.find("proj", value)["doc_id"] == "doc-3"
+    assert index.stats()["projects"] == {"proj": 1}
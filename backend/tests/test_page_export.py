@@ -0,0 +1,90 @@
+import pytest
+
+pytest.importorskip("docling_core")
+from docling_core.types.doc import (
+    BoundingBox,
+    DocItemLabel,
+    DoclingDocument,
+    GraphData,
+    ProvenanceItem,
+    Size,
+    TableCell,
+    TableData,
+    )
+
+from process.page_export import export_markdown_by_page
+
+
+def prov(page_no):
+    return ProvenanceItem(page_no=page_no, bbox=BoundingBox(l=0, t=0, r=10, b=10), charspan=(0, 1))
+
+
+def new_doc(num_pages):
+    doc = DoclingDocument(name="doc")
+    for page_no in range(1, num_pages + 1):
+        doc.add_page(page_no=page_no, size=Size(width=100, height=100))
+    return doc
+
+
+def table_data():
+    cells = [
+        TableCell(text=text, start_row_offset_idx=row, end_row_offset_idx=row + 1,
+                  start_col_offset_idx=col, end_col_offset_idx=col + 1, column_header=row == 0)
+        for row, texts in enumerate([["항목", "값"], ["max_len", "10"]])
+        for col, text in enumerate(texts)
+        ]
+    return TableData(num_rows=2, num_cols=2, table_cells=cells)
+
+
+def assert_docling_parity(doc, num_pages):
+    pages = export_markdown_by_page(doc)
+    expected = {page_no: doc.export_to_markdown(page_no=page_no) for page_no in range(1, num_pages + 1)}
+    assert {page_no: pages.get(page_no, "") for page_no in expected} == expected
+    return pages
+
+
+def test_captioned_table_matches_docling_export():
+    doc = new_doc(2)
+    doc.add_heading("표_제목", prov=prov(1))
+    caption = doc.add_text(label=DocItemLabel.CAPTION, text="표 1: snake_case 설정", prov=prov(1))
+    doc.add_table(data=table_data(), caption=caption, prov=prov(1))
+    doc.add_text(label=DocItemLabel.TEXT, text="다음 페이지", prov=prov(2))
+
+    pages = assert_docling_parity(doc, 2)
+    assert pages[1].count("표 1: snake\\_case 설정") == 1  # 캡션은 한 번만, 밑줄은 이스케이프
+
+
+def test_lists_match_docling_export():
+    doc = new_doc(2)
+    bullets = doc.add_list_group()
+    for text, page_no in [("first_item", 1), ("둘째", 1), ("셋째", 2)]:
+        doc.add_list_item(text=text, parent=bullets, prov=prov(page_no))
+    numbered = doc.add_list_group()
+    for text in ["하나", "둘"]:
+        doc.add_list_item(text=text, enumerated=True, parent=numbered, prov=prov(2))
+
+    pages = assert_docling_parity(doc, 2)
+    assert "- first\\_item\n- 둘째" in pages[1]
+
+
+def test_captioned_picture_matches_docling_export():
+    doc = new_doc(2)
+    doc.add_text(label=DocItemLabel.TEXT, text="본문", prov=prov(1))
+    caption = doc.add_text(label=DocItemLabel.CAPTION, text="그림 1", prov=prov(1))
+    doc.add_picture(caption=caption, prov=prov(1))
+    # 캡션이 그림과 다른 페이지에 있는 경우
+    other_caption = doc.add_text(label=DocItemLabel.CAPTION, text="그림 2", prov=prov(1))
+    doc.add_picture(caption=other_caption, prov=prov(2))
+
+    assert_docling_parity(doc, 2)
+
+
+def test_key_value_items_match_docling_export():
+    doc = new_doc(2)
+    doc.add_heading("제목", prov=prov(1))
+    doc.add_text(label=DocItemLabel.TEXT, text="첫 페이지", prov=prov(1))
+    doc.add_text(label=DocItemLabel.TEXT, text="둘째 페이지", prov=prov(2))
+    doc.add_key_values(graph=GraphData(cells=[], links=[]), prov=prov(2))
+
+    pages = assert_docling_parity(doc, 2)
+    assert "key-value" in pages[2]
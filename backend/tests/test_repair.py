@@ -0,0 +1,40 @@
+import pytest
+
+pytest.importorskip("docling")
+pdfium = pytest.importorskip("pypdfium2")
+
+from process.parsing import DoclingParser
+from process.repair import PageRepairer
+
+
+CATS = {"lv1_cat": "proj", "lv2_cat": "", "lv3_cat": "", "lv4_cat": ""}
+
+
+def test_reextract_converts_only_pending_pages(tmp_path, monkeypatch):
+    doc = pdfium.PdfDocument.new()
+    for _ in range(10):
+        doc.new_page(200, 200)
+    pdf_path = tmp_path / "doc.pdf"
+    doc.save(str(pdf_path))
+
+    # 기본값(always, shard_pages=0, 체크포인트 끔) 파서
+    parser = DoclingParser(output_base_path=str(tmp_path / "docs"), use_memory_budget=False)
+    calls, failures = [], {5: 1}
+
+    def convert(pdf_path, options, start_page=None, end_page=None):
+        calls.append((start_page, end_page))
+        markdowns = {}
+        for page in range(start_page, end_page + 1):
+            if failures.get(page):
+                failures[page] -= 1
+                raise RuntimeError("변환 실패")
+            markdowns[page] = f"page {page}"
+        return markdowns
+
+    monkeypatch.setattr(parser, "_convert_page_range", convert)
+    repairer = PageRepairer(parser, attempts=2, base_delay=0)
+    records = repairer._reextract_pages(pdf_path, [2, 5, 6], CATS)
+
+    assert sorted(records) == [2, 5, 6]
+    # 문서 전체가 아니라 실패 페이지 구간만, 재시도에서는 아직 남은 구간만 변환
+    assert calls == [(2, 2), (5, 6), (5, 6)]
@@ -0,0 +1,63 @@
+import pytest
+
+from process.cost_model import simulate_finish_times
+from process.scheduler import TaskScheduler, parse_priorities
+
+
+def task(name, cost, project="p1", priority=None):
+    return {"file": name, "cats": {"lv1_cat": project}, "cost": cost, "priority": priority}
+
+
+def order(policy, tasks, priorities=None):
+    scheduler = TaskScheduler(policy, priorities)
+    for item in tasks:
+        scheduler.push(item)
+    return [item["file"] for item in scheduler.drain()]
+
+
+TASKS = [task("a", 5), task("b", 1), task("c", 10), task("d", 3)]
+
+
+@pytest.mark.parametrize("policy, expected", [
+    ("fifo", ["a", "b", "c", "d"]),
+    ("sjf", ["b", "d", "a", "c"]),
+    ("lpt", ["c", "a", "d", "b"]),
+    ])
+def test_policy_order(policy, expected):
+    assert order(policy, [dict(item) for item in TASKS]) == expected
+
+
+def test_default_policy_is_fifo():
+    assert TaskScheduler().policy == "fifo"
+    with pytest.raises(ValueError):
+        TaskScheduler("random")
+
+
+def test_fair_alternates_projects_by_served_cost():
+    # 큰 프로젝트(big)가 먼저 몰려 들어와도 작은 프로젝트(small)가 끝까지 밀리지 않음
+    tasks = [task(f"big{i}", 4, "big") for i in range(4)] + [task(f"small{i}", 4, "small") for i in range(2)]
+    result = order("fair", tasks)
+    assert result.index("small0") <= 1
+    assert result.index("small1") <= 3
+
+
+def test_priority_beats_policy():
+    tasks = [task("a", 1), task("b", 9, project="legal"), task("c", 2, priority=5)]
+    # 명시한 priority > 프로젝트 우선순위 > 기본(0), 같은 우선순위 안에서만 정책(sjf) 적용
+    assert order("sjf", tasks, parse_priorities("legal:2, hr:1")) == ["c", "b", "a"]
+
+
+def test_peek_matches_pop():
+    scheduler = TaskScheduler("fair")
+    for item in [task("a", 3, "x"), task("b", 1, "y"), task("c", 2, "x")]:
+        scheduler.push(item)
+    while len(scheduler):
+        assert scheduler.peek() is scheduler.pop()
+    assert scheduler.peek() is None and scheduler.pop() is None
+
+
+def test_parse_priorities_and_finish_times():
+    assert parse_priorities("legal:2,hr:1, bad, :3") == {"legal": 2, "hr": 1}
+    assert parse_priorities("") == {}
+    # 워커 2개 - 먼저 비는 워커에 배정
+    assert simulate_finish_times([4, 1, 2, 3], 2) == [4, 1, 3, 6]
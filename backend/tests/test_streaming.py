@@ -0,0 +1,207 @@
+import time
+import hashlib
+import threading
+from pathlib import Path
+
+import pytest
+
+from process.postgres import PostgresPipeline
+from process.jobs import InMemoryJobStore, JobManager
+from process.streaming import StreamingIngestor
+
+
+class FakeBatch:
+    def __init__(self, pages):
+        self.pages = pages
+
+    def __len__(self):
+        return len(self.pages)
+
+    def count_status(self, status):
+        return 0
+
+
+class FakeManifest:
+    def __init__(self):
+        self.recorded = []
+
+    def record(self, file, **kwargs):
+        self.recorded.append(file)
+
+    def save(self):
+        pass
+
+
+class FakeParser:
+    embed_batch_size = 2
+
+    def __init__(self, pages_per_file=5, fail_cats=False, fail_embed=False):
+        self.pages_per_file = pages_per_file
+        self.fail_cats = fail_cats
+        self.fail_embed = fail_embed
+        self.manifest = FakeManifest()
+
+    def _extract_cats(self, pdf_file):
+        if self.fail_cats:
+            raise RuntimeError("parse stage failed")
+        return {"lv1_cat": "proj", "lv2_cat": "", "lv3_cat": "", "lv4_cat": ""}
+
+    def reset_near_duplicates(self, pdf_file):
+        pass
+
+    def iter_page_texts(self, pdf_file, *cats):
+        for page in range(self.pages_per_file):
+            yield {"page": page}
+
+    def build_page_batch(self, pages, *args):
+        if self.fail_embed:
+            raise RuntimeError("embed stage failed")
+        return FakeBatch(pages)
+
+
+class FakePipe:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.rows = 0
+
+    def delete_file_rows(self, table_name, filepath):
+        return 0
+
+    def insert_batch(self, table_name, batch):
+        if self.fail:
+            raise RuntimeError("sink stage failed")
+        self.rows += len(batch)
+
+
+def run_with_timeout(ingestor, files, timeout=20):
+    """교착 시 테스트가 멈추지 않도록 별도 스레드에서 실행"""
+    outcome = {}
+
+    def target():
+        try:
+            outcome["result"] = ingestor.run(files)
+        except Exception as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "스트리밍 파이프라인이 종료되지 않음 (교착)"
+    return outcome
+
+
+def test_streaming_ingests_all_pages():
+    parser, pipe = FakeParser(pages_per_file=5), FakePipe()
+    outcome = run_with_timeout(StreamingIngestor(parser, pipe, "t", queue_size=4), ["a.pdf", "b.pdf"])
+    assert outcome["result"]["done_files"] == 2
+    assert outcome["result"]["total_pages"] == 10
+    assert pipe.rows == 10
+    assert parser.manifest.recorded == ["a.pdf", "b.pdf"]
+
+
+@pytest.mark.parametrize("parser,pipe", [
+    (FakeParser(fail_cats=True), FakePipe()),
+    (FakeParser(fail_embed=True), FakePipe()),
+    (FakeParser(pages_per_file=50), FakePipe(fail=True)),
+    ])
+def test_streaming_stage_failure_stops_pipeline(parser, pipe):
+    files = [f"{i}.pdf" for i in range(20)]
+    outcome = run_with_timeout(StreamingIngestor(parser, pipe, "t", queue_size=4), files)
+    assert isinstance(outcome.get("error"), RuntimeError)
+
+
+def test_streaming_job_fails_when_parse_stage_raises():
+    manager = JobManager(InMemoryJobStore())
+    ingestor = StreamingIngestor(FakeParser(fail_cats=True), FakePipe(), "t", queue_size=4)
+    job_id = manager.submit("stream_ingest", {}, lambda job_id: ingestor.run(["a.pdf", "b.pdf"]))
+
+    deadline = time.time() + 20
+    while manager.get(job_id)["status"] in ("queued", "running") and time.time() < deadline:
+        time.sleep(0.05)
+    job = manager.get(job_id)
+    assert job["status"] == "failed"
+    assert "parse stage failed" in job["error"]
+
+
+class FakeCursor:
+    def __init__(self, rows):
+        self.rows = rows
+        self.rowcount = 0
+
+    def execute(self, sql, params):
+        assert sql.startswith("DELETE") and "hashed_filepath = %s OR filepath = %s" in sql
+        hashed_filepath, filepath = params
+        kept = [r for r in self.rows if r["hashed_filepath"] != hashed_filepath and r["filepath"] != filepath]
+        self.rowcount = len(self.rows) - len(kept)
+        self.rows[:] = kept
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def cursor(self):
+        return FakeCursor(self.rows)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class MemoryPipeline(PostgresPipeline):
+    """delete_file_rows는 실제 구현을 쓰고, insert만 메모리 행 목록에 쌓는 파이프라인"""
+
+    def __init__(self):
+        super().__init__()
+        self.rows = []
+
+    def _get_db_connection(self):
+        return FakeConnection(self.rows)
+
+    def insert_batch(self, table_name, batch):
+        self.rows.extend(batch.pages)
+        return len(batch)
+
+
+class FailedPageParser(FakeParser):
+    """파싱 결과처럼 실패 페이지는 hashed_filepath가 빈 행을 만든다"""
+
+    def __init__(self, pages_per_file, failed_pages):
+        super().__init__(pages_per_file=pages_per_file)
+        self.failed_pages = failed_pages
+
+    def iter_page_texts(self, pdf_file, *cats):
+        resolved = str(Path(pdf_file).resolve())
+        for page in range(self.pages_per_file):
+            failed = page in self.failed_pages
+            yield {
+                "page": page,
+                "filepath": resolved.replace("\\", "/"),
+                "hashed_filepath": "" if failed else hashlib.md5(resolved.encode()).hexdigest(),
+                }
+
+
+def test_streaming_reingest_replaces_failed_and_stale_pages(tmp_path):
+    pdf_file = str(tmp_path / "a.pdf")
+    other_file = str(tmp_path / "b.pdf")
+    pipe = MemoryPipeline()
+
+    run_with_timeout(StreamingIngestor(FailedPageParser(5, {2}), pipe, "t", queue_size=4), [pdf_file, other_file])
+    assert len(pipe.rows) == 10
+
+    # 실패 페이지가 복구되고 페이지 수가 줄어든 상태로 같은 파일을 다시 적재
+    outcome = run_with_timeout(StreamingIngestor(FailedPageParser(3, set()), pipe, "t", queue_size=4), [pdf_file])
+    assert outcome["result"]["total_pages"] == 3
+
+    rows = [r for r in pipe.rows if r["filepath"].endswith("/a.pdf")]
+    assert sorted(r["page"] for r in rows) == [0, 1, 2]
+    assert all(r["hashed_filepath"] for r in rows)
+    assert len(pipe.rows) == 8  # 다른 파일의 행은 그대로
@@ -0,0 +1,206 @@
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import zstandard
+
+from process.upload_sessions import UploadSessionStore, ChunkChecksumError
+
+
+CHUNK = 1024
+
+
+def make_store(tmp_path):
+    return UploadSessionStore(str(tmp_path / "tmp"), str(tmp_path / "uploaded"))
+
+
+def make_session(store, data, filename="a.bin"):
+    return store.create(filename, "proj", len(data), CHUNK, hashlib.sha256(data).hexdigest())
+
+
+def write_zstd(store, upload_id, offset, body):
+    writer = store.open_chunk(upload_id, offset, "zstd")
+    try:
+        writer.write(body)
+        return writer.commit()
+    finally:
+        writer.close()
+
+
+def test_zstd_chunk_is_decompressed(tmp_path):
+    store = make_store(tmp_path)
+    data = b"abc" * 1000
+    session = make_session(store, data)
+    for offset in range(0, len(data), CHUNK):
+        result = write_zstd(store, session["upload_id"], offset, zstandard.ZstdCompressor().compress(data[offset:offset + CHUNK]))
+        assert result["received_bytes"] == min(CHUNK, len(data) - offset)
+    saved = store.finalize(session["upload_id"])["saved_path"]
+    with open(saved, "rb") as f:
+        assert f.read() == data
+
+
+def test_zstd_truncated_frame_is_rejected(tmp_path):
+    store = make_store(tmp_path)
+    data = os.urandom(CHUNK)
+    session = make_session(store, data)
+    # 체크섬 포함 프레임에서 마지막 4바이트(체크섬)만 잘라도 해제 길이는 같지만 거부해야 함
+    body = zstandard.ZstdCompressor(write_checksum=True).compress(data)
+    with pytest.raises(ValueError, match="완전하지"):
+        write_zstd(store, session["upload_id"], 0, body[:-4])
+    assert store.status(session["upload_id"])["missing_chunks"] == [0]
+
+
+def test_zstd_trailing_data_and_bomb_are_rejected(tmp_path):
+    store = make_store(tmp_path)
+    data = os.urandom(CHUNK)
+    session = make_session(store, data)
+    body = zstandard.ZstdCompressor().compress(data)
+    with pytest.raises(ValueError, match="뒤에"):
+        write_zstd(store, session["upload_id"], 0, body + body)
+
+    # 기대 길이보다 훨씬 크게 풀리는 본문은 기록 도중 중단
+    bomb = zstandard.ZstdCompressor().compress(bytes(64 * 1024 * 1024))
+    with pytest.raises(ValueError, match="넘었습니다"):
+        write_zstd(store, session["upload_id"], 0, bomb)
+
+
+def test_chunk_checksum_mismatch_has_its_own_error(tmp_path):
+    store = make_store(tmp_path)
+    data = os.urandom(CHUNK)
+    session = make_session(store, data)
+    # 체크섬 불일치만 ChunkChecksumError (클라이언트 재전송 대상), 길이 오류는 일반 ValueError
+    with pytest.raises(ChunkChecksumError):
+        store.write_chunk(session["upload_id"], 0, data, chunk_sha256="00" * 32)
+    with pytest.raises(ValueError) as excinfo:
+        store.write_chunk(session["upload_id"], 0, data[:10])
+    assert not isinstance(excinfo.value, ChunkChecksumError)
+    assert store.status(session["upload_id"])["missing_chunks"] == [0]
+
+
+def test_finalize_is_idempotent(tmp_path):
+    store = make_store(tmp_path)
+    data = os.urandom(CHUNK * 3)
+    session = make_session(store, data)
+    for offset in range(0, len(data), CHUNK):
+        store.write_chunk(session["upload_id"], offset, data[offset:offset + CHUNK])
+
+    # 동시에 들어온 완료 요청 모두 같은 결과 (두 번째 이동의 FileNotFoundError를 500으로 내지 않음)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(store.finalize, [session["upload_id"]] * 4))
+    assert all(result == results[0] for result in results)
+    # 응답을 못 받은 클라이언트의 재요청도 성공
+    assert store.finalize(session["upload_id"]) == results[0]
+    with open(results[0]["saved_path"], "rb") as f:
+        assert f.read() == data
+
+    # 최종 파일이 바뀌었으면 완료 기록을 믿지 않음
+    with open(results[0]["saved_path"], "wb") as f:
+        f.write(b"changed")
+    with pytest.raises(KeyError):
+        store.finalize(session["upload_id"])
+
+
+def test_resume_reports_only_missing_chunks(tmp_path):
+    store = make_store(tmp_path)
+    data = os.urandom(CHUNK * 3 + 100)
+    session = make_session(store, data)
+    assert session["total_chunks"] == 4 and session["missing_chunks"] == [0, 1, 2, 3]
+
+    # 순서와 무관하게 기록, 마지막 청크는 남은 길이
+    store.write_chunk(session["upload_id"], CHUNK * 3, data[CHUNK * 3:])
+    store.write_chunk(session["upload_id"], CHUNK, data[CHUNK:CHUNK * 2])
+    # 같은 파일로 다시 시작하면 같은 세션, 받은 청크는 건너뜀
+    resumed = make_session(store, data)
+    assert resumed["upload_id"] == session["upload_id"]
+    assert resumed["missing_chunks"] == [0, 2]
+    with pytest.raises(ValueError, match="누락"):
+        store.finalize(session["upload_id"])
+
+    for offset in (0, CHUNK * 2):
+        store.write_chunk(session["upload_id"], offset, data[offset:offset + CHUNK])
+    with open(store.finalize(session["upload_id"])["saved_path"], "rb") as f:
+        assert f.read() == data
+
+
+def test_offset_and_length_are_checked(tmp_path):
+    store = make_store(tmp_path)
+    data = os.urandom(CHUNK * 2)
+    session = make_session(store, data)
+    for offset in (-CHUNK, 10, CHUNK * 2):
+        with pytest.raises(ValueError, match="오프셋"):
+            store.write_chunk(session["upload_id"], offset, data[:CHUNK])
+    with pytest.raises(ValueError, match="길이"):
+        store.write_chunk(session["upload_id"], 0, data[:CHUNK - 1])
+    with pytest.raises(ValueError, match="넘었습니다"):
+        store.write_chunk(session["upload_id"], 0, data[:CHUNK] + b"x")
+    with pytest.raises(KeyError):
+        store.write_chunk("0" * 32, 0, data[:CHUNK])
+    assert store.status(session["upload_id"])["missing_chunks"] == [0, 1]
+
+
+def test_chunk_size_change_restarts_session(tmp_path):
+    store = make_store(tmp_path)
+    data = os.urandom(CHUNK * 2)
+    session = make_session(store, data)
+    store.write_chunk(session["upload_id"], 0, data[:CHUNK])
+
+    restarted = store.create("a.bin", "proj", len(data), CHUNK // 2, hashlib.sha256(data).hexdigest())
+    assert restarted["upload_id"] == session["upload_id"]
+    assert restarted["missing_chunks"] == [0, 1, 2, 3]
+
+
+def test_file_checksum_mismatch_resets_bitmap(tmp_path):
+    store = make_store(tmp_path)
+    data = os.urandom(CHUNK * 2)
+    session = store.create("a.bin", "proj", len(data), CHUNK, "0" * 64)
+    for offset in (0, CHUNK):
+        store.write_chunk(session["upload_id"], offset, data[offset:offset + CHUNK])
+    with pytest.raises(ValueError, match="체크섬"):
+        store.finalize(session["upload_id"])
+    assert store.status(session["upload_id"])["missing_chunks"] == [0, 1]
+
+
+def test_empty_file_and_path_traversal(tmp_path):
+    store = make_store(tmp_path)
+    session = make_session(store, b"", filename="empty.txt")
+    assert session["total_chunks"] == 1
+    store.write_chunk(session["upload_id"], 0, b"")
+    assert os.path.getsize(store.finalize(session["upload_id"])["saved_path"]) == 0
+
+    with pytest.raises(ValueError):
+        store.create("a.bin", "../../outside", 1, CHUNK, "0" * 64)
+    with pytest.raises(ValueError):
+        store.status("../x")
+
+
+def test_negotiate_present_copied_and_upload(tmp_path):
+    store = make_store(tmp_path)
+    data = os.urandom(CHUNK * 2)
+    session = make_session(store, data)
+    for offset in (0, CHUNK):
+        store.write_chunk(session["upload_id"], offset, data[offset:offset + CHUNK])
+    store.finalize(session["upload_id"])
+
+    partial = os.urandom(CHUNK * 2)
+    partial_session = make_session(store, partial, filename="b.bin")
+    store.write_chunk(partial_session["upload_id"], CHUNK, partial[CHUNK:])
+
+    def item(server_path, filename, content):
+        return {"server_path": server_path, "filename": filename, "size": len(content),
+                "sha256": hashlib.sha256(content).hexdigest()}
+
+    files = [
+        item("proj", "a.bin", data),       # 같은 경로에 같은 내용
+        item("moved", "a.bin", data),      # 다른 경로의 같은 내용 → 서버 안에서 복사
+        item("proj", "b.bin", partial),    # 받던 세션 → 남은 청크만
+        item("../x", "c.bin", b"c"),       # 잘못된 경로
+        ]
+    results = store.negotiate(files, CHUNK)
+    assert [r["status"] for r in results] == ["present", "copied", "upload", "error"]
+    assert results[2]["upload_id"] == partial_session["upload_id"]
+    assert results[2]["missing_chunks"] == [0]
+    with open(tmp_path / "uploaded" / "moved" / "a.bin", "rb") as f:
+        assert f.read() == data
+    # 복사된 파일도 다음 협상부터는 present
+    assert store.negotiate([files[1]], CHUNK)[0]["status"] == "present"
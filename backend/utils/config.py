@@ -14,6 +14,44 @@ class BaseConfig:
     MARIA_PW: str = os.getenv("MARIA_PW", "admin123")
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    PARSER_WORKERS: int = int(os.getenv("PARSER_WORKERS", "1"))
+    EMBED_BATCH_SIZE: int = int(os.getenv("EMBED_BATCH_SIZE", "32"))
+    EMBEDDING_DIM: int = int(os.getenv("EMBEDDING_DIM", "1024"))
+    OCR_MODE: str = os.getenv("OCR_MODE", "always")
+    OCR_MIN_TEXT_CHARS: int = int(os.getenv("OCR_MIN_TEXT_CHARS", "50"))
+    SHARD_PAGES: int = int(os.getenv("SHARD_PAGES", "0"))
+    SHARD_WORKERS: int = int(os.getenv("SHARD_WORKERS", "1"))
+    JOB_BACKEND: str = os.getenv("JOB_BACKEND", "memory")
+    JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", "2"))
+    JOB_MAX_CONCURRENT: int = int(os.getenv("JOB_MAX_CONCURRENT", "1"))
+    OUTPUT_FORMAT: str = os.getenv("OUTPUT_FORMAT", "pickle")
+    TEXT_PAGE_CHARS: int = int(os.getenv("TEXT_PAGE_CHARS", "3000"))
+    DEDUP_MODE: str = os.getenv("DEDUP_MODE", "off")
+    DEDUP_INDEX_PATH: str = os.getenv("DEDUP_INDEX_PATH", "./docs/cache/near_dup.sqlite3")
+    DEDUP_MAX_DISTANCE: int = int(os.getenv("DEDUP_MAX_DISTANCE", "6"))
+    DEDUP_MIN_CHARS: int = int(os.getenv("DEDUP_MIN_CHARS", "200"))
+    COST_MODEL_PATH: str = os.getenv("COST_MODEL_PATH", "./docs/cache/cost_model.json")
+    SCHEDULE_POLICY: str = os.getenv("SCHEDULE_POLICY", "fifo")
+    SCHEDULE_PROJECT_PRIORITY: str = os.getenv("SCHEDULE_PROJECT_PRIORITY", "")
+    SERVER_WORKERS: int = int(os.getenv("SERVER_WORKERS", "2"))
+    MEMORY_BUDGET_MB: float = float(os.getenv("MEMORY_BUDGET_MB", "0"))
+    MEMORY_POLL_INTERVAL: float = float(os.getenv("MEMORY_POLL_INTERVAL", "1"))
+    WORKER_MAX_TASKS: int = int(os.getenv("WORKER_MAX_TASKS", "0"))
+    UPLOAD_TMP_DIR: str = os.getenv("UPLOAD_TMP_DIR", "./docs/upload_tmp")
+    UPLOAD_SESSION_TTL_HOURS: float = float(os.getenv("UPLOAD_SESSION_TTL_HOURS", "48"))
+    UPLOAD_BUFFER_SIZE: int = int(os.getenv("UPLOAD_BUFFER_SIZE", str(256 * 1024)))
+    UPLOAD_MAX_INFLIGHT_BYTES: int = int(os.getenv("UPLOAD_MAX_INFLIGHT_BYTES", str(256 * 1024 * 1024)))
+    PARSE_CHECKPOINT: bool = os.getenv("PARSE_CHECKPOINT", "False").lower() == "true"
+    WARM_CONVERTER: bool = os.getenv("WARM_CONVERTER", "False").lower() == "true"
+    EMBED_RATE_MAX: float = float(os.getenv("EMBED_RATE_MAX", "200"))
+    EMBED_RATE_MIN: float = float(os.getenv("EMBED_RATE_MIN", "2"))
+    EMBED_RATE_BURST: float = float(os.getenv("EMBED_RATE_BURST", "64"))
+    EMBED_LATENCY_TARGET: float = float(os.getenv("EMBED_LATENCY_TARGET", "0.5"))
+    EMBED_CACHE_PATH: str = os.getenv("EMBED_CACHE_PATH", "./docs/cache/embeddings.sqlite3")
+    EMBED_CACHE_MAX_ENTRIES: int = int(os.getenv("EMBED_CACHE_MAX_ENTRIES", "200000"))
+    STREAM_QUEUE_SIZE: int = int(os.getenv("STREAM_QUEUE_SIZE", "64"))
+    REPAIR_ATTEMPTS: int = int(os.getenv("REPAIR_ATTEMPTS", "4"))
+    REPAIR_BASE_DELAY: float = float(os.getenv("REPAIR_BASE_DELAY", "2"))
 
 class DevConfig(BaseConfig):
     """개발 환경"""
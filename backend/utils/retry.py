@@ -0,0 +1,75 @@
+import time
+import random
+from typing import Callable, Iterator, Tuple, Type
+
+from utils.config import get_config
+from utils.setlogger import setup_logger
+config = get_config()
+logger = setup_logger(f"{__name__}", level=config.LOG_LEVEL)
+
+
+def backoff_delays(attempts: int, base_delay: float = 1.0, max_delay: float = 30.0, jitter: float = 0.2) -> Iterator[float]:
+    """
+    지수 백오프 대기 시간 생성 (base_delay, 2*base_delay, 4*base_delay ... 최대 max_delay)
+    동시에 실패한 작업들이 같은 시각에 재시도하지 않도록 ±jitter 비율만큼 흔들어 줍니다.
+    """
+    for attempt in range(attempts):
+        delay = min(max_delay, base_delay * (2 ** attempt))
+        yield delay * random.uniform(1 - jitter, 1 + jitter)
+
+
+def retry_call(func: Callable, *args, attempts: int = 3, base_delay: float = 1.0, max_delay: float = 30.0,
+               exceptions: Tuple[Type[BaseException], ...] = (Exception,), **kwargs):
+    """
+    func(*args, **kwargs)를 실패 시 지수 백오프로 재시도합니다.
+
+    Args:
+        attempts: 최대 시도 횟수 (첫 시도 포함)
+        base_delay: 첫 재시도 전 대기 시간(초)
+        max_delay: 재시도 대기 시간 상한(초)
+        exceptions: 재시도할 예외 타입
+
+    Raises:
+        마지막 시도의 예외
+    """
+    delays = backoff_delays(attempts - 1, base_delay, max_delay)
+    while True:
+        try:
+            return func(*args, **kwargs)
+        except exceptions as e:
+            delay = next(delays, None)
+            if delay is None:
+                raise
+            logger.warning(f"{getattr(func, '__name__', 'call')} 실패, {delay:.1f}초 후 재시도: {e}")
+            time.sleep(delay)
+
+
+def retry_pending(func: Callable[[list], dict], items: list, attempts: int = 3, base_delay: float = 1.0,
+                  max_delay: float = 30.0) -> dict:
+    """
+    여러 항목을 한 번에 처리하는 func(items) -> {항목: 결과}를 재시도합니다.
+    성공한 항목은 다음 시도에서 제외하고 실패한 항목만 지수 백오프 후 다시 처리합니다.
+    func 자체가 예외를 던지면 그 시도는 전부 실패로 간주합니다.
+
+    Returns:
+        {항목: 결과} - 모든 시도 후에도 실패한 항목은 포함되지 않음
+    """
+    results = {}
+    pending = list(items)
+    delays = backoff_delays(attempts - 1, base_delay, max_delay)
+    while pending:
+        try:
+            done = func(pending)
+        except Exception as e:
+            logger.warning(f"{getattr(func, '__name__', 'call')} 실패 ({len(pending)}건): {e}")
+            done = {}
+        results.update({item: value for item, value in done.items() if value is not None})
+        pending = [item for item in pending if item not in results]
+        if not pending:
+            break
+        delay = next(delays, None)
+        if delay is None:
+            break
+        logger.info(f"{len(pending)}건 {delay:.1f}초 후 재시도")
+        time.sleep(delay)
+    return results
@@ -1,5 +1,6 @@
 import os
 import json
+import time
 import base64
 import requests
 import streamlit as st
@@ -18,6 +19,7 @@ FASTAPI_BASEURL = "http://localhost:8000"
 
 
 from utils.style import HOVERING_EFFECT
+from utils.uploader import build_manifest, negotiate_uploads, FolderUploader, DEFAULT_CHUNK_SIZE
 # ==== Background Image ====
 def get_base64_of_image(image_file):
     """이미지 파일을 Base64로 인코딩하여 문자열로 반환합니다."""
@@ -142,33 +144,6 @@ def count_files(folder_path: str) -> int:
         count += len(files)
     return count
 
-def upload_file_in_chunks(local_base_path:str, local_path:str):
-    chunk_size = 10 * 1024 * 1024   # 10MB
-    local_filename = os.path.basename(local_path)
-    file_size = os.path.getsize(local_path)
-    total_chunks = (file_size + chunk_size - 1) // chunk_size
-
-    folder_path = os.path.dirname(local_path).replace("\\", "/") # 맨 끝 파일명 제외한 상위 경로
-    delted_path = os.path.dirname(local_base_path).replace("\\", "/") # 폴더 경로에서 맨끝 폴더 제외 --> 서버 저장시 제거할 경로명
-    server_path = f"{folder_path.replace('\\', '/').replace(delted_path, '')}"
-
-    with open(local_path, "rb") as f:
-        for chunk_index in range(total_chunks):
-            chunk = f.read(chunk_size)
-
-            files = {"file": ("chunk", chunk)}
-            data = {
-                "filename": local_filename,
-                "chunk_index": int(chunk_index),
-                "total_chunks": int(total_chunks),
-                "server_path": server_path,
-                }
-            try:
-                res = requests.post(f"{FASTAPI_BASEURL}/upload_chunk", files=files, data=data)
-                logger.info(f"Chunked file is Uploaded Successfully - {local_path}")
-            except Exception as e:
-                logger.error(e)
-
 
 col_schema = [
     {'name': 'id', 'type': 'VARCHAR(300) NOT NULL'}, 
@@ -248,6 +223,7 @@ if __name__ == "__main__":
         with st.expander("File Upload"):
             local_base_path = st.text_input("로컬 프로젝트 폴더 경로를 입력하세요", value=local_base_path_sample)
             local_base_path = local_base_path.replace("\\", "/")
+            max_workers = st.number_input("동시 전송 수", min_value=1, max_value=64, value=config.UPLOAD_MAX_WORKERS)
         
             if st.button("대용량 청킹 파일 전송"):
                 if not os.path.exists(local_base_path):
@@ -262,20 +238,44 @@ if __name__ == "__main__":
                 progress_bar = st.progress(0)
                 status = st.empty()
 
-                files = list_files_recursive(local_base_path)
-
-                for idx, local_path in enumerate(files, start=1):
-                    upload_file_in_chunks(local_base_path=local_base_path, local_path=local_path)
-
-                    progress = idx / total_files
-                    progress_bar.progress(progress)
-                    status.write(f"({idx}/{total_files}) 업로드 중: {local_path}")
+                # 서버와 협상하여 없는 파일/청크만 전송 (변경 없는 파일은 건너뜀)
+                status.write("파일 해시 계산 및 서버 비교 중...")
+                files = list(list_files_recursive(local_base_path))
+                try:
+                    plan = negotiate_uploads(FASTAPI_BASEURL, build_manifest(local_base_path, files), chunk_size=DEFAULT_CHUNK_SIZE)
+                except Exception as e:
+                    st.error(f"업로드 협상 실패: {str(e)}")
+                    st.stop()
 
-                st.success("🎉 모든 파일 업로드 완료!")
+                uploads = [item for item in plan if item["status"] == "upload"]
+                errors = [item for item in plan if item["status"] == "error"]
+                st.info(f"전체 {len(plan)}건 중 전송 {len(uploads)}건, 건너뜀 {len(plan) - len(uploads) - len(errors)}건")
+
+                # 연결 풀 + 청크 단위 병렬 전송 (파일 여러 개를 동시에 전송, 실패 청크는 백오프 후 재시도)
+                active = st.empty()
+                def show_progress(p: dict):
+                    progress_bar.progress(p["done_bytes"] / p["total_bytes"] if p["total_bytes"] else 1.0)
+                    status.write(f"({p['files_done']}/{p['files_total']}) 업로드 중 - {p['mbps']} MB/s, 경과 {p['elapsed']}초")
+                    active.text("\n".join(f"{fraction:6.1%}  {path}" for path, fraction in list(p["active"].items())[:10]))
+
+                uploader = FolderUploader(FASTAPI_BASEURL, chunk_size=DEFAULT_CHUNK_SIZE, max_workers=int(max_workers),
+                                          max_retries=config.UPLOAD_MAX_RETRIES, backoff=config.UPLOAD_RETRY_BACKOFF,
+                                          compression=config.UPLOAD_COMPRESSION)
+                report = uploader.upload(uploads, progress_callback=show_progress)
+                active.empty()
+                errors += report["failed"]
+                if report["wire_bytes"] < report["sent_bytes"]:
+                    st.info(f"압축 전송: {report['sent_bytes'] / 1024 ** 2:.1f}MB → {report['wire_bytes'] / 1024 ** 2:.1f}MB")
+
+                progress_bar.progress(1.0)
+                for item in errors:
+                    st.error(f"{item['local_path']}: {item['error']}")
+                if not errors:
+                    st.success("🎉 모든 파일 업로드 완료!")
 
     with col3:
         st.subheader(":blue[PDF Parsing 배치 처리]")
-        st.info("PDF 파싱후 Pickle 형식 저장")
+        st.info("PDF/DOCX/TXT/MD/HTML 파싱후 Pickle 형식 저장")
 
         with st.expander("Parsing with Docling"):
 
@@ -289,22 +289,45 @@ if __name__ == "__main__":
                 if not folder_path:
                     st.error("폴더 경로를 입력하세요.")
                 else:
-                    with st.spinner("배치 처리 중..."):
-                        try:
-                            response = requests.post(
-                                f"{FASTAPI_BASEURL}/batch_parse_by_folder",
-                                data={
-                                    "folder_path": folder_path,
-                                    "remove_original": remove_original
-                                }
-                            )
-                            if response.status_code == 200:
-                                result = response.json()
-                                st.success(f"배치 처리 완료! - 총 {len(result)}개 문서")
-                            else:
-                                st.error(f"에러 발생: {response.status_code} - {response.text}")
-                        except Exception as e:
-                            st.error(f"서버 연결 실패: {e}")
+                    try:
+                        response = requests.post(
+                            f"{FASTAPI_BASEURL}/jobs/batch_parse",
+                            data={
+                                "folder_path": folder_path,
+                                "remove_original": remove_original
+                            }
+                        )
+                        if response.status_code == 200:
+                            st.session_state.parse_job_id = response.json().get("job_id")
+                            st.info(f"배치 작업 등록 - job_id: {st.session_state.parse_job_id}")
+                        else:
+                            st.error(f"에러 발생: {response.status_code} - {response.text}")
+                    except Exception as e:
+                        st.error(f"서버 연결 실패: {e}")
+
+            # 등록된 작업 진행 상황 폴링
+            if st.session_state.get("parse_job_id"):
+                job_id = st.session_state.parse_job_id
+                progress_bar = st.progress(0)
+                status = st.empty()
+                try:
+                    while True:
+                        job = requests.get(f"{FASTAPI_BASEURL}/jobs/{job_id}", params={"with_files": False}, timeout=10).json()
+                        total, done = job.get("total_files") or 0, job.get("done_files") or 0
+                        progress_bar.progress(done / total if total else 0.0)
+                        status.write(f"[{job.get('status')}] ({done}/{total}) 실패: {job.get('failed_files')}")
+
+                        if job.get("status") == "completed":
+                            st.success(f"배치 처리 완료! - {job.get('result')}")
+                            st.session_state.parse_job_id = None
+                            break
+                        if job.get("status") == "failed":
+                            st.error(f"배치 처리 실패: {job.get('error')}")
+                            st.session_state.parse_job_id = None
+                            break
+                        time.sleep(2)
+                except Exception as e:
+                    st.error(f"작업 상태 조회 실패: {e}")
     
     with col4:
         st.subheader(":green[Postgres 데이터 Insert]")
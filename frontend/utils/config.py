@@ -11,6 +11,10 @@ class BaseConfig:
     DATABASE_URL: str = os.getenv("DATABASE_URL", "")
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    UPLOAD_MAX_WORKERS: int = int(os.getenv("UPLOAD_MAX_WORKERS", "8"))           # 동시 전송 청크 수 (연결 풀 크기)
+    UPLOAD_MAX_RETRIES: int = int(os.getenv("UPLOAD_MAX_RETRIES", "5"))           # 청크/완료 요청 재시도 횟수
+    UPLOAD_RETRY_BACKOFF: float = float(os.getenv("UPLOAD_RETRY_BACKOFF", "0.5"))  # 재시도 대기 시작값(초, 지수 증가)
+    UPLOAD_COMPRESSION: bool = os.getenv("UPLOAD_COMPRESSION", "True").lower() == "true"  # 서버와 협상되면 청크 zstd 압축
 
 class DevConfig(BaseConfig):
     """개발 환경"""
@@ -0,0 +1,423 @@
+import os
+import json
+import time
+import random
+import hashlib
+import threading
+from pathlib import Path
+from collections import deque
+from typing import Callable, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import zstandard
+except ImportError:  # 없으면 압축 없이 전송
+    zstandard = None
+
+from utils.config import get_config
+from utils.setlogger import setup_logger
+config = get_config()
+logger = setup_logger(f"{__name__}", level=config.LOG_LEVEL)
+
+
+DEFAULT_CHUNK_SIZE = 10 * 1024 * 1024   # 10MB
+NEGOTIATE_BATCH_SIZE = 500              # 협상 요청 한 번에 보낼 파일 수
+RETRY_STATUS = {408, 429, 500, 502, 503, 504}  # 재시도할 응답 코드
+RETRY_CONFLICT_CODES = {"chunk_checksum_mismatch"}  # 409 중 재시도할 오류 코드 (전송 중 손상된 청크)
+MAX_BACKOFF = 30.0                      # 재시도 대기 상한(초)
+
+# 청크 압축 (서버와 협상된 경우에만 사용)
+ZSTD_LEVEL = 3                          # 압축 수준 (낮을수록 빠름, 3이면 LAN/VPN 모두 전송보다 빠름)
+COMPRESS_SAMPLE_SIZE = 64 * 1024        # 파일당 압축률 표본 크기 (앞/중간/끝 3곳)
+COMPRESS_MIN_SIZE = 4 * 1024            # 이보다 작은 파일은 압축하지 않음
+COMPRESS_MAX_RATIO = 0.9                # 압축 후 크기가 원본의 90% 이상이면 원본 전송
+
+
+def file_sha256(file_path: str, block_size: int = 1024 * 1024) -> str:
+    """파일 내용 SHA-256 (블록 단위로 읽어 메모리 사용 최소화)"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class LocalHashCache:
+    """
+    로컬 파일 SHA-256 캐시 (경로 → 크기, mtime, 해시)
+    크기와 mtime이 같으면 다시 읽지 않으므로 변경 없는 폴더 재동기화 시 해시 계산 시간이 거의 들지 않습니다.
+    """
+
+    def __init__(self, cache_path: str = "./.upload_hash_cache.json"):
+        self.cache_path = Path(cache_path)
+        self.entries: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        if self.cache_path.exists():
+            try:
+                with open(self.cache_path, "r", encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                self.entries = {}
+
+    def sha256(self, file_path: str) -> str:
+        key = str(Path(file_path).resolve())
+        stat = os.stat(file_path)
+        entry = self.entries.get(key)
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            return entry["sha256"]
+        digest = file_sha256(file_path)
+        with self._lock:
+            self.entries[key] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest}
+        return digest
+
+    def save(self):
+        with self._lock:
+            tmp_path = self.cache_path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_path)
+
+
+def get_server_path(local_base_path: str, local_path: str) -> str:
+    """로컬 파일의 서버 저장 경로 (로컬 프로젝트 폴더의 상위 경로를 뺀 나머지, 프로젝트 폴더명부터 시작)"""
+    folder_path = os.path.dirname(local_path).replace("\\", "/") # 맨 끝 파일명 제외한 상위 경로
+    deleted_path = os.path.dirname(local_base_path).replace("\\", "/") # 서버 저장시 제거할 경로명
+    return folder_path.replace(deleted_path, "")
+
+
+def build_manifest(local_base_path: str, local_paths: List[str], hash_cache: Optional[LocalHashCache] = None) -> List[dict]:
+    """협상용 파일 목록 - [{"local_path", "server_path", "filename", "size", "sha256"}, ...]"""
+    hash_cache = hash_cache or LocalHashCache()
+    manifest = []
+    for local_path in local_paths:
+        manifest.append({
+            "local_path": local_path,
+            "server_path": get_server_path(local_base_path, local_path),
+            "filename": os.path.basename(local_path),
+            "size": os.path.getsize(local_path),
+            "sha256": hash_cache.sha256(local_path),
+            })
+    hash_cache.save()
+    return manifest
+
+
+def negotiate_uploads(base_url: str, manifest: List[dict], chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[dict]:
+    """
+    서버와 협상하여 파일별 전송 필요 여부와 청크 압축 방식 확인 (/uploads/negotiate)
+
+    Returns:
+        manifest 항목에 서버 응답(status, upload_id, missing_chunks, encoding 등)을 합친 목록
+    """
+    results = []
+    for start in range(0, len(manifest), NEGOTIATE_BATCH_SIZE):
+        batch = manifest[start:start + NEGOTIATE_BATCH_SIZE]
+        res = requests.post(f"{base_url}/uploads/negotiate", json={
+            "chunk_size": chunk_size,
+            "files": [{k: item[k] for k in ("server_path", "filename", "size", "sha256")} for item in batch],
+            "encodings": client_encodings(),
+            }, timeout=300)
+        res.raise_for_status()
+        data = res.json()
+        for item, answer in zip(batch, data["files"]):
+            results.append({**item, **answer, "encoding": data.get("encoding")})
+    return results
+
+
+def client_encodings() -> List[str]:
+    """이 클라이언트가 보낼 수 있는 청크 압축 방식 (선호 순서)"""
+    return ["zstd"] if zstandard is not None else []
+
+
+def is_compressible(file_path: str, size: Optional[int] = None) -> bool:
+    """
+    파일 앞/중간/끝에서 표본을 읽어 압축 효과가 있는지 빠르게 판단
+    (이미 압축된 형식 - JPG, ZIP, 압축 스트림 PDF 등 - 은 표본에서 거의 줄지 않으므로 압축 비용을 쓰지 않음)
+    """
+    if zstandard is None:
+        return False
+    size = os.path.getsize(file_path) if size is None else size
+    if size < COMPRESS_MIN_SIZE:
+        return False
+
+    offsets = sorted({0, max(0, size // 2 - COMPRESS_SAMPLE_SIZE // 2), max(0, size - COMPRESS_SAMPLE_SIZE)})
+    compressor = zstandard.ZstdCompressor(level=1)
+    raw = compressed = 0
+    with open(file_path, "rb") as f:
+        for offset in offsets:
+            f.seek(offset)
+            sample = f.read(COMPRESS_SAMPLE_SIZE)
+            raw += len(sample)
+            compressed += len(compressor.compress(sample))
+    return raw > 0 and compressed < raw * COMPRESS_MAX_RATIO
+
+
+def read_chunk(file_path: str, offset: int, size: int) -> bytes:
+    """파일의 offset 위치에서 size 바이트 읽기 (청크마다 파일을 따로 열어 병렬 전송 가능)"""
+    with open(file_path, "rb") as f:
+        f.seek(offset)
+        return f.read(size)
+
+
+def create_http_session(pool_size: int = 8) -> requests.Session:
+    """연결 풀을 쓰는 세션 - 스레드들이 keep-alive 연결을 재사용하여 청크마다 TCP 연결을 새로 맺지 않음"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def is_retryable(res: requests.Response) -> bool:
+    """RETRY_STATUS 응답, 또는 detail.code가 RETRY_CONFLICT_CODES인 409 응답"""
+    if res.status_code in RETRY_STATUS:
+        return True
+    if res.status_code != 409:
+        return False
+    try:
+        detail = res.json().get("detail")
+    except ValueError:
+        return False
+    return isinstance(detail, dict) and detail.get("code") in RETRY_CONFLICT_CODES
+
+
+def request_with_retry(session: requests.Session, method: str, url: str,
+                       max_retries: int = 5, backoff: float = 0.5, **kwargs) -> requests.Response:
+    """
+    연결 오류, 타임아웃, 재시도 가능한 응답(is_retryable)이면 지수 백오프(+지터) 후 재시도
+    그 외 4xx는 재시도해도 결과가 같으므로 바로 예외 발생
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            res = session.request(method, url, **kwargs)
+            if not is_retryable(res):
+                res.raise_for_status()
+                return res
+            error = requests.HTTPError(f"{res.status_code} {res.text[:200]}", response=res)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            error = e
+        if attempt == max_retries:
+            raise error
+        delay = min(MAX_BACKOFF, backoff * (2 ** attempt)) * random.uniform(0.5, 1.5)
+        logger.warning(f"요청 실패, {delay:.1f}초 후 재시도 ({attempt + 1}/{max_retries}) - {method} {url}: {error}")
+        time.sleep(delay)
+
+
+class FolderUploader:
+    """
+    여러 파일을 청크 단위로 동시에 전송하는 업로더
+
+    - 파일 경계와 무관하게 모든 누락 청크를 하나의 작업 풀(max_workers)에 배정
+      (작은 파일이 많아도, 큰 파일 하나여도 연결 수만큼 동시에 전송되어 왕복 지연에 묶이지 않음)
+    - 연결 풀 세션 공유, 실패한 청크는 백오프 후 재시도
+    - 파일의 마지막 청크가 끝나면 바로 완료 요청 (서버 체크섬 검증)
+    - 재시도를 넘겨 실패한 파일은 나머지 청크를 건너뛰고 failed에 기록 (세션은 서버에 남아 다음 실행 때 이어서 전송)
+    - 서버와 zstd가 협상되고 표본 압축률이 좋은 파일은 청크를 압축해 전송 (청크별로 줄지 않으면 원본 전송)
+    - progress_callback은 호출한 스레드에서 실행되므로 Streamlit 위젯을 바로 갱신할 수 있음
+    """
+
+    def __init__(self, base_url: str, chunk_size: int = DEFAULT_CHUNK_SIZE, max_workers: int = 8,
+                 max_retries: int = 5, backoff: float = 0.5, compression: bool = True):
+        self.base_url = base_url
+        self.chunk_size = chunk_size
+        self.max_workers = max(1, max_workers)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.compression = compression and zstandard is not None
+        self.session = create_http_session(self.max_workers)
+        # ZstdCompressor는 스레드 간 공유 불가 - 워커 스레드마다 하나씩
+        self._local = threading.local()
+
+    def _compress(self, chunk: bytes) -> Optional[bytes]:
+        """압축 결과가 충분히 작으면 압축 데이터, 아니면 None"""
+        compressor = getattr(self._local, "compressor", None)
+        if compressor is None:
+            compressor = self._local.compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+        compressed = compressor.compress(chunk)
+        return compressed if len(compressed) < len(chunk) * COMPRESS_MAX_RATIO else None
+
+    def _request(self, method: str, path: str, **kwargs) -> requests.Response:
+        return request_with_retry(self.session, method, f"{self.base_url}{path}",
+                                  max_retries=self.max_retries, backoff=self.backoff, **kwargs)
+
+    def _open_session(self, item: dict) -> dict:
+        """협상 결과가 없는 파일은 세션을 직접 생성"""
+        res = self._request("POST", "/uploads", data={
+            "filename": os.path.basename(item["local_path"]),
+            "server_path": item["server_path"],
+            "total_size": item["size"],
+            "chunk_size": self.chunk_size,
+            "sha256": item.get("sha256") or file_sha256(item["local_path"]),
+            "encodings": ",".join(client_encodings()) if self.compression else "",
+            }, timeout=30)
+        return {**item, **res.json()}
+
+    @staticmethod
+    def _chunk_bytes(item: dict, chunk_index: int) -> int:
+        return max(0, min(item["chunk_size"], item["size"] - chunk_index * item["chunk_size"]))
+
+    def _send_chunk(self, item: dict, chunk_index: int) -> tuple:
+        """청크 전송 후 (원본 바이트, 실제 전송 바이트)"""
+        offset = chunk_index * item["chunk_size"]
+        chunk = read_chunk(item["local_path"], offset, item["chunk_size"])
+        headers = {"Content-Type": "application/octet-stream", "X-Chunk-SHA256": hashlib.sha256(chunk).hexdigest()}
+        body = self._compress(chunk) if item.get("compress") else None
+        if body is None:
+            body = chunk
+        else:
+            headers["Content-Encoding"] = item["encoding"]
+        self._request(
+            "PUT", f"/uploads/{item['upload_id']}/chunks",
+            params={"offset": offset},
+            data=body,
+            headers=headers,
+            timeout=300,
+            )
+        return len(chunk), len(body)
+
+    def _complete(self, item: dict) -> dict:
+        return self._request("POST", f"/uploads/{item['upload_id']}/complete", timeout=600).json()
+
+    def _prepare(self, item: dict) -> dict:
+        """
+        워커 스레드에서 실행 - 협상 결과가 없으면 세션 생성, 표본을 읽어 압축 여부 판단
+        (요청/파일 읽기가 진행 상황을 갱신하는 호출 스레드를 막지 않음)
+        """
+        if "upload_id" not in item:
+            item = self._open_session(item)
+        compress = (self.compression and item.get("encoding") == "zstd"
+                    and is_compressible(item["local_path"], item["size"]))
+        return {**item, "chunk_size": item.get("chunk_size", self.chunk_size), "compress": compress}
+
+    def _chunk_tasks(self, item: dict, state: dict):
+        """준비된 파일의 (종류, 파일, 청크 번호) 작업 - 누락 청크가 없으면 완료 요청만"""
+        missing = item["missing_chunks"]
+        state.update(status="uploading", remaining=len(missing),
+                     sent=item["size"] - sum(self._chunk_bytes(item, idx) for idx in missing))
+        if not missing:
+            return iter([("complete", item, None)])
+        return (("chunk", item, idx) for idx in missing)
+
+    def upload(self, items: List[dict], progress_callback: Optional[Callable[[dict], None]] = None) -> dict:
+        """
+        Args:
+            items: {"local_path", "server_path", "size"} + 협상 결과(upload_id, chunk_size, missing_chunks)
+                   협상 결과가 없으면 세션을 새로 생성
+            progress_callback: 청크/파일 완료마다 진행 상황(progress()) 전달
+
+        Returns:
+            {"uploaded": [완료 응답, ...], "failed": [{"local_path", "error"}, ...], "sent_bytes", "wire_bytes", "elapsed"}
+        """
+        items = [{**item, "size": item.get("size", os.path.getsize(item["local_path"]))} for item in items]
+        states = {item["local_path"]: {"size": item["size"], "sent": 0, "status": "pending"} for item in items}
+        uploaded = []
+        started = time.time()
+        sent_bytes = 0
+        wire_bytes = 0
+
+        def progress() -> dict:
+            elapsed = time.time() - started
+            return {
+                "files_total": len(states),
+                "files_done": sum(1 for s in states.values() if s["status"] == "done"),
+                "files_failed": sum(1 for s in states.values() if s["status"] == "failed"),
+                "total_bytes": sum(s["size"] for s in states.values()),
+                "done_bytes": sum(s["sent"] for s in states.values()),
+                "sent_bytes": sent_bytes,
+                "wire_bytes": wire_bytes,
+                "elapsed": round(elapsed, 1),
+                "mbps": round(sent_bytes / (1024 * 1024) / elapsed, 2) if elapsed > 0 else 0.0,
+                "active": {path: s["sent"] / s["size"] if s["size"] else 1.0
+                           for path, s in states.items() if s["status"] == "uploading"},
+                }
+
+        # 준비(세션 생성, 압축 판단)가 끝난 파일의 청크 작업을 새 파일 준비보다 먼저 배정
+        remaining_items = iter(items)
+        chunk_tasks = deque()
+
+        def next_task():
+            while chunk_tasks:
+                task = next(chunk_tasks[0], None)
+                if task is not None:
+                    return task
+                chunk_tasks.popleft()
+            item = next(remaining_items, None)
+            return None if item is None else ("prepare", item, None)
+
+        pending = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            def fill():
+                # 대기 작업은 워커 수의 2배까지만 (수십만 청크도 future를 한꺼번에 만들지 않음)
+                while len(pending) < self.max_workers * 2:
+                    task = next_task()
+                    if task is None:
+                        return
+                    kind, item, idx = task
+                    if states[item["local_path"]]["status"] == "failed":
+                        continue
+                    if kind == "chunk":
+                        future = executor.submit(self._send_chunk, item, idx)
+                    else:
+                        future = executor.submit(self._prepare if kind == "prepare" else self._complete, item)
+                    pending[future] = task
+
+            fill()
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    kind, item, idx = pending.pop(future)
+                    state = states[item["local_path"]]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        if state["status"] != "failed":
+                            logger.error(f"업로드 실패 - {item['local_path']}: {e}")
+                            state.update(status="failed", error=str(e))
+                        continue
+                    if kind == "prepare":
+                        item.update(result)
+                        chunk_tasks.append(self._chunk_tasks(item, state))
+                    elif kind == "chunk":
+                        raw_bytes, body_bytes = result
+                        sent_bytes += raw_bytes
+                        wire_bytes += body_bytes
+                        state["sent"] += raw_bytes
+                        state["remaining"] -= 1
+                        if state["remaining"] == 0 and state["status"] != "failed":
+                            pending[executor.submit(self._complete, item)] = ("complete", item, None)
+                    else:
+                        state["status"] = "done"
+                        uploaded.append(result)
+                        logger.info(f"Chunked file is Uploaded Successfully - {item['local_path']}")
+                fill()
+                if progress_callback:
+                    progress_callback(progress())
+
+        failed = [{"local_path": path, "error": s.get("error", "")} for path, s in states.items() if s["status"] == "failed"]
+        return {"uploaded": uploaded, "failed": failed, "sent_bytes": sent_bytes, "wire_bytes": wire_bytes,
+                "elapsed": round(time.time() - started, 1)}
+
+
+def upload_file_resumable(base_url: str, local_path: str, server_path: str,
+                          chunk_size: int = DEFAULT_CHUNK_SIZE, max_workers: int = 4,
+                          session: Optional[dict] = None) -> dict:
+    """
+    오프셋 기반 청크 업로드 (/uploads 세션 API) - 파일 하나를 FolderUploader로 전송
+
+    1) 파일 SHA-256 계산 후 세션 생성 - 이미 받은 청크가 있으면 서버가 누락 청크만 알려줌
+       (negotiate_uploads 결과를 session으로 넘기면 이 단계 생략)
+    2) 누락 청크를 max_workers개씩 동시에 전송
+    3) 완료 요청 - 서버가 전체 체크섬 검증 후 최종 경로로 이동
+
+    중간에 끊기면 같은 함수를 다시 호출하면 남은 청크만 전송합니다.
+
+    Returns:
+        서버 완료 응답 (saved_path, filename, sha256)
+    """
+    item = {**(session or {}), "local_path": local_path, "server_path": server_path}
+    report = FolderUploader(base_url, chunk_size=chunk_size, max_workers=max_workers).upload([item])
+    if report["failed"]:
+        raise RuntimeError(report["failed"][0]["error"])
+    return report["uploaded"][0]